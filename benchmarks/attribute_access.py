@@ -0,0 +1,42 @@
+"""Benchmark of domain model field reads against plain slots access."""
+
+from __future__ import print_function
+
+import timeit
+
+from domain_models import models
+from domain_models import fields
+
+
+class Model(models.DomainModel):
+    """Domain model."""
+
+    id = fields.Int()
+    name = fields.String()
+
+
+class SlotsObject(object):
+    """Plain object with slots."""
+
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id, name):
+        """Initializer."""
+        self.id = id
+        self.name = name
+
+
+if __name__ == '__main__':
+    model = Model(id=1, name='John')
+    slots_object = SlotsObject(id=1, name='John')
+
+    model_time = min(timeit.repeat('model.id; model.name',
+                                   globals={'model': model},
+                                   number=1000000, repeat=5))
+    slots_time = min(timeit.repeat('obj.id; obj.name',
+                                   globals={'obj': slots_object},
+                                   number=1000000, repeat=5))
+
+    print('Domain model reads: {0:.3f} s'.format(model_time))
+    print('Plain slots reads: {0:.3f} s'.format(slots_time))
+    print('Overhead: {0:.1%}'.format(model_time / slots_time - 1))
@@ -0,0 +1,46 @@
+"""Benchmark of domain model class creation."""
+
+from __future__ import print_function
+
+import timeit
+
+from domain_models import models
+from domain_models import fields
+
+
+MODELS_NUMBER = 1500
+
+
+def create_model_cls(number):
+    """Create domain model class with several fields."""
+    return type(models.DomainModel)(
+        'Model{0}'.format(number), (models.DomainModel,), {
+            'id': fields.Int(),
+            'name': fields.String(),
+            'price': fields.Float(),
+            'active': fields.Bool(),
+            'created': fields.DateTime(),
+        })
+
+
+def create_model_classes():
+    """Create domain model classes."""
+    return [create_model_cls(number) for number in range(MODELS_NUMBER)]
+
+
+def access_collections(model_classes):
+    """Access collection classes of domain model classes."""
+    return [model_cls.Collection for model_cls in model_classes]
+
+
+if __name__ == '__main__':
+    creation_time = min(timeit.repeat(create_model_classes,
+                                      number=1, repeat=5))
+    print('Class creation: {0:.2f} us per model'.format(
+        creation_time / MODELS_NUMBER * 1e6))
+
+    model_classes = create_model_classes()
+    access_time = timeit.timeit(lambda: access_collections(model_classes),
+                                number=1)
+    print('First collection access: {0:.2f} us per model'.format(
+        access_time / MODELS_NUMBER * 1e6))
@@ -0,0 +1,85 @@
+"""Aggregation module."""
+
+from __future__ import absolute_import
+
+import collections as std_collections
+
+import six
+
+from . import errors
+
+
+FUNCTIONS = ('count', 'sum', 'min', 'max', 'mean')
+"""Names of supported aggregate functions."""
+
+
+def group(values, key):
+    """Return ordered dictionary of lists of values by their keys.
+
+    :param iterable values:
+    :param callable key: Function that returns group key of value.
+    :rtype collections.OrderedDict:
+    """
+    groups = std_collections.OrderedDict()
+    for value in values:
+        group_key = key(value)
+        group_values = groups.get(group_key)
+        if group_values is None:
+            groups[group_key] = [value]
+        else:
+            group_values.append(value)
+    return groups
+
+
+def aggregate(values, aggregations):
+    """Return dictionary of aggregates of values.
+
+    Column of every aggregation is extracted by single ``map()`` of its
+    getter and reduced by Python's builtins, so sums of integers do not
+    overflow and sums of floats do not depend on size of column.
+
+    :param list values:
+    :param list aggregations: List of tuples of aggregate's name, function
+        name and getter of aggregated value. Getter could be None for
+        ``count`` of values.
+    :rtype dict:
+    """
+    result = dict()
+    for name, function, getter in aggregations:
+        if getter is None:
+            column = values
+        else:
+            column = [value for value in six.moves.map(getter, values)
+                      if value is not None]
+        result[name] = reduce_column(function, column)
+    return result
+
+
+def reduce_column(function, column):
+    """Return aggregate of column of not None values.
+
+    Columns that are NumPy arrays, e.g. columns of
+    :py:class:`arrays.ArrayCollection`, are reduced by methods of arrays.
+
+    :param str function: Name of aggregate function.
+    :param column: List or NumPy array.
+    :rtype object:
+    """
+    if function == 'count':
+        return len(column)
+    if function not in FUNCTIONS:
+        raise errors.Error('Aggregate function is supposed to be one of {0}, '
+                           'instead "{1}" given'.format(FUNCTIONS, function))
+    if not len(column):
+        return 0 if function == 'sum' else None
+    if hasattr(column, 'dtype'):
+        return getattr(column, function)().item()
+    return _REDUCERS[function](column)
+
+
+def _mean(column):
+    """Return arithmetic mean of column."""
+    return float(sum(column)) / len(column)
+
+
+_REDUCERS = dict(sum=sum, min=min, max=max, mean=_mean)
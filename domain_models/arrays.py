@@ -0,0 +1,237 @@
+"""Arrays module.
+
+Conversions of collections of models into NumPy structured arrays and back.
+NumPy is optional dependency, that is imported on first conversion.
+"""
+
+import six
+
+from . import errors
+from . import fields
+from . import models
+
+
+DTYPES = (
+    (fields.Bool, '?'),
+    (fields.Int, 'i8'),
+    (fields.Float, 'f8'),
+    (fields.DateTime, 'datetime64[us]'),
+    (fields.Date, 'datetime64[D]'),
+    (fields.String, 'U'),
+)
+"""Types of structured array's fields by classes of model's fields."""
+
+_PLAIN_FIELD_CLASSES = (fields.Bool, fields.Int, fields.Float, fields.String,
+                        fields.Date, fields.DateTime)
+
+
+def get_dtype(model_cls, field_names=None, models=None):
+    """Return structured array's type of models of passed class.
+
+    Length of strings is max length of strings of passed models.
+
+    :param class model_cls:
+    :param list field_names: Names of fields, all supported fields by
+        default.
+    :param iterable models:
+    :rtype list: List of tuples of names and types of array's fields.
+    """
+    dtype = list()
+    for field in _get_fields(model_cls, field_names):
+        field_type = _get_field_type(field)
+        if field_type == 'U':
+            lengths = [len(value) for value in
+                       six.moves.map(field.get_value, models or tuple())
+                       if value is not None]
+            field_type = 'U{0}'.format(max(lengths + [1]))
+        dtype.append((field.name, field_type))
+    return dtype
+
+
+def to_numpy(collection, field_names=None):
+    """Return structured array of values of collection's models.
+
+    Missing floats, dates and strings are represented as NaN, NaT and empty
+    strings, missing integers and booleans are not supported.
+
+    :param collections.Collection collection:
+    :param list field_names: Names of fields, all supported fields by
+        default.
+    :rtype numpy.ndarray:
+    """
+    numpy = _import_numpy()
+    model_cls = collection.value_type
+    dtype = get_dtype(model_cls, field_names, collection)
+    array = numpy.empty(len(collection), dtype=dtype)
+    for name, field_type in dtype:
+        field = getattr(model_cls, name)
+        column = list(six.moves.map(field.fget, collection))
+        if field_type.startswith('U'):
+            column = ['' if value is None else value for value in column]
+        elif field_type == '?' and None in column:
+            raise TypeError('Missing values of {0} could not be converted '
+                            'into {1}'.format(field, field_type))
+        try:
+            array[name] = numpy.array(column, dtype=field_type)
+        except (TypeError, ValueError):
+            raise TypeError('Values of {0} could not be converted into '
+                            '{1}'.format(field, field_type))
+    return array
+
+
+def from_numpy(collection_cls, array):
+    """Return collection of models hydrated from structured array.
+
+    Columns are converted into Python values by single call of
+    ``tolist()`` each. Values of columns, which types are the types of
+    fields from :py:data:`DTYPES`, are set directly to fields' storage, if
+    fields have no conversion logic, the rest are converted by fields.
+
+    :param class collection_cls:
+    :param numpy.ndarray array:
+    :rtype collections.Collection:
+    """
+    column_types = _get_column_types(collection_cls.value_type, array.dtype)
+    convert = _compile_converter(collection_cls.value_type, column_types)
+    return collection_cls(
+        six.moves.map(convert, *_get_columns(array, column_types)),
+        type_check=False)
+
+
+class ArrayCollection(object):
+    """Columnar collection of models that is backed by structured array.
+
+    Models are hydrated from array's records on access, while columns are
+    available as arrays without any conversions.
+    """
+
+    def __init__(self, model_cls, array):
+        """Initializer.
+
+        :param class model_cls:
+        :param numpy.ndarray array:
+        """
+        self.model_cls = model_cls
+        self.array = array
+        self._column_types = _get_column_types(model_cls, array.dtype)
+        self._convert = _compile_converter(model_cls, self._column_types)
+
+    def column(self, name):
+        """Return array of field's values.
+
+        :param str name:
+        :rtype numpy.ndarray:
+        """
+        return self.array[name]
+
+    def to_collection(self):
+        """Return collection of all models.
+
+        :rtype collections.Collection:
+        """
+        return from_numpy(self.model_cls.Collection, self.array)
+
+    def __getitem__(self, index):
+        """Return model by index or collection of slice of array."""
+        if isinstance(index, slice):
+            return self.__class__(self.model_cls, self.array[index])
+        return self._convert(*[
+            column[0] for column in _get_columns(self.array[[index]],
+                                                 self._column_types)])
+
+    def __iter__(self):
+        """Iterate models."""
+        return iter(self.to_collection())
+
+    def __len__(self):
+        """Return number of models."""
+        return len(self.array)
+
+    def __repr__(self):
+        """Return Pythonic representation of collection."""
+        return '{0}({1}, {2!r})'.format(self.__class__.__name__,
+                                        self.model_cls.__name__, self.array)
+
+
+def _get_fields(model_cls, field_names):
+    """Return fields by names or all fields of supported types."""
+    if field_names is not None:
+        return [getattr(model_cls, name) for name in field_names]
+    return [field for field in model_cls.__fields__.values()
+            if _get_field_type(field, strict=False) is not None]
+
+
+def _get_field_type(field, strict=True):
+    """Return type of array's field for model's field."""
+    for field_cls, field_type in DTYPES:
+        if isinstance(field, field_cls):
+            return field_type
+    if strict:
+        raise errors.Error('{0} could not be represented in array'.format(
+            field))
+    return None
+
+
+def _get_column_types(model_cls, dtype):
+    """Return list of names and types of array's fields for hydration.
+
+    Dates and times are converted into units of model's fields, other
+    array's fields keep their types.
+    """
+    column_types = list()
+    for name in dtype.names:
+        column_type = dtype[name]
+        field_type = _get_field_type(getattr(model_cls, name), strict=False)
+        if (column_type.kind == 'M' and field_type is not None and
+                field_type.startswith('datetime64')):
+            column_type = _numpy_dtype(field_type)
+        column_types.append((name, column_type))
+    return column_types
+
+
+def _compile_converter(model_cls, column_types):
+    """Return function that converts values of array's fields into model.
+
+    Values of array's fields, which types match types of model's fields,
+    are passed as plain ones.
+    """
+    plain_fields = list()
+    for name, column_type in column_types:
+        field = getattr(model_cls, name)
+        field_type = _get_field_type(field, strict=False)
+        if (field.__class__ in _PLAIN_FIELD_CLASSES and
+                field_type is not None and
+                (column_type.kind == 'U' if field_type == 'U' else
+                 column_type == _numpy_dtype(field_type))):
+            plain_fields.append(field)
+    return models.compile_model_factory(
+        model_cls, [name for name, _ in column_types], plain_fields)
+
+
+def _get_columns(array, column_types):
+    """Return lists of Python values of array's fields.
+
+    NaN floats are converted into None.
+    """
+    columns = list()
+    for name, column_type in column_types:
+        column = array[name].astype(column_type, copy=False).tolist()
+        if column_type.kind == 'f':
+            column = [None if value != value else value for value in column]
+        columns.append(column)
+    return columns
+
+
+def _numpy_dtype(field_type):
+    """Return NumPy type of structured array's field type."""
+    return _import_numpy().dtype(field_type)
+
+
+def _import_numpy():
+    """Return NumPy module."""
+    try:
+        import numpy
+    except ImportError:
+        raise errors.Error('NumPy is required for conversions of '
+                           'collections into arrays')
+    return numpy
@@ -0,0 +1,100 @@
+"""Blobs module."""
+
+import mmap
+
+import six
+
+
+class LazyBlob(object):
+    """Binary data that is loaded on first access.
+
+    Blob could be assigned to :py:class:`domain_models.fields.Binary` field
+    declared with ``zero_copy=True``.
+    """
+
+    def __init__(self, loader):
+        """Initializer.
+
+        :param callable loader: Callable that returns bytes-like object.
+        """
+        self._loader = loader
+        self._data = None
+
+    @property
+    def loaded(self):
+        """Return True if data has been already loaded.
+
+        :rtype bool:
+        """
+        return self._data is not None
+
+    def view(self):
+        """Return memory view of blob's data, loading it if needed.
+
+        :rtype memoryview:
+        """
+        if self._data is None:
+            self._data = memoryview(self._loader())
+        return self._data
+
+    def tobytes(self):
+        """Return blob's data as bytes, loading it if needed.
+
+        :rtype bytes:
+        """
+        return self.view().tobytes()
+
+    __bytes__ = tobytes
+
+    def __len__(self):
+        """Return size of blob's data."""
+        view = self.view()
+        if six.PY2:  # pragma: nocover
+            return view.itemsize * len(view)
+        return view.nbytes
+
+    def __repr__(self):
+        """Return Pythonic representation of blob."""
+        return '{module}.{cls}(loaded={loaded})'.format(
+            module=self.__class__.__module__, cls=self.__class__.__name__,
+            loaded=self.loaded)
+
+
+class FileBlob(LazyBlob):
+    """Binary data that is read from file on first access.
+
+    If blob is created with ``memory_map=True``, file is memory mapped and
+    blob's data is a view of mapped memory, so it is not copied into process
+    memory until bytes are requested.
+    """
+
+    def __init__(self, path, offset=0, size=None, memory_map=False):
+        """Initializer.
+
+        :param str path: Path to file.
+        :param int offset: Offset of blob's data in file.
+        :param int size: Size of blob's data, by default till end of file.
+        :param bool memory_map: Memory map file instead of reading it.
+        """
+        super(FileBlob, self).__init__(
+            self._map_file if memory_map else self._read_file)
+        self.path = path
+        self.offset = offset
+        self.size = size
+
+    def _read_file(self):
+        """Read blob's data from file."""
+        with open(self.path, 'rb') as blob_file:
+            blob_file.seek(self.offset)
+            return blob_file.read(-1 if self.size is None else self.size)
+
+    def _map_file(self):
+        """Map file into memory and return view of blob's data."""
+        with open(self.path, 'rb') as blob_file:
+            memory = mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if six.PY2:  # pragma: nocover
+            size = len(memory) - self.offset if self.size is None else (
+                self.size)
+            return buffer(memory, self.offset, size)  # noqa: F821
+        end = None if self.size is None else self.offset + self.size
+        return memoryview(memory)[self.offset:end]
@@ -0,0 +1,219 @@
+"""Caches module."""
+
+from __future__ import absolute_import
+
+import collections as std_collections
+import threading
+import time
+
+from six.moves import cPickle as pickle
+
+from . import errors
+
+
+class ModelCache(object):
+    """Read-through cache of models keyed by their unique keys.
+
+    Cache keeps at most ``max_size`` models, evicting least recently used
+    ones, and expires models after ``ttl`` seconds. Missing models are
+    loaded by ``loader`` that is called with values of unique key. When
+    several threads miss the same key concurrently, only one of them calls
+    loader and the rest wait for its result.
+
+    If cache is created with ``serialize=True``, models are stored as
+    pickled data and new model is created on every read, that trades CPU
+    for memory.
+
+    .. code-block:: python
+
+        users = ModelCache(User, loader=lambda id: repository.get(id),
+                           max_size=10000, ttl=60)
+        user = users.load(1)
+    """
+
+    def __init__(self, model_cls, loader=None, max_size=1024, ttl=None,
+                 serialize=False, clock=time.time):
+        """Initializer.
+
+        :param class model_cls: Class of cached models.
+        :param callable loader: Function that returns model by values of
+            unique key or None, if it does not exist.
+        :param int max_size: Max number of cached models.
+        :param float ttl: Number of seconds models are kept in cache.
+        :param bool serialize: Whether to store models as pickled data.
+        :param callable clock: Function that returns current time.
+        """
+        self.model_cls = model_cls
+        self.loader = loader
+        self.max_size = max_size
+        self.ttl = ttl
+        self.serialize = serialize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = std_collections.OrderedDict()
+        self._loads = dict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        """Return number of cached models.
+
+        :rtype int:
+        """
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """Return share of reads that found model in cache.
+
+        :rtype float:
+        """
+        reads = self.hits + self.misses
+        return float(self.hits) / reads if reads else 0.0
+
+    def get_key(self, model):
+        """Return cache key of model.
+
+        :param DomainModel model:
+        :rtype tuple:
+        """
+        return tuple(field.get_value(model)
+                     for field in self.model_cls.__unique_key__)
+
+    def get(self, key, default=None):
+        """Return cached model by unique key or default, if it is missing.
+
+        :param object key: Value of unique key or tuple of its values.
+        :param object default:
+        :rtype DomainModel:
+        """
+        key = _normalize_key(key)
+        with self._lock:
+            value = self._get_value(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return self._unpack(value)
+
+    def put(self, model):
+        """Put model into cache.
+
+        :param DomainModel model:
+        """
+        value = self._pack(model)
+        with self._lock:
+            self._set_value(self.get_key(model), value)
+
+    def load(self, key):
+        """Return model by unique key, loading it by loader on miss.
+
+        None is returned, if loader did not find model.
+
+        :param object key: Value of unique key or tuple of its values.
+        :rtype DomainModel:
+        """
+        if self.loader is None:
+            raise errors.Error('Cache of {0} does not have loader'.format(
+                self.model_cls))
+
+        key = _normalize_key(key)
+        with self._lock:
+            value = self._get_value(key)
+            if value is not None:
+                self.hits += 1
+                return self._unpack(value)
+            self.misses += 1
+
+            load = self._loads.get(key)
+            is_loading = load is None
+            if is_loading:
+                load = self._loads[key] = _Load()
+
+        if is_loading:
+            self._load(key, load)
+        else:
+            load.done.wait()
+
+        if load.error is not None:
+            raise load.error
+        return load.model
+
+    def invalidate(self, key):
+        """Remove model from cache by unique key.
+
+        :param object key: Value of unique key or tuple of its values.
+        """
+        with self._lock:
+            self._entries.pop(_normalize_key(key), None)
+
+    def clear(self):
+        """Remove all models from cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key, load):
+        """Load model by loader and share it with waiting threads."""
+        try:
+            load.model = self.loader(*key)
+            if load.model is not None:
+                value = self._pack(load.model)
+                with self._lock:
+                    self._set_value(key, value)
+        except Exception as exception:
+            load.error = exception
+        finally:
+            with self._lock:
+                del self._loads[key]
+            load.done.set()
+
+    def _get_value(self, key):
+        """Return cached value by key, marking it as recently used."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self.expirations += 1
+            return None
+        self._entries[key] = entry
+        return value
+
+    def _set_value(self, key, value):
+        """Cache value by key, evicting least recently used values."""
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries.pop(key, None)
+        self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _pack(self, model):
+        """Return value of model that is stored in cache."""
+        if self.serialize:
+            return pickle.dumps(model.get_data(), pickle.HIGHEST_PROTOCOL)
+        return model
+
+    def _unpack(self, value):
+        """Return model from value that is stored in cache."""
+        if self.serialize:
+            return self.model_cls(**pickle.loads(value))
+        return value
+
+
+class _Load(object):
+    """Load of model that is in progress."""
+
+    def __init__(self):
+        """Initializer."""
+        self.done = threading.Event()
+        self.model = None
+        self.error = None
+
+
+def _normalize_key(key):
+    """Return tuple of unique key's values."""
+    return key if isinstance(key, tuple) else (key,)
@@ -1,7 +1,33 @@
 """Collections module."""
 
+from __future__ import absolute_import
+
+import collections as std_collections
+import contextlib
+import heapq
+import itertools
+import operator
+import threading
+import weakref
+
 import six
 
+from . import aggregation
+from . import errors
+
+
+ON_CONFLICT_REPLACE = 'replace'
+"""Upsert policy that replaces existing value with new one."""
+
+ON_CONFLICT_KEEP = 'keep'
+"""Upsert policy that keeps existing value."""
+
+ON_CONFLICT_UPDATE = 'update'
+"""Upsert policy that updates fields of existing model with new model's."""
+
+ON_CONFLICT_POLICIES = (ON_CONFLICT_REPLACE, ON_CONFLICT_KEEP,
+                        ON_CONFLICT_UPDATE)
+
 
 class Collection(list):
     """Collection."""
@@ -15,7 +41,7 @@ class Collection(list):
             iterable = tuple()
 
         if type_check:
-            iterable = self._ensure_iterable_is_valid(iterable)
+            iterable = self._iterate_valid_values(iterable)
 
         super(Collection, self).__init__(iterable)
 
@@ -25,9 +51,20 @@ class Collection(list):
             self._ensure_value_is_valid(value))
 
     def extend(self, iterable):
-        """Extend the list by appending all the items in the given list."""
-        return super(Collection, self).extend(
-            self._ensure_iterable_is_valid(iterable))
+        """Extend the list by appending all the items in the given list.
+
+        If some of the items is not valid, list is left unchanged.
+        """
+        if iterable is self:
+            iterable = tuple(iterable)
+
+        length = len(self)
+        try:
+            super(Collection, self).extend(
+                self._iterate_valid_values(iterable))
+        except TypeError:
+            del self[length:]
+            raise
 
     def insert(self, index, value):
         """Insert an item at a given position."""
@@ -62,11 +99,303 @@ class Collection(list):
             super(Collection, self).__setslice__(start, stop,
                                                  self.__class__(iterable))
 
-    def _ensure_iterable_is_valid(self, iterable):
-        """Ensure that iterable values are a valid collection's values."""
-        for value in iterable:
+    def view(self, start=None, stop=None, step=None):
+        """Return view of collection's slice that does not copy values.
+
+        :rtype: CollectionView
+        """
+        return CollectionView(self, slice(start, stop, step))
+
+    def union(self, other):
+        """Return collection of unique values of collection and other one.
+
+        Values are compared by unique key of models, first occurrences are
+        kept in order.
+
+        :param iterable other:
+        :rtype: Collection
+        """
+        return self.__class__(self._iterate_unique(
+            itertools.chain(self, other), set()))
+
+    def intersection(self, other):
+        """Return collection of unique values that are in other one too.
+
+        :param iterable other:
+        :rtype: Collection
+        """
+        get_key = self._get_unique_key_getter()
+        other_keys = set(six.moves.map(get_key, other))
+        return self.__class__(
+            [value for value in self._iterate_unique(self, set())
+             if get_key(value) in other_keys],
+            type_check=False)
+
+    def difference(self, other):
+        """Return collection of unique values that are not in other one.
+
+        :param iterable other:
+        :rtype: Collection
+        """
+        get_key = self._get_unique_key_getter()
+        return self.__class__(self._iterate_unique(
+            self, set(six.moves.map(get_key, other))), type_check=False)
+
+    def dedupe(self):
+        """Return collection of first occurrences of unique values.
+
+        :rtype: Collection
+        """
+        return self.__class__(self._iterate_unique(self, set()),
+                              type_check=False)
+
+    def upsert(self, other, on_conflict=ON_CONFLICT_REPLACE):
+        """Insert values of other collection or merge them with existing.
+
+        Values with unique keys that are not in collection are appended,
+        conflicts with existing values are resolved according to
+        ``on_conflict`` policy: ``'replace'``, ``'keep'``, ``'update'`` or
+        function that is called with existing and new values and returns
+        value to be stored.
+
+        :param iterable other:
+        :param on_conflict: Name of policy or function.
+        """
+        resolve = self._get_conflict_resolver(on_conflict)
+        get_key = self._get_unique_key_getter()
+        positions = dict()
+        for position, value in enumerate(self):
+            positions.setdefault(get_key(value), position)
+
+        for value in other:
             self._ensure_value_is_valid(value)
-        return iterable
+            key = get_key(value)
+            position = positions.get(key)
+            if position is None:
+                positions[key] = len(self)
+                self.append(value)
+            else:
+                self[position] = resolve(self[position], value)
+
+    def sort_by(self, *keys):
+        """Sort collection in place by keys.
+
+        Keys are fields or names of fields, names prefixed with ``-`` are
+        sorted in descending order. Sorting is stable. If keys are not
+        passed, values are sorted by ordering key of models. None values are
+        ordered after any other values, so they come last in ascending and
+        first in descending order.
+
+        .. code-block:: python
+
+            users.sort_by('-rating', User.name)
+        """
+        for getter, descending in reversed(self._get_sort_passes(keys)):
+            super(Collection, self).sort(key=getter, reverse=descending)
+
+    def top_k(self, k, *keys):
+        """Return collection of first k values in order of keys.
+
+        It is equivalent to ``k`` first values of collection that is sorted
+        by :py:meth:`Collection.sort_by`, but does not sort whole collection
+        if all keys have the same direction.
+
+        :param int k:
+        :rtype: Collection
+        """
+        passes = self._get_sort_passes(keys)
+        if len(passes) > 1:
+            values = self.__class__(self, type_check=False)
+            values.sort_by(*keys)
+            return values[:k]
+
+        getter, descending = passes[0]
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return self.__class__(select(k, self, key=getter), type_check=False)
+
+    def group_by(self, key):
+        """Return collections of values grouped by values of key.
+
+        Groups are ordered by first occurrence of their keys.
+
+        :param key: Field or name of field.
+        :rtype: collections.OrderedDict
+        """
+        groups = aggregation.group(
+            self, _combine_getters([self._get_value_getter(key)]))
+        for group_key, values in six.iteritems(groups):
+            groups[group_key] = self.__class__(values, type_check=False)
+        return groups
+
+    def aggregate(self, group_by=None, into=None, **aggregations):
+        """Return aggregates of collection's values.
+
+        Aggregations are passed as keyword arguments: tuples of aggregate
+        function's name (``count``, ``sum``, ``min``, ``max`` or ``mean``)
+        and field or name of field, which is optional for ``count``. None
+        values are skipped.
+
+        Dictionary of aggregates is returned, or ordered dictionary of such
+        dictionaries by group keys, if ``group_by`` is passed. If model
+        class is passed as ``into``, aggregates are returned as its model,
+        or as its collection, where group keys are set to field with name of
+        ``group_by``.
+
+        .. code-block:: python
+
+            stats = players.aggregate(group_by='team', into=TeamStats,
+                                      players=('count',),
+                                      rating=('mean', 'rating'))
+
+        :rtype: dict
+        """
+        aggregations = [self._get_aggregation(name, spec)
+                        for name, spec in sorted(six.iteritems(aggregations))]
+        if group_by is None:
+            result = aggregation.aggregate(self, aggregations)
+            return into(**result) if into is not None else result
+
+        groups = aggregation.group(
+            self, _combine_getters([self._get_value_getter(group_by)]))
+        results = std_collections.OrderedDict(
+            (group_key, aggregation.aggregate(values, aggregations))
+            for group_key, values in six.iteritems(groups))
+        if into is None:
+            return results
+
+        group_name = getattr(group_by, 'name', group_by)
+        return into.Collection(
+            into(**dict(result, **{group_name: group_key}))
+            for group_key, result in six.iteritems(results))
+
+    def to_numpy(self, field_names=None):
+        """Return NumPy structured array of models' values.
+
+        Type of array is derived from model's ``Int``, ``Float``, ``Bool``,
+        ``Date``, ``DateTime`` and ``String`` fields.
+
+        :param list field_names: Names of fields, all supported fields by
+            default.
+        :rtype: numpy.ndarray
+        """
+        from . import arrays
+        return arrays.to_numpy(self, field_names)
+
+    @classmethod
+    def from_numpy(cls, array, columnar=False):
+        """Return collection of models hydrated from structured array.
+
+        If ``columnar=True`` is passed, columnar collection that hydrates
+        models on access is returned instead.
+
+        :param numpy.ndarray array:
+        :param bool columnar:
+        :rtype: Collection
+        """
+        from . import arrays
+        if columnar:
+            return arrays.ArrayCollection(cls.value_type, array)
+        return arrays.from_numpy(cls, array)
+
+    def _get_aggregation(self, name, spec):
+        """Return tuple of aggregate's name, function and value getter."""
+        if isinstance(spec, six.string_types):
+            spec = (spec,)
+        function, key = spec[0], spec[1] if len(spec) > 1 else None
+        if function not in aggregation.FUNCTIONS:
+            raise errors.Error('Aggregate function is supposed to be one of '
+                               '{0}, instead "{1}" given'.format(
+                                   aggregation.FUNCTIONS, function))
+        if key is None:
+            return name, function, None
+        return name, function, _combine_getters([self._get_value_getter(key)])
+
+    def _get_unique_key_getter(self):
+        """Return getter of unique key of values.
+
+        Values that do not have unique key are their own keys.
+        """
+        unique_key = getattr(self.value_type, '__unique_key__', None)
+        if not unique_key:
+            return _identity
+        return _combine_getters([self._get_value_getter(field)
+                                 for field in unique_key])
+
+    def _iterate_unique(self, values, seen_keys):
+        """Iterate values, which unique keys have not been seen yet."""
+        get_key = self._get_unique_key_getter()
+        for value in values:
+            key = get_key(value)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                yield value
+
+    @staticmethod
+    def _get_conflict_resolver(on_conflict):
+        """Return function that resolves conflict of values by policy."""
+        if callable(on_conflict):
+            return on_conflict
+        if on_conflict == ON_CONFLICT_REPLACE:
+            return lambda existing_value, value: value
+        if on_conflict == ON_CONFLICT_KEEP:
+            return lambda existing_value, value: existing_value
+        if on_conflict == ON_CONFLICT_UPDATE:
+            return _update_model
+        raise errors.Error('Upsert policy is supposed to be one of {0} or '
+                           'function, instead {1} given'.format(
+                               ON_CONFLICT_POLICIES, on_conflict))
+
+    def _get_sort_passes(self, keys):
+        """Return list of sort key getters and their directions.
+
+        Consecutive keys of the same direction are combined into one getter.
+        """
+        if not keys:
+            return [(getattr(self.value_type, '__ordering_key__', None),
+                     False)]
+
+        passes = list()
+        for key in keys:
+            descending = (isinstance(key, six.string_types) and
+                          key.startswith('-'))
+            getter = self._get_value_getter(key[1:] if descending else key)
+            if passes and passes[-1][1] == descending:
+                passes[-1][0].append(getter)
+            else:
+                passes.append(([getter], descending))
+        return [(_combine_sort_getters(getters), descending)
+                for getters, descending in passes]
+
+    def _get_value_getter(self, key):
+        """Return getter of value of field or attribute.
+
+        Values of fields without read-time logic and of plain attributes are
+        read by name of their storage.
+        """
+        if isinstance(key, six.string_types):
+            field = getattr(self.value_type, key, None)
+            if not isinstance(field, property):
+                return key
+            key = field
+        storage_name = getattr(key, 'storage_name', None)
+        if storage_name and isinstance(key.fget, operator.attrgetter):
+            return storage_name
+        return key.fget
+
+    def _iterate_valid_values(self, iterable):
+        """Iterate iterable values ensuring that they are valid.
+
+        Iterable is consumed only once. Types of values that have been
+        already checked are cached, so values of the same exact type are not
+        checked again.
+        """
+        valid_types = set()
+        for value in iterable:
+            value_cls = type(value)
+            if value_cls not in valid_types:
+                self._ensure_value_is_valid(value)
+                valid_types.add(value_cls)
+            yield value
 
     def _ensure_value_is_valid(self, value):
         """Ensure that value is a valid collection's value."""
@@ -75,3 +404,606 @@ class Collection(list):
                             'of {1} required'.format(
                                 value, self.__class__.value_type))
         return value
+
+
+def _identity(value):
+    """Return value."""
+    return value
+
+
+def _update_model(model, other_model):
+    """Update fields of model with values of other model's fields."""
+    model.set_data(dict((name, field.get_value(other_model))
+                        for name, field in
+                        six.iteritems(model.__class__.__fields__)),
+                   partial=True)
+    return model
+
+
+def _combine_getters(getters):
+    """Return function that extracts values of getters.
+
+    Getters that are names of attributes are combined into single
+    :py:func:`operator.attrgetter`.
+    """
+    if all(isinstance(getter, six.string_types) for getter in getters):
+        return operator.attrgetter(*getters)
+    getters = [operator.attrgetter(getter)
+               if isinstance(getter, six.string_types) else getter
+               for getter in getters]
+    if len(getters) == 1:
+        return getters[0]
+    return lambda value: tuple(getter(value) for getter in getters)
+
+
+def _combine_sort_getters(getters):
+    """Return function that extracts sort key of values of getters."""
+    getter = _combine_getters(getters)
+    if len(getters) == 1:
+        return lambda value: get_sort_value(getter(value))
+    return lambda value: tuple(six.moves.map(get_sort_value, getter(value)))
+
+
+def get_sort_value(value):
+    """Return representation of value in sort keys.
+
+    None is ordered after any other value, so it could be compared with
+    values of other types in Python 3.
+
+    :rtype tuple:
+    """
+    return value is None, value
+
+
+class BatchLoadingCollection(Collection):
+    """Collection of models with deferred fields.
+
+    Models that are added to collection keep weak reference to it, so
+    deferred field is loaded for all models of collection by single call of
+    field's loader, when it is accessed on any of them. Models that are
+    removed from collection drop the reference.
+    """
+
+    def append(self, value):
+        """Add an item to the end of the list."""
+        super(BatchLoadingCollection, self).append(value)
+        self._attach(value)
+
+    def insert(self, index, value):
+        """Insert an item at a given position."""
+        super(BatchLoadingCollection, self).insert(index, value)
+        self._attach(value)
+
+    def pop(self, index=-1):
+        """Remove and return item at index (default last)."""
+        value = super(BatchLoadingCollection, self).pop(index)
+        self._detach(value)
+        return value
+
+    def remove(self, value):
+        """Remove first occurrence of value."""
+        self.pop(self.index(value))
+
+    def clear(self):
+        """Remove all items from collection."""
+        del self[:]
+
+    def __setitem__(self, index, value):
+        """Set an item at a given position."""
+        replaced_values = list.__getitem__(self, index)
+        super(BatchLoadingCollection, self).__setitem__(index, value)
+        if isinstance(index, slice):
+            self._detach(*replaced_values)
+            self._attach(*self)
+        else:
+            self._detach(replaced_values)
+            self._attach(value)
+
+    def __delitem__(self, index):
+        """Delete an item at a given position."""
+        deleted_values = list.__getitem__(self, index)
+        super(BatchLoadingCollection, self).__delitem__(index)
+        if isinstance(index, slice):
+            self._detach(*deleted_values)
+        else:
+            self._detach(deleted_values)
+
+    if six.PY2:  # pragma: nocover
+        def __setslice__(self, start, stop, iterable):
+            """Set slice of values."""
+            self.__setitem__(slice(start, stop), iterable)
+
+        def __delslice__(self, start, stop):
+            """Delete slice of values."""
+            self.__delitem__(slice(start, stop))
+
+    def _iterate_valid_values(self, iterable):
+        """Iterate iterable values ensuring that they are valid."""
+        for value in super(BatchLoadingCollection,
+                           self)._iterate_valid_values(iterable):
+            self._attach(value)
+            yield value
+
+    def _attach(self, *values):
+        """Make collection a batch of models' deferred fields loading."""
+        reference = weakref.ref(self)
+        for value in values:
+            value.__deferred_batch__ = reference
+
+    def _detach(self, *values):
+        """Exclude models that are not in collection anymore from batch."""
+        remaining = set(six.moves.map(id, self))
+        for value in values:
+            batch = getattr(value, '__deferred_batch__', None)
+            if (id(value) not in remaining and batch is not None and
+                    batch() is self):
+                value.__deferred_batch__ = None
+
+
+class CollectionView(object):
+    """View of collection's slice.
+
+    View references parent collection instead of copying its values, so it
+    reflects changes of parent collection's values. Real collection is
+    materialized when view is mutated or copied.
+
+    Indices of view's values are resolved on its creation. If parent
+    collection is shortened later, values at indices that are out of its
+    range are excluded from view.
+    """
+
+    def __init__(self, collection, index=None):
+        """Initializer.
+
+        :param Collection collection:
+        :param slice index:
+        """
+        start, stop, step = (index or slice(None)).indices(len(collection))
+        self._collection = collection
+        self._materialized = False
+        self._start = start
+        self._step = step
+        self._length = len(six.moves.range(start, stop, step))
+
+    def copy(self):
+        """Return collection with values of view.
+
+        :rtype: Collection
+        """
+        return self._collection.__class__(list(self), type_check=False)
+
+    def chunks(self, size):
+        """Iterate views of consecutive chunks of view with given size.
+
+        :param int size:
+        :rtype: generator[CollectionView]
+        """
+        for start in six.moves.range(0, len(self), size):
+            yield self[start:start + size]
+
+    def get_data(self):
+        """Return list of values, using their data if they have one.
+
+        :rtype: list
+        """
+        return [value.get_data() if hasattr(value, 'get_data') else value
+                for value in self]
+
+    def append(self, value):
+        """Add an item to the end of the view."""
+        self._materialize().append(value)
+        self._length += 1
+
+    def extend(self, iterable):
+        """Extend the view by appending all the items in the given list."""
+        collection = self._materialize()
+        collection.extend(iterable)
+        self._length = len(collection)
+
+    def insert(self, index, value):
+        """Insert an item at a given position."""
+        self._materialize().insert(index, value)
+        self._length += 1
+
+    def __setitem__(self, index, value):
+        """Set an item at a given position."""
+        collection = self._materialize()
+        collection[index] = value
+        self._length = len(collection)
+
+    def __delitem__(self, index):
+        """Delete an item at a given position."""
+        collection = self._materialize()
+        del collection[index]
+        self._length = len(collection)
+
+    def __getitem__(self, index):
+        """Return value by index or view of values if index is slice."""
+        own_start, length = self._get_bounds()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            view = self.__class__(self._collection, slice(0, 0))
+            view._start = own_start + start * self._step
+            view._step = self._step * step
+            view._length = len(six.moves.range(start, stop, step))
+            return view
+
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('view index out of range')
+        return list.__getitem__(self._collection,
+                                own_start + index * self._step)
+
+    def __iter__(self):
+        """Iterate values of view."""
+        return six.moves.map(list.__getitem__,
+                             itertools.repeat(self._collection),
+                             self._indices())
+
+    def __len__(self):
+        """Return number of values in view."""
+        return self._get_bounds()[1]
+
+    def __eq__(self, other):
+        """Compare values of view with values of other sequence."""
+        if not isinstance(other, (list, tuple, CollectionView)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        """Compare values of view with values of other sequence."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return Pythonic representation of view."""
+        return '{module}.{cls}({values})'.format(
+            module=self.__class__.__module__, cls=self.__class__.__name__,
+            values=repr(list(self)))
+
+    def _indices(self):
+        """Return range of parent collection's indices of view's values."""
+        start, length = self._get_bounds()
+        return six.moves.range(start, start + length * self._step,
+                               self._step)
+
+    def _get_bounds(self):
+        """Return start and length of view within parent collection.
+
+        Indices that are out of parent collection's current range are
+        excluded.
+        """
+        start, length, step = self._start, self._length, self._step
+        size = len(self._collection)
+        if step > 0 and start + (length - 1) * step >= size:
+            length = (size - 1 - start) // step + 1 if start < size else 0
+        elif step < 0 and start >= size:
+            skipped = (start - size) // -step + 1
+            start += skipped * step
+            length -= skipped
+        return start, max(length, 0)
+
+    def _materialize(self):
+        """Replace referenced parent collection by collection of own values.
+
+        :rtype: Collection
+        """
+        if not self._materialized:
+            self._collection = self.copy()
+            self._materialized = True
+            self._start = 0
+            self._step = 1
+            self._length = len(self._collection)
+        return self._collection
+
+
+class ConcurrentCollection(object):
+    """Collection with snapshot isolation for concurrent readers.
+
+    Readers work with immutable snapshot of values without locking. Writers
+    modify draft copy of values under lock and publish it as new snapshot
+    atomically, so readers never see half-applied changes.
+
+    .. code-block:: python
+
+        class Photos(ConcurrentCollection):
+            collection_cls = Photo.Collection
+
+        photos = Photos(fetch_photos())
+
+        with photos.batch() as draft:
+            draft.extend(fetch_new_photos())
+            del draft[:100]
+    """
+
+    collection_cls = Collection
+    """Class of collection that validates values of drafts."""
+
+    def __init__(self, iterable=None):
+        """Initializer."""
+        self._snapshot = tuple(self.collection_cls(iterable))
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Return current snapshot of values.
+
+        :rtype: tuple
+        """
+        return self._snapshot
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Return context manager that publishes changes of draft on exit.
+
+        If exception is raised inside of context, draft is discarded.
+
+        :rtype: Collection
+        """
+        with self._lock:
+            draft = self.collection_cls(self._snapshot, type_check=False)
+            yield draft
+            self._snapshot = tuple(draft)
+
+    def replace(self, iterable):
+        """Publish values of iterable as new snapshot."""
+        snapshot = tuple(self.collection_cls(iterable))
+        with self._lock:
+            self._snapshot = snapshot
+
+    def append(self, value):
+        """Add an item to the end of the collection."""
+        with self.batch() as draft:
+            draft.append(value)
+
+    def extend(self, iterable):
+        """Extend the collection by appending all the items of iterable."""
+        with self.batch() as draft:
+            draft.extend(iterable)
+
+    def insert(self, index, value):
+        """Insert an item at a given position."""
+        with self.batch() as draft:
+            draft.insert(index, value)
+
+    def __setitem__(self, index, value):
+        """Set an item or slice of items."""
+        with self.batch() as draft:
+            draft[index] = value
+
+    def __delitem__(self, index):
+        """Delete an item or slice of items."""
+        with self.batch() as draft:
+            del draft[index]
+
+    def __getitem__(self, index):
+        """Return value by index or tuple of values if index is slice."""
+        return self._snapshot[index]
+
+    def __iter__(self):
+        """Iterate values of current snapshot."""
+        return iter(self._snapshot)
+
+    def __len__(self):
+        """Return number of values in current snapshot."""
+        return len(self._snapshot)
+
+    def __contains__(self, value):
+        """Check if value is in current snapshot."""
+        return value in self._snapshot
+
+    def __repr__(self):
+        """Return Pythonic representation of collection."""
+        return '{module}.{cls}({values})'.format(
+            module=self.__class__.__module__, cls=self.__class__.__name__,
+            values=repr(list(self._snapshot)))
+
+
+class PersistentCollection(object):
+    """Persistent collection.
+
+    Collection is immutable: every modification returns new version of
+    collection that shares most of its structure with previous one. Values
+    are stored in leaves of 32-ary trie, so getting, setting and appending
+    of values take O(log n) time and memory. Inserting and deleting of
+    values and setting of slices rebuild the trie in O(n).
+
+    .. code-block:: python
+
+        class Photos(PersistentCollection):
+            collection_cls = Photo.Collection
+
+        version1 = Photos(fetch_photos())
+        version2 = version1.set(0, photo).append(another_photo)
+    """
+
+    collection_cls = Collection
+    """Class of collection that validates values."""
+
+    def __init__(self, iterable=None):
+        """Initializer."""
+        values = self.collection_cls(iterable)
+        self._length = len(values)
+        self._root, self._shift = _build_trie(values)
+
+    def append(self, value):
+        """Return new version with an item added to the end.
+
+        :rtype: PersistentCollection
+        """
+        self.collection_cls((value,))
+        if self._length == 1 << (self._shift + _TRIE_BITS):
+            root = (self._root, _trie_path(self._shift, value))
+            shift = self._shift + _TRIE_BITS
+        else:
+            root = _trie_push(self._root, self._shift, self._length, value)
+            shift = self._shift
+        return self._new_version(root, shift, self._length + 1)
+
+    def extend(self, iterable):
+        """Return new version extended by all the items of iterable.
+
+        :rtype: PersistentCollection
+        """
+        version = self
+        for value in self.collection_cls(iterable):
+            version = version.append(value)
+        return version
+
+    def insert(self, index, value):
+        """Return new version with an item inserted at a given position.
+
+        :rtype: PersistentCollection
+        """
+        values = list(self)
+        values.insert(index, value)
+        return self.__class__(values)
+
+    def set(self, index, value):
+        """Return new version with an item or slice of items set.
+
+        :rtype: PersistentCollection
+        """
+        if isinstance(index, slice):
+            values = list(self)
+            values[index] = self.collection_cls(value)
+            return self.__class__(values)
+
+        index = self._normalize_index(index)
+        self.collection_cls((value,))
+        root = _trie_assoc(self._root, self._shift, index, value)
+        return self._new_version(root, self._shift, self._length)
+
+    def delete(self, index):
+        """Return new version without an item or slice of items.
+
+        :rtype: PersistentCollection
+        """
+        values = list(self)
+        del values[index]
+        return self.__class__(values)
+
+    def to_collection(self):
+        """Return collection with values of this version.
+
+        :rtype: Collection
+        """
+        return self.collection_cls(self, type_check=False)
+
+    def __getitem__(self, index):
+        """Return value by index or collection of values if index is slice."""
+        if isinstance(index, slice):
+            return self.__class__(list(self)[index])
+
+        index = self._normalize_index(index)
+        node = self._root
+        for shift in six.moves.range(self._shift, 0, -_TRIE_BITS):
+            node = node[(index >> shift) & _TRIE_MASK]
+        return node[index & _TRIE_MASK]
+
+    def __setitem__(self, index, value):
+        """Forbid setting of items of immutable collection."""
+        raise TypeError('{0} is immutable, use set() to get new version of '
+                        'it'.format(self.__class__.__name__))
+
+    def __iter__(self):
+        """Iterate values of collection."""
+        return itertools.chain.from_iterable(
+            _trie_leaves(self._root, self._shift))
+
+    def __len__(self):
+        """Return number of values in collection."""
+        return self._length
+
+    def __eq__(self, other):
+        """Compare values of collection with values of other sequence."""
+        if not isinstance(other, (list, tuple, PersistentCollection)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    def __ne__(self, other):
+        """Compare values of collection with values of other sequence."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return Pythonic representation of collection."""
+        return '{module}.{cls}({values})'.format(
+            module=self.__class__.__module__, cls=self.__class__.__name__,
+            values=repr(list(self)))
+
+    def _new_version(self, root, shift, length):
+        """Return new version of collection with passed trie."""
+        version = self.__class__.__new__(self.__class__)
+        version._root = root
+        version._shift = shift
+        version._length = length
+        return version
+
+    def _normalize_index(self, index):
+        """Return non-negative index, ensuring that it is in range."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('collection index out of range')
+        return index
+
+
+_TRIE_BITS = 5
+_TRIE_WIDTH = 1 << _TRIE_BITS
+_TRIE_MASK = _TRIE_WIDTH - 1
+
+
+def _build_trie(values):
+    """Build trie of values, returning its root and shift of root level."""
+    nodes = [tuple(values[start:start + _TRIE_WIDTH])
+             for start in six.moves.range(0, len(values), _TRIE_WIDTH)]
+    shift = 0
+    while len(nodes) > 1:
+        nodes = [tuple(nodes[start:start + _TRIE_WIDTH])
+                 for start in six.moves.range(0, len(nodes), _TRIE_WIDTH)]
+        shift += _TRIE_BITS
+    return (nodes[0] if nodes else tuple()), shift
+
+
+def _trie_path(shift, value):
+    """Return new branch of trie with single value."""
+    node = (value,)
+    for _ in six.moves.range(0, shift, _TRIE_BITS):
+        node = (node,)
+    return node
+
+
+def _trie_push(node, shift, index, value):
+    """Return copy of node's path with value added at the end."""
+    if shift == 0:
+        return node + (value,)
+    position = (index >> shift) & _TRIE_MASK
+    if position < len(node):
+        return node[:position] + (
+            _trie_push(node[position], shift - _TRIE_BITS, index, value),)
+    return node + (_trie_path(shift - _TRIE_BITS, value),)
+
+
+def _trie_assoc(node, shift, index, value):
+    """Return copy of node's path with value set at index."""
+    position = (index >> shift) & _TRIE_MASK
+    if shift == 0:
+        child = value
+    else:
+        child = _trie_assoc(node[position], shift - _TRIE_BITS, index, value)
+    return node[:position] + (child,) + node[position + 1:]
+
+
+def _trie_leaves(node, shift):
+    """Iterate leaves of trie."""
+    if shift == 0:
+        yield node
+        return
+    for child in node:
+        for leaf in _trie_leaves(child, shift - _TRIE_BITS):
+            yield leaf
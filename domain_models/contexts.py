@@ -0,0 +1,54 @@
+"""Contexts module."""
+
+import threading
+
+
+class ThreadLocalContext(object):
+    """Context that is activated in current thread by ``with`` statement.
+
+    Contexts are kept in per-thread stack, so nested contexts are
+    deactivated in reverse order. Every direct subclass is supposed to
+    declare its own :py:class:`ContextStack` as ``_contexts`` attribute.
+    """
+
+    _contexts = None
+
+    def __enter__(self):
+        """Activate context in current thread."""
+        self._contexts.push(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Deactivate context in current thread."""
+        self._contexts.remove(self)
+
+    @classmethod
+    def get_current(cls):
+        """Return context that is active in current thread.
+
+        :rtype ThreadLocalContext:
+        """
+        return cls._contexts.get_current()
+
+
+class ContextStack(object):
+    """Per-thread stack of active contexts."""
+
+    def __init__(self):
+        """Initializer."""
+        self._local = threading.local()
+
+    def push(self, context):
+        """Push context to stack of current thread."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = list()
+        self._local.stack.append(context)
+
+    def remove(self, context):
+        """Remove context from stack of current thread."""
+        self._local.stack.remove(context)
+
+    def get_current(self):
+        """Return last pushed context of current thread or None."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
@@ -0,0 +1,205 @@
+"""CSV codec module."""
+
+from __future__ import absolute_import
+
+import base64
+import csv
+
+import six
+
+from . import errors
+from . import fields
+from . import models
+
+
+TRUE_STRINGS = frozenset(('1', 'true', 't', 'yes', 'y', 'on'))
+"""Lower case strings that are decoded as True."""
+
+FALSE_STRINGS = frozenset(('0', 'false', 'f', 'no', 'n', 'off'))
+"""Lower case strings that are decoded as False."""
+
+
+class CSVCodec(object):
+    """Streaming codec of domain models to CSV and back.
+
+    Columns are mapped onto model's fields by names in header. Row
+    converter with per-column decoders is compiled once per header. Empty
+    strings are decoded as None and None values are encoded as empty
+    strings. Binary values are encoded as Base64 strings.
+
+    .. code-block:: python
+
+        codec = CSVCodec(Profile)
+        with open('profiles.csv') as csv_file:
+            for profiles in codec.read_batches(csv_file):
+                handle(profiles)
+    """
+
+    def __init__(self, model_cls, columns=None, batch_size=1000,
+                 dialect='excel'):
+        """Initializer.
+
+        :param class model_cls: Class of models.
+        :param columns: Names of written fields, by default all fields
+            except relations to other models.
+        :param int batch_size: Number of models in read batches.
+        :param dialect: CSV dialect.
+        """
+        self.model_cls = model_cls
+        self.columns = tuple(columns or (
+            name for name, field in six.iteritems(model_cls.__fields__)
+            if not isinstance(field, (fields.Model, fields.Collection))))
+        self.batch_size = batch_size
+        self.dialect = dialect
+
+    def read(self, csv_file):
+        """Iterate models read from CSV file with header.
+
+        :param csv_file: File object opened in text mode.
+        :rtype generator[DomainModel]:
+        """
+        reader = csv.reader(csv_file, self.dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        convert = self.compile_row_converter(header)
+        for row in reader:
+            yield convert(row)
+
+    def read_batches(self, csv_file):
+        """Iterate collections of models read from CSV file with header.
+
+        :param csv_file: File object opened in text mode.
+        :rtype generator[collections.Collection]:
+        """
+        batch = list()
+        for model in self.read(csv_file):
+            batch.append(model)
+            if len(batch) == self.batch_size:
+                yield self.model_cls.Collection(batch, type_check=False)
+                batch = list()
+        if batch:
+            yield self.model_cls.Collection(batch, type_check=False)
+
+    def write(self, csv_file, models, header=True):
+        """Write models into CSV file.
+
+        :param csv_file: File object opened in text mode.
+        :param models: Iterable of models.
+        :param bool header: Write header row.
+        """
+        writer = csv.writer(csv_file, self.dialect)
+        if header:
+            writer.writerow(self.columns)
+        columns = tuple((_get_value_getter(self.model_cls.__fields__[column]),
+                         _get_encoder(self.model_cls.__fields__[column]))
+                        for column in self.columns)
+        writer.writerows(
+            [encode(get_value(model)) for get_value, encode in columns]
+            for model in models)
+
+    def compile_row_converter(self, header):
+        """Return function that converts row into model.
+
+        Values of fields, which converters would not change decoded values,
+        are set directly to fields' storage.
+
+        :param header: Names of columns.
+        :rtype callable:
+        """
+        model_fields = self.model_cls.__fields__
+        positions = tuple((index, _get_decoder(model_fields[column]))
+                          for index, column in enumerate(header)
+                          if column in model_fields)
+        create = models.compile_model_factory(
+            self.model_cls,
+            (column for column in header if column in model_fields),
+            (field for field in model_fields.values()
+             if field.__class__ in _PLAIN_FIELD_CLASSES))
+        return lambda row: create(*[decode(row[index])
+                                    for index, decode in positions])
+
+
+def _get_decoder(field):
+    """Return decoder of CSV strings for field."""
+    for field_cls, decoder in _DECODERS:
+        if isinstance(field, field_cls):
+            return lambda value: decoder(value) if value else None
+    return lambda value: value or None
+
+
+def _get_value_getter(field):
+    """Return getter of field's value that is written into CSV.
+
+    References are written as keys of related models and binaries as
+    bytes.
+    """
+    if isinstance(field, fields.Reference):
+        return field.get_key
+    if isinstance(field, fields.Binary):
+        return field.get_builtin_type
+    return field.get_value
+
+
+def _get_encoder(field):
+    """Return encoder of field's values into CSV strings."""
+    for field_cls, encoder in _ENCODERS:
+        if isinstance(field, field_cls):
+            break
+    else:
+        encoder = six.text_type
+    return lambda value: '' if value is None else encoder(value)
+
+
+def _decode_bool(value):
+    """Decode CSV string into bool."""
+    value = value.lower()
+    if value in TRUE_STRINGS:
+        return True
+    if value in FALSE_STRINGS:
+        return False
+    raise errors.Error('"{0}" is not valid bool'.format(value))
+
+
+def _encode_bool(value):
+    """Encode bool into CSV string."""
+    return 'true' if value else 'false'
+
+
+def _decode_binary(value):
+    """Decode Base64 CSV string into bytes."""
+    try:
+        return base64.b64decode(value.encode('ascii'))
+    except (TypeError, ValueError):
+        raise errors.Error('"{0}" is not valid Base64 string'.format(value))
+
+
+def _encode_binary(value):
+    """Encode bytes into Base64 CSV string."""
+    return base64.b64encode(value).decode('ascii')
+
+
+def _encode_date(value):
+    """Encode date or date and time into CSV string."""
+    return value.isoformat()
+
+
+_DECODERS = (
+    (fields.Bool, _decode_bool),
+    (fields.Int, int),
+    (fields.Float, float),
+    (fields.DateTime, fields.parse_datetime),
+    (fields.Date, fields.parse_date),
+    (fields.Binary, _decode_binary),
+)
+
+_ENCODERS = (
+    (fields.Bool, _encode_bool),
+    (fields.Float, repr),
+    (fields.Date, _encode_date),
+    (fields.DateTime, _encode_date),
+    (fields.Binary, _encode_binary),
+)
+
+_PLAIN_FIELD_CLASSES = (fields.Bool, fields.Int, fields.Float, fields.String,
+                        fields.Date, fields.DateTime)
@@ -0,0 +1,171 @@
+"""DB-API mapper module."""
+
+from __future__ import absolute_import
+
+import six
+
+from . import errors
+from . import fields
+from . import models
+
+
+PLACEHOLDERS = {
+    'qmark': '?',
+    'format': '%s',
+    'pyformat': '%s',
+    'numeric': ':{0}',
+}
+"""Placeholders of supported DB-API parameter styles."""
+
+
+class DBAPIMapper(object):
+    """Mapper of domain models to rows of SQL table through DB-API.
+
+    Columns of cursor's rows are mapped onto model's fields positionally,
+    using converter that is compiled once per cursor description. Rows are
+    streamed with ``cursor.fetchmany()`` in batches of models collections.
+    Models are saved with ``cursor.executemany()``.
+
+    .. code-block:: python
+
+        mapper = DBAPIMapper(Profile, 'profiles')
+        for profiles in mapper.select(connection.cursor(), 'active = ?', [1]):
+            handle(profiles)
+    """
+
+    def __init__(self, model_cls, table, columns=None, paramstyle='qmark',
+                 batch_size=1000):
+        """Initializer.
+
+        :param class model_cls: Class of mapped models.
+        :param str table: Name of table.
+        :param columns: Names of mapped fields, by default all fields except
+            relations to other models.
+        :param str paramstyle: DB-API parameter style of driver.
+        :param int batch_size: Number of rows fetched at once.
+        """
+        if paramstyle not in PLACEHOLDERS:
+            raise errors.Error('Parameter style "{0}" is not supported, '
+                               'supported styles are: {1}'.format(
+                                   paramstyle, ', '.join(PLACEHOLDERS)))
+        self.model_cls = model_cls
+        self.table = table
+        self.columns = tuple(columns or (
+            name for name, field in six.iteritems(model_cls.__fields__)
+            if not isinstance(field, (fields.Model, fields.Collection))))
+        self.paramstyle = paramstyle
+        self.batch_size = batch_size
+
+    def select(self, cursor, where=None, parameters=()):
+        """Select rows of table and iterate batches of loaded models.
+
+        :param cursor: DB-API cursor.
+        :param str where: SQL condition.
+        :param parameters: Parameters of SQL condition.
+        :rtype generator[collections.Collection]:
+        """
+        query = 'SELECT {0} FROM {1}'.format(', '.join(self.columns),
+                                             self.table)
+        if where:
+            query = ' WHERE '.join((query, where))
+        cursor.execute(query, parameters)
+        return self.iterate_batches(cursor)
+
+    def iterate_batches(self, cursor):
+        """Iterate batches of models loaded from rows of executed cursor.
+
+        :param cursor: DB-API cursor.
+        :rtype generator[collections.Collection]:
+        """
+        convert = self.compile_row_converter(cursor.description)
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            yield self.model_cls.Collection([convert(row) for row in rows],
+                                            type_check=False)
+
+    def load(self, cursor):
+        """Return collection of models loaded from rows of executed cursor.
+
+        :param cursor: DB-API cursor.
+        :rtype collections.Collection:
+        """
+        models = self.model_cls.Collection()
+        for batch in self.iterate_batches(cursor):
+            models.extend(batch)
+        return models
+
+    def compile_row_converter(self, description):
+        """Return function that converts row into model.
+
+        :param description: DB-API cursor description.
+        :rtype callable:
+        """
+        model_fields = self.model_cls.__fields__
+        indexes = tuple(index for index, column in enumerate(description)
+                        if column[0] in model_fields)
+        create = models.compile_model_factory(
+            self.model_cls, (description[index][0] for index in indexes))
+        return lambda row: create(*[row[index] for index in indexes])
+
+    def insert_many(self, cursor, models, columns=None):
+        """Insert rows of models into table.
+
+        :param cursor: DB-API cursor.
+        :param models: Iterable of models.
+        :param columns: Names of inserted fields, by default all mapped.
+        """
+        columns = tuple(columns or self.columns)
+        query = 'INSERT INTO {0} ({1}) VALUES ({2})'.format(
+            self.table, ', '.join(columns),
+            ', '.join(self._get_placeholders(len(columns))))
+        cursor.executemany(query, self._iterate_rows(models, columns))
+
+    def update_many(self, cursor, models, columns=None):
+        """Update rows of models in table, finding them by unique key.
+
+        :param cursor: DB-API cursor.
+        :param models: Iterable of models.
+        :param columns: Names of updated fields, by default all mapped
+            fields that are not a part of unique key.
+        """
+        key_columns = tuple(field.name
+                            for field in self.model_cls.__unique_key__)
+        if not key_columns:
+            raise errors.Error('{0} could not be updated without '
+                               '__unique_key__'.format(self.model_cls))
+        columns = tuple(columns or (column for column in self.columns
+                                    if column not in key_columns))
+
+        placeholders = self._get_placeholders(len(columns + key_columns))
+        query = 'UPDATE {0} SET {1} WHERE {2}'.format(
+            self.table,
+            ', '.join(' = '.join(pair)
+                      for pair in zip(columns, placeholders)),
+            ' AND '.join(' = '.join(pair)
+                         for pair in zip(key_columns,
+                                         placeholders[len(columns):])))
+        cursor.executemany(query,
+                           self._iterate_rows(models, columns + key_columns))
+
+    def _get_placeholders(self, number):
+        """Return list of parameters placeholders."""
+        placeholder = PLACEHOLDERS[self.paramstyle]
+        return [placeholder.format(position)
+                for position in six.moves.range(1, number + 1)]
+
+    def _iterate_rows(self, models, columns):
+        """Iterate rows of models values."""
+        model_fields = tuple(self.model_cls.__fields__[column]
+                             for column in columns)
+        for model in models:
+            yield tuple(_get_column_value(field, model)
+                        for field in model_fields)
+
+
+def _get_column_value(field, model):
+    """Return value of model's field for database column."""
+    if isinstance(field, (fields.Binary, fields.Reference)):
+        return field.get_builtin_type(model)
+    return field.get_value(model)
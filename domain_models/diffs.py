@@ -0,0 +1,158 @@
+"""Diffs module.
+
+Patch of model is dictionary of operations by names of changed fields:
+
+- ``('=', value)`` sets built-in type representation of field's new value;
+- ``('~', patch)`` patches nested model;
+- ``('*', entries)`` rebuilds collection of models from entries in new
+  order, where ``('.', key)`` keeps existing model with unique key,
+  ``('~', key, patch)`` patches it and ``('+', data)`` creates new model.
+  Models that are not referenced by entries are removed.
+"""
+
+import six
+
+from . import errors
+from . import fields
+
+
+OP_SET = '='
+OP_PATCH = '~'
+OP_COLLECTION = '*'
+OP_KEEP = '.'
+OP_INSERT = '+'
+
+
+def diff(old, new):
+    """Return patch that turns old model into new one.
+
+    Fields with identical values are skipped without comparison, models of
+    collections are matched by their unique keys.
+
+    :param DomainModel old:
+    :param DomainModel new:
+    :rtype dict:
+    """
+    if old is new:
+        return dict()
+    if old.__class__ is not new.__class__:
+        raise errors.Error('Models of different classes {0} and {1} could '
+                           'not be compared'.format(old.__class__,
+                                                    new.__class__))
+
+    patch = dict()
+    for name, field in six.iteritems(old.__class__.__fields__):
+        if (field.deferred and not field.is_loaded(old) and
+                not field.is_loaded(new)):
+            continue
+        operation = _diff_field(field, old, new)
+        if operation is not None:
+            patch[name] = operation
+    return patch
+
+
+def apply_patch(model, patch):
+    """Apply patch to model in place.
+
+    Only fields that are mentioned in patch are converted and set, nested
+    models and collections are updated in place.
+
+    :param DomainModel model:
+    :param dict patch:
+    :rtype DomainModel:
+    """
+    for name, operation in six.iteritems(patch):
+        field = getattr(model.__class__, name)
+        if operation[0] == OP_SET:
+            field.set_value(model, operation[1])
+        elif operation[0] == OP_PATCH:
+            apply_patch(field.get_value(model), operation[1])
+        elif operation[0] == OP_COLLECTION:
+            _apply_collection_patch(field.get_value(model), operation[1])
+        else:
+            raise errors.Error('Unknown patch operation {0}'.format(
+                operation))
+    return model
+
+
+def _diff_field(field, old, new):
+    """Return operation that turns field's old value into new one."""
+    if isinstance(field, fields.Reference):
+        old_value, new_value = field.get_key(old), field.get_key(new)
+    else:
+        old_value, new_value = field.get_value(old), field.get_value(new)
+
+    if old_value is new_value:
+        return None
+    if old_value is None or new_value is None:
+        return OP_SET, field.get_builtin_type(new)
+    if isinstance(field, (fields.Model, fields.Collection)):
+        return _diff_relation(field, old, new, old_value, new_value)
+    if old_value != new_value:
+        return OP_SET, field.get_builtin_type(new)
+    return None
+
+
+def _diff_relation(field, old, new, old_value, new_value):
+    """Return operation that turns nested model or collection into new one.
+
+    Nested models are patched, if they are of the same class, collections
+    are patched, if their models have unique keys. Otherwise, relations are
+    compared by their built-in type representations.
+    """
+    if (isinstance(field, fields.Model) and
+            old_value.__class__ is new_value.__class__):
+        patch = diff(old_value, new_value)
+        return (OP_PATCH, patch) if patch else None
+    if (isinstance(field, fields.Collection) and
+            field.related_model_cls.__unique_key__):
+        entries = _diff_collection(old_value, new_value)
+        return (OP_COLLECTION, entries) if entries is not None else None
+
+    new_data = field.get_builtin_type(new)
+    if field.get_builtin_type(old) != new_data:
+        return OP_SET, new_data
+    return None
+
+
+def _diff_collection(old_models, new_models):
+    """Return entries of collection patch or None, if it is unchanged."""
+    old_keys = [_get_key(model) for model in old_models]
+    old_models_by_keys = dict(zip(old_keys, old_models))
+    new_keys = [_get_key(model) for model in new_models]
+    entries = list()
+    is_changed = old_keys != new_keys
+    for key, model in zip(new_keys, new_models):
+        existing_model = old_models_by_keys.get(key)
+        if existing_model is None:
+            entries.append((OP_INSERT, model.get_data()))
+            continue
+
+        patch = diff(existing_model, model)
+        if patch:
+            entries.append((OP_PATCH, key, patch))
+            is_changed = True
+        else:
+            entries.append((OP_KEEP, key))
+    return entries if is_changed else None
+
+
+def _apply_collection_patch(collection, entries):
+    """Rebuild collection in place from entries of collection patch."""
+    models_by_keys = dict((_get_key(model), model) for model in collection)
+    models = list()
+    for entry in entries:
+        if entry[0] == OP_INSERT:
+            models.append(collection.value_type(**entry[1]))
+            continue
+        model = models_by_keys[tuple(entry[1])]
+        if entry[0] == OP_PATCH:
+            apply_patch(model, entry[2])
+        models.append(model)
+    collection[:] = models
+
+
+def _get_key(model):
+    """Return tuple of values of model's unique key."""
+    return tuple(field.get_value(model)
+                 for field in model.__class__.__unique_key__)
@@ -1,16 +1,46 @@
 """Fields module."""
 
 import datetime
+import operator
+import re
+import threading
 
 import six
 
+from . import blobs
 from . import errors
+from . import interning
+from . import loaders
+
+try:
+    from functools import lru_cache as _lru_cache
+except ImportError:  # pragma: nocover
+    _lru_cache = None
+
+
+ISO_CACHE_SIZE = 4096
+"""Max number of parsed ISO-8601 strings that are cached by parsers."""
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_ISO_DATE_RE = re.compile(r'^([0-9]{4})-([0-9]{2})-([0-9]{2})\Z')
+
+_ISO_DATETIME_RE = re.compile(
+    r'^([0-9]{4})-([0-9]{2})-([0-9]{2})'
+    r'(?:[T ]([0-9]{2}):([0-9]{2})'
+    r'(?::([0-9]{2})(?:[.,]([0-9]{1,6})[0-9]*)?)?)?'
+    r'(Z|[+-][0-9]{2}(?::?[0-9]{2})?)?\Z')
 
 
 class Field(property):
-    """Base field."""
+    """Base field.
+
+    If field is declared with ``deferred=True``, its value is not required
+    to be passed on model's creation. Such value is loaded on first access by
+    loader that is registered with :py:meth:`Field.loader`.
+    """
 
-    def __init__(self, default=None, required=False):
+    def __init__(self, default=None, required=False, deferred=False):
         """Initializer."""
         super(Field, self).__init__(self.get_value, self.set_value)
         self.name = None
@@ -21,6 +51,9 @@ class Field(property):
         self.default = default
         self.required = required
 
+        self.deferred = deferred
+        self._loader = None
+
     def bind_name(self, name):
         """Bind field to its name in model class."""
         if self.name:
@@ -37,6 +70,7 @@ class Field(property):
                                'could not be rebound to "{2}"'.format(
                                    self, self.model_cls, model_cls))
         self.model_cls = model_cls
+        self._bind_getter()
         return self
 
     def init_model(self, model, value):
@@ -48,8 +82,23 @@ class Field(property):
         if value is None and self.default is not None:
             value = self.default() if callable(self.default) else self.default
 
+        if value is None and self.deferred:
+            self.unload(model)
+            return
+
         self.set_value(model, value)
 
+    def update_model(self, model, value):
+        """Update model's field, unless value is identical to stored one.
+
+        :param DomainModel model:
+        :param object value:
+        """
+        if (value is not None and self.is_loaded(model) and
+                getattr(model, self.storage_name) is value):
+            return
+        self.init_model(model, value)
+
     def get_value(self, model, default=None):
         """Return field's value.
 
@@ -60,7 +109,7 @@ class Field(property):
         if default is not None:
             default = self._converter(default)
 
-        value = getattr(model, self.storage_name)
+        value = self._get_stored_value(model)
         return value if value is not None else default
 
     def set_value(self, model, value):
@@ -77,6 +126,97 @@ class Field(property):
 
         setattr(model, self.storage_name, value)
 
+    def loader(self, function):
+        """Register loader of deferred field's values.
+
+        Loader is called with list of models and is supposed to return
+        sequence of their field's values in the same order. It could be used
+        as decorator in model's class body:
+
+        .. code-block:: python
+
+            class Photo(DomainModel):
+                id = fields.Int()
+                content = fields.Binary(deferred=True)
+
+                @content.loader
+                def load_content(photos):
+                    return storage.get_many(photo.id for photo in photos)
+
+        :param callable function:
+        :rtype staticmethod:
+        """
+        if not self.deferred:
+            raise errors.Error('Loader could not be registered for not '
+                               'deferred field "{0}"'.format(self.name))
+        self._loader = function
+        return staticmethod(function)
+
+    def is_loaded(self, model):
+        """Check if field's value of model is loaded.
+
+        :param DomainModel model:
+        :rtype bool:
+        """
+        return hasattr(model, self.storage_name)
+
+    def unload(self, model):
+        """Drop field's value of model, so it is loaded on next access.
+
+        :param DomainModel model:
+        """
+        if self.is_loaded(model):
+            delattr(model, self.storage_name)
+
+    def load(self, model):
+        """Load deferred field's value of model.
+
+        If model belongs to collection, field is loaded for all models of
+        collection that have not loaded it yet, by single call of loader.
+
+        :param DomainModel model:
+        """
+        if self._loader is None:
+            raise errors.Error('Deferred field "{0}" does not have '
+                               'loader'.format(self.name))
+
+        models = [model]
+        batch = getattr(model, '__deferred_batch__', None)
+        collection = batch() if batch is not None else None
+        if collection is not None:
+            models.extend(item for item in collection
+                          if item is not model and not self.is_loaded(item))
+
+        values = list(self._loader(models))
+        if len(values) != len(models):
+            raise errors.Error('Loader of field "{0}" returned {1} values '
+                               'for {2} models'.format(self.name, len(values),
+                                                       len(models)))
+        for item, value in zip(models, values):
+            self.set_value(item, value)
+
+    def _get_stored_value(self, model):
+        """Return value from field's storage, loading it if it is deferred."""
+        if self.deferred and not self.is_loaded(model):
+            self.load(model)
+        return getattr(model, self.storage_name)
+
+    def _bind_getter(self):
+        """Make reads of field's value resolve directly to its storage slot.
+
+        It is done only if field does not have any read-time logic, while
+        writes still go through :py:meth:`set_value`.
+        """
+        if not self.storage_name or self.deferred:
+            return
+
+        if (six.get_unbound_function(self.__class__.get_value) is not
+                six.get_unbound_function(Field.get_value)):
+            return
+
+        property.__init__(self, operator.attrgetter(self.storage_name),
+                          self.set_value, None, self.__doc__)
+
     def get_builtin_type(self, model):
         """Return built-in type representation of Field.
 
@@ -104,7 +244,13 @@ class Field(property):
         if not isinstance(data, (model_cls, dict)):
             raise TypeError('{0} is not valid type, instance of '
                             '{1} or dict required'.format(data, model_cls))
-        return model_cls(**data) if isinstance(data, dict) else data
+        if not isinstance(data, dict):
+            return data
+
+        context = interning.get_current_context()
+        if context is not None and model_cls in context.model_classes:
+            return context.get_model(model_cls, data)
+        return model_cls(**data)
 
 
 class Bool(Field):
@@ -132,47 +278,231 @@ class Float(Field):
 
 
 class String(Field):
-    """String field."""
+    """String field.
+
+    If field is declared with ``intern=True``, values are interned, so equal
+    values of different models share the same string object.
+    """
+
+    def __init__(self, default=None, required=False, intern=False,
+                 deferred=False):
+        """Initializer."""
+        super(String, self).__init__(default=default, required=required,
+                                     deferred=deferred)
+        self.intern = intern
 
     def _converter(self, value):
         """Convert raw input value of the field."""
-        return str(value)
+        value = str(value)
+        return six.moves.intern(value) if self.intern else value
+
+
+class Categorical(String):
+    """Categorical string field.
+
+    Field is intended for low-cardinality values. Every distinct value is
+    registered in per-field dictionary of categories and models store only
+    small integer code of their value.
+    """
+
+    def __init__(self, categories=None, default=None, required=False,
+                 deferred=False):
+        """Initializer."""
+        super(Categorical, self).__init__(default=default, required=required,
+                                          deferred=deferred)
+        self.categories = list()
+        self.codes = dict()
+        self._lock = threading.Lock()
+
+        for category in categories or tuple():
+            self.encode(str(category))
+
+    def encode(self, value):
+        """Return code of category, registering new category if needed.
+
+        :param str value:
+        :rtype int:
+        """
+        code = self.codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.categories)
+                    self.categories.append(value)
+                    self.codes[value] = code
+        return code
+
+    def get_value(self, model, default=None):
+        """Return field's value.
+
+        :param DomainModel model:
+        :param object default:
+        :rtype str:
+        """
+        if default is not None:
+            default = super(Categorical, self)._converter(default)
+
+        code = self._get_stored_value(model)
+        return self.categories[code] if code is not None else default
+
+    def get_code(self, model):
+        """Return code of field's value.
+
+        :param DomainModel model:
+        :rtype int:
+        """
+        return self._get_stored_value(model)
+
+    def filter(self, collection, value):
+        """Return collection of models that have field equal to value.
+
+        Models are filtered by comparison of integer codes. Deferred values
+        are loaded before filtering.
+
+        :param collections.Collection collection:
+        :param object value:
+        :rtype collections.Collection:
+        """
+        if self.deferred:
+            for model in collection:
+                self.get_code(model)
+
+        code = self.codes.get(str(value))
+        if code is None:
+            return collection.__class__()
+
+        get_code = operator.attrgetter(self.storage_name)
+        return collection.__class__(
+            [model for model in collection if get_code(model) == code],
+            type_check=False)
+
+    def _converter(self, value):
+        """Convert raw input value of the field into category code."""
+        return self.encode(super(Categorical, self)._converter(value))
 
 
 class Binary(Field):
-    """Binary field."""
+    """Binary field.
+
+    If field is declared with ``zero_copy=True``, memory views and byte
+    arrays are stored as read-only memory views without copying, and
+    :py:class:`domain_models.blobs.LazyBlob` objects are stored as is.
+    """
+
+    def __init__(self, default=None, required=False, zero_copy=False,
+                 deferred=False):
+        """Initializer."""
+        super(Binary, self).__init__(default=default, required=required,
+                                     deferred=deferred)
+        self.zero_copy = zero_copy
 
     def _converter(self, value):
         """Convert raw input value of the field."""
+        if self.zero_copy:
+            if isinstance(value, (six.binary_type, blobs.LazyBlob)):
+                return value
+            if isinstance(value, (memoryview, bytearray)):
+                return _readonly_view(value)
         return six.binary_type(value)
 
+    def get_builtin_type(self, model):
+        """Return built-in type representation of Binary.
+
+        :param DomainModel model:
+        :rtype bytes:
+        """
+        value = self.get_value(model)
+        if value is None or isinstance(value, six.binary_type):
+            return value
+        return value.tobytes()
+
 
 class Date(Field):
-    """Date field."""
+    """Date field.
+
+    Besides dates, it accepts ISO-8601 strings and UNIX timestamps.
+    """
+
+    def __init__(self, default=None, required=False, iso_format=False,
+                 deferred=False):
+        """Initializer."""
+        super(Date, self).__init__(default=default, required=required,
+                                   deferred=deferred)
+        self.iso_format = iso_format
 
     def _converter(self, value):
         """Convert raw input value of the field."""
-        if not isinstance(value, datetime.date):
-            raise TypeError('{0} is not valid date'.format(value))
+        if isinstance(value, datetime.date):
+            return value
+        if isinstance(value, six.string_types):
+            return parse_date(value)
+        if _is_timestamp(value):
+            return _from_timestamp(value).date()
+        raise TypeError('{0} is not valid date'.format(value))
+
+    def get_builtin_type(self, model):
+        """Return built-in type representation of Date.
+
+        If field is declared with ``iso_format=True``, date is represented
+        as ISO-8601 string.
+
+        :param DomainModel model:
+        :rtype object:
+        """
+        value = self.get_value(model)
+        if self.iso_format and value is not None:
+            return value.isoformat()
         return value
 
 
 class DateTime(Field):
-    """Date and time field."""
+    """Date and time field.
+
+    Besides date and time objects, it accepts ISO-8601 strings and UNIX
+    timestamps (converted to naive UTC date and time).
+    """
+
+    def __init__(self, default=None, required=False, iso_format=False,
+                 deferred=False):
+        """Initializer."""
+        super(DateTime, self).__init__(default=default, required=required,
+                                       deferred=deferred)
+        self.iso_format = iso_format
 
     def _converter(self, value):
         """Convert raw input value of the field."""
-        if not isinstance(value, datetime.datetime):
-            raise TypeError('{0} is not valid date and time')
+        if isinstance(value, datetime.datetime):
+            return value
+        if isinstance(value, six.string_types):
+            return parse_datetime(value)
+        if _is_timestamp(value):
+            return _from_timestamp(value)
+        raise TypeError('{0} is not valid date and time'.format(value))
+
+    def get_builtin_type(self, model):
+        """Return built-in type representation of DateTime.
+
+        If field is declared with ``iso_format=True``, date and time is
+        represented as ISO-8601 string.
+
+        :param DomainModel model:
+        :rtype object:
+        """
+        value = self.get_value(model)
+        if self.iso_format and value is not None:
+            return value.isoformat()
         return value
 
 
 class Model(Field):
     """Model relation field."""
 
-    def __init__(self, related_model_cls, default=None, required=False):
+    def __init__(self, related_model_cls, default=None, required=False,
+                 deferred=False):
         """Initializer."""
-        super(Model, self).__init__(default=default, required=required)
+        super(Model, self).__init__(default=default, required=required,
+                                    deferred=deferred)
         self.related_model_cls = related_model_cls
 
     def _converter(self, value):
@@ -189,15 +519,18 @@ class Model(Field):
         :param DomainModel model:
         :rtype dict:
         """
-        return self.get_value(model).get_data()
+        value = self.get_value(model)
+        return value.get_data() if value is not None else None
 
 
 class Collection(Field):
     """Models collection relation field."""
 
-    def __init__(self, related_model_cls, default=None, required=False):
+    def __init__(self, related_model_cls, default=None, required=False,
+                 deferred=False):
         """Initializer."""
-        super(Collection, self).__init__(default=default, required=required)
+        super(Collection, self).__init__(default=default, required=required,
+                                         deferred=deferred)
         self.related_model_cls = related_model_cls
 
     def _converter(self, value):
@@ -218,5 +551,245 @@ class Collection(Field):
         :param DomainModel model:
         :rtype list:
         """
+        value = self.get_value(model)
+        if value is None:
+            return None
         return [item.get_data() if isinstance(item, self.related_model_cls)
-                else item for item in self.get_value(model)]
+                else item for item in value]
+
+
+class Reference(Field):
+    """Reference to related model by its unique key.
+
+    Field stores key of related model and resolves it into model by data
+    loader of current :py:class:`domain_models.loaders.LoaderScope`. Keys
+    are enqueued as soon as they are set, so all references that were set
+    before first access are resolved by single call of batch load function.
+    """
+
+    def __init__(self, related_model_cls, default=None, required=False,
+                 deferred=False):
+        """Initializer."""
+        super(Reference, self).__init__(default=default, required=required,
+                                        deferred=deferred)
+        self.related_model_cls = related_model_cls
+
+    @property
+    def key_field(self):
+        """Return unique key field of related model.
+
+        :rtype Field:
+        """
+        unique_key = self.related_model_cls.__unique_key__
+        if len(unique_key) != 1:
+            raise errors.Error('{0} is supposed to have unique key of single '
+                               'field to be referenced'.format(
+                                   self.related_model_cls))
+        return unique_key[0]
+
+    def get_value(self, model, default=None):
+        """Return related model.
+
+        :param DomainModel model:
+        :param object default:
+        :rtype DomainModel:
+        """
+        key = self.get_key(model)
+        if key is None and default is not None:
+            key = self._converter(default)
+        if key is None:
+            return None
+        return loaders.get_loader(self.related_model_cls).load(key)
+
+    def set_value(self, model, value):
+        """Set key of related model and enqueue it for loading.
+
+        :param DomainModel model:
+        :param object value: Related model or its key.
+        """
+        super(Reference, self).set_value(model, value)
+
+        key = getattr(model, self.storage_name)
+        scope = loaders.get_current_scope()
+        if key is not None and scope is not None:
+            related_model = (value if isinstance(value, self.related_model_cls)
+                             else None)
+            scope.get_loader(self.related_model_cls).prime(key,
+                                                           related_model)
+
+    def get_key(self, model):
+        """Return key of related model.
+
+        :param DomainModel model:
+        :rtype object:
+        """
+        return self._get_stored_value(model)
+
+    def resolve_many(self, collection):
+        """Return list of models related to models of collection.
+
+        All keys are loaded by single call of batch load function.
+
+        :param collections.Collection collection:
+        :rtype list:
+        """
+        return loaders.get_loader(self.related_model_cls).load_many(
+            self.get_key(model) for model in collection)
+
+    def load_async(self, model):
+        """Return asyncio future of related model.
+
+        :param DomainModel model:
+        :rtype asyncio.Future:
+        """
+        return loaders.get_loader(self.related_model_cls).load_async(
+            self.get_key(model))
+
+    def get_builtin_type(self, model):
+        """Return built-in type representation of Reference.
+
+        :param DomainModel model:
+        :rtype object:
+        """
+        return self.get_key(model)
+
+    def _converter(self, value):
+        """Convert related model or its key into key.
+
+        :param object value:
+        :rtype object:
+        """
+        if isinstance(value, self.related_model_cls):
+            return self.key_field.get_value(value)
+        return self.key_field._converter(value)
+
+
+def _cached(parser):
+    """Wrap parser with LRU cache of :py:data:`ISO_CACHE_SIZE` entries.
+
+    If ``functools.lru_cache`` is not available, cache is flushed every time
+    it becomes full.
+    """
+    if _lru_cache is not None:
+        return _lru_cache(maxsize=ISO_CACHE_SIZE)(parser)
+
+    cache = dict()
+
+    def cached_parser(value):  # pragma: nocover
+        """Return cached result of parsing."""
+        try:
+            return cache[value]
+        except KeyError:
+            if len(cache) >= ISO_CACHE_SIZE:
+                cache.clear()
+            result = cache[value] = parser(value)
+            return result
+
+    cached_parser.__doc__ = parser.__doc__
+    return cached_parser
+
+
+def _readonly_view(value):
+    """Return read-only memory view of value, if it is supported.
+
+    Memory views of Python 2 could not be made read-only, but byte arrays
+    are viewed through read-only buffers.
+    """
+    if six.PY2 and isinstance(value, bytearray):  # pragma: nocover
+        return memoryview(buffer(value))  # noqa: F821
+    view = memoryview(value)
+    if hasattr(view, 'toreadonly'):
+        return view.toreadonly()
+    return view  # pragma: nocover
+
+
+def _is_timestamp(value):
+    """Check if value is a UNIX timestamp."""
+    return (isinstance(value, six.integer_types + (float,)) and
+            not isinstance(value, bool))
+
+
+def _from_timestamp(value):
+    """Return naive UTC date and time of UNIX timestamp."""
+    try:
+        return _EPOCH + datetime.timedelta(seconds=value)
+    except (OverflowError, ValueError):
+        raise TypeError('{0} is not valid timestamp'.format(value))
+
+
+def _timezone(designator):
+    """Return tzinfo of ISO-8601 time zone designator."""
+    if designator == 'Z':
+        minutes = 0
+    else:
+        digits = designator[1:].replace(':', '')
+        hours, minutes = int(digits[:2]), int(digits[2:] or 0)
+        if hours > 23 or minutes > 59:
+            raise ValueError('{0!r} is not valid time zone'.format(designator))
+        minutes += hours * 60
+        if designator[0] == '-':
+            minutes = -minutes
+
+    offset = datetime.timedelta(minutes=minutes)
+    if hasattr(datetime, 'timezone'):
+        return datetime.timezone(offset)
+    return _FixedOffset(offset)  # pragma: nocover
+
+
+class _FixedOffset(datetime.tzinfo):  # pragma: nocover
+    """Fixed offset time zone for Pythons without ``datetime.timezone``."""
+
+    def __init__(self, offset):
+        """Initializer."""
+        self._offset = offset
+
+    def utcoffset(self, dt):
+        """Return offset from UTC."""
+        return self._offset
+
+    def dst(self, dt):
+        """Return daylight saving time adjustment."""
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        """Return time zone name."""
+        return None
+
+
+@_cached
+def parse_date(value):
+    """Parse ISO-8601 date string.
+
+    Date and time strings are also accepted, date part of them is returned.
+
+    :param str value:
+    :rtype datetime.date:
+    """
+    match = _ISO_DATE_RE.match(value)
+    if match is None:
+        return parse_datetime(value).date()
+    try:
+        return datetime.date(*[int(part) for part in match.groups()])
+    except ValueError:
+        raise TypeError('{0!r} is not valid date'.format(value))
+
+
+@_cached
+def parse_datetime(value):
+    """Parse ISO-8601 date and time string.
+
+    :param str value:
+    :rtype datetime.datetime:
+    """
+    match = _ISO_DATETIME_RE.match(value)
+    if match is None:
+        raise TypeError('{0!r} is not valid date and time'.format(value))
+
+    parts = match.groups()
+    microsecond = int((parts[6] or '0').ljust(6, '0'))
+    try:
+        tzinfo = _timezone(parts[7]) if parts[7] else None
+        return datetime.datetime(*([int(part or 0) for part in parts[:6]] +
+                                   [microsecond, tzinfo]))
+    except ValueError:
+        raise TypeError('{0!r} is not valid date and time'.format(value))
@@ -0,0 +1,268 @@
+"""HTTP client module."""
+
+from __future__ import absolute_import
+
+import contextlib
+import json
+import socket
+import threading
+
+import six
+from six.moves import http_client
+from six.moves import queue
+from six.moves.urllib import parse
+
+from . import errors
+
+
+class ConnectionPool(object):
+    """Pool of persistent HTTP connections to single host."""
+
+    def __init__(self, scheme, netloc, max_size=4, timeout=None):
+        """Initializer.
+
+        :param str scheme: ``http`` or ``https``.
+        :param str netloc: Host and optional port.
+        :param int max_size: Max number of idle connections kept in pool.
+        :param float timeout: Timeout of connections.
+        """
+        if scheme == 'https':
+            self.connection_cls = http_client.HTTPSConnection
+        elif scheme == 'http':
+            self.connection_cls = http_client.HTTPConnection
+        else:
+            raise errors.Error('Scheme "{0}" is not supported'.format(scheme))
+        self.netloc = netloc
+        self.max_size = max_size
+        self.timeout = timeout
+        self._connections = queue.LifoQueue()
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Return context manager that provides connection.
+
+        Connection is returned to pool on exit or closed, if exception is
+        raised, including :py:exc:`GeneratorExit` of abandoned generators
+        that use connection.
+        """
+        try:
+            connection = self._connections.get_nowait()
+        except queue.Empty:
+            connection = self.connection_cls(self.netloc,
+                                             timeout=self.timeout)
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+        self.release(connection)
+
+    def release(self, connection):
+        """Return connection to pool or close it, if pool is full."""
+        if self._connections.qsize() < self.max_size:
+            self._connections.put_nowait(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class Resource(object):
+    """HTTP API resource that hydrates domain models.
+
+    Resource uses pool of persistent connections and fetches pages of
+    collection concurrently with bounded parallelism.
+
+    .. code-block:: python
+
+        tweets = Resource(Tweet, 'https://api.example.com/tweets',
+                          items_key='results')
+        for page in tweets.iterate_pages(parallelism=4, user='ets-labs'):
+            handle(page)
+    """
+
+    def __init__(self, model_cls, url, headers=None, items_key=None,
+                 page_parameter='page', pool_size=4, timeout=None):
+        """Initializer.
+
+        :param class model_cls: Class of models.
+        :param str url: URL of resource. Its query parameters are sent with
+            every request.
+        :param dict headers: Headers of every request.
+        :param str items_key: Key of items in JSON objects of pages, if
+            pages are not JSON arrays.
+        :param str page_parameter: Name of query parameter of page number.
+        :param int pool_size: Max number of idle connections kept in pool.
+        :param float timeout: Timeout of connections.
+        """
+        scheme, netloc, path, query, _ = parse.urlsplit(url)
+        self.model_cls = model_cls
+        self.path = path.rstrip('/')
+        self.parameters = dict(parse.parse_qsl(query))
+        self.headers = dict(headers or dict())
+        self.items_key = items_key
+        self.page_parameter = page_parameter
+        self.pool_size = pool_size
+        self.pool = ConnectionPool(scheme, netloc, max_size=pool_size,
+                                   timeout=timeout)
+
+    def get(self, identifier, **parameters):
+        """Return model fetched by identifier.
+
+        :rtype DomainModel:
+        """
+        path = '/' + parse.quote(six.text_type(identifier).encode('utf-8'),
+                                 safe='')
+        with self.request(path, parameters) as response:
+            return self.model_cls(**json.loads(_read_text(response)))
+
+    def fetch_page(self, page, **parameters):
+        """Return collection of models of page.
+
+        :param int page: Number of page.
+        :rtype collections.Collection:
+        """
+        parameters[self.page_parameter] = page
+        with self.request('', parameters) as response:
+            data = json.loads(_read_text(response))
+        if self.items_key is not None:
+            data = data[self.items_key]
+        return self.model_cls.Collection(self.model_cls(**item)
+                                         for item in data)
+
+    def iterate_pages(self, first_page=1, last_page=None, parallelism=None,
+                      **parameters):
+        """Iterate collections of models of pages in order.
+
+        Pages are fetched concurrently, by windows of ``parallelism``
+        pages. If last page is not specified, iteration stops on first
+        empty page.
+
+        :param int first_page: Number of first page.
+        :param int last_page: Number of last page.
+        :param int parallelism: Max number of concurrently fetched pages,
+            size of connections pool by default.
+        :rtype generator[collections.Collection]:
+        """
+        parallelism = parallelism or self.pool_size
+        page = first_page
+        while last_page is None or page <= last_page:
+            window_end = page + parallelism - 1
+            if last_page is not None:
+                window_end = min(window_end, last_page)
+            for collection in self._fetch_pages(page, window_end,
+                                                parameters):
+                if not collection and last_page is None:
+                    return
+                yield collection
+            page = window_end + 1
+
+    def stream(self, batch_size=1000, **parameters):
+        """Iterate collections of models read from JSON lines response.
+
+        Response body is read line by line, every line is JSON object of
+        model.
+
+        :param int batch_size: Number of models in collections.
+        :rtype generator[collections.Collection]:
+        """
+        with self.request('', parameters) as response:
+            batch = self.model_cls.Collection()
+            for line in _iterate_lines(response):
+                if not line.strip():
+                    continue
+                batch.append(self.model_cls(**json.loads(
+                    line.decode('utf-8'))))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = self.model_cls.Collection()
+            if batch:
+                yield batch
+
+    @contextlib.contextmanager
+    def request(self, path, parameters):
+        """Return context manager that provides response of GET request.
+
+        Request is retried once on new connection, if persistent connection
+        has been closed by server.
+
+        :param str path: Path relative to resource's URL.
+        :param dict parameters: Query parameters.
+        """
+        url = self.path + path
+        query = dict(self.parameters)
+        query.update(parameters)
+        if query:
+            url = '?'.join((url, parse.urlencode(sorted(query.items()))))
+
+        for attempt in (1, 2):
+            with self.pool.connection() as connection:
+                try:
+                    connection.request('GET', url, headers=self.headers)
+                    response = connection.getresponse()
+                except (http_client.HTTPException, socket.error):
+                    if attempt == 2:
+                        raise
+                    connection.close()
+                    continue
+                if response.status >= 400:
+                    raise errors.Error('GET {0} failed with {1} {2}'.format(
+                        url, response.status, response.reason))
+                yield response
+                response.read()
+                return
+
+    def _fetch_pages(self, first_page, last_page, parameters):
+        """Fetch pages concurrently and return list of their collections."""
+        pages = list(six.moves.range(first_page, last_page + 1))
+        results = [None] * len(pages)
+        failures = list()
+
+        def fetch(position, page):
+            try:
+                results[position] = self.fetch_page(page, **dict(parameters))
+            except Exception as exception:
+                failures.append(exception)
+
+        threads = [threading.Thread(target=fetch, args=(position, page))
+                   for position, page in enumerate(pages)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if failures:
+            raise failures[0]
+        return results
+
+
+def _read_text(response):
+    """Read body of response as text."""
+    return response.read().decode('utf-8')
+
+
+def _iterate_lines(response, chunk_size=8192):
+    """Iterate lines of response body.
+
+    Responses of Python 2 have no ``readline()``, so their body is read by
+    chunks and split into lines.
+    """
+    if hasattr(response, 'readline'):
+        for line in iter(response.readline, b''):
+            yield line
+        return
+
+    tail = b''
+    for chunk in iter(lambda: response.read(chunk_size), b''):
+        lines = (tail + chunk).split(b'\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
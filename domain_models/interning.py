@@ -0,0 +1,82 @@
+"""Interning module."""
+
+import six
+
+from . import contexts
+
+
+class InterningContext(contexts.ThreadLocalContext):
+    """Load-scoped interning of nested models.
+
+    While context is active in current thread, nested models of given
+    classes, that are created from equal raw dicts by
+    :py:class:`domain_models.fields.Model` and
+    :py:class:`domain_models.fields.Collection` fields, are created only once
+    and then reused. Interned models are shared between their parents, so
+    they are supposed to be treated as frozen.
+
+    .. code-block:: python
+
+        with InterningContext(Photo, Address):
+            profiles = Profile.Collection(Profile(**data) for data in feed)
+    """
+
+    _contexts = contexts.ContextStack()
+
+    def __init__(self, *model_classes):
+        """Initializer.
+
+        :param model_classes: Classes of models that could be interned.
+        """
+        self.model_classes = frozenset(model_classes)
+        self.models = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_model(self, model_cls, data):
+        """Return interned model of passed class for passed raw data.
+
+        If data is not hashable, new model is created without interning.
+
+        :param class model_cls:
+        :param dict data:
+        :rtype DomainModel:
+        """
+        try:
+            key = (model_cls, freeze(data))
+        except TypeError:
+            return model_cls(**data)
+
+        model = self.models.get(key)
+        if model is None:
+            model = self.models[key] = model_cls(**data)
+            self.misses += 1
+        else:
+            self.hits += 1
+        return model
+
+
+def get_current_context():
+    """Return interning context that is active in current thread.
+
+    :rtype InterningContext:
+    """
+    return InterningContext.get_current()
+
+
+def freeze(value):
+    """Return hashable representation of raw data.
+
+    Type of every scalar value is a part of its representation, so values
+    like ``1`` and ``True`` are not considered to be equal.
+
+    :param object value:
+    :rtype object:
+    """
+    if isinstance(value, dict):
+        return frozenset((name, freeze(item))
+                         for name, item in six.iteritems(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    hash(value)
+    return value.__class__, value
@@ -0,0 +1,252 @@
+"""Loaders module."""
+
+import inspect
+
+from . import contexts
+from . import errors
+
+
+_batch_loads = dict()
+
+
+class DataLoader(object):
+    """Batching and memoizing loader of models by keys.
+
+    Keys are enqueued by :py:meth:`DataLoader.prime` and loaded all together
+    by single call of batch load function, when value of any of them is
+    required. Loaded values are memoized for loader's lifetime.
+
+    Batch load function is called with list of keys and is supposed to
+    return either sequence of values in the same order, or dictionary of
+    values by keys. Missing values and values of None keys are None.
+    """
+
+    def __init__(self, batch_load):
+        """Initializer.
+
+        :param callable batch_load: Function that loads values by keys.
+        """
+        self.batch_load = batch_load
+        self.cache = dict()
+        self.dispatches = 0
+        self._queue = list()
+        self._queued = set()
+        self._futures = dict()
+
+    def prime(self, key, value=None):
+        """Enqueue key for loading or memoize its value, if it is passed.
+
+        :param object key:
+        :param object value:
+        """
+        if value is not None:
+            self.cache[key] = value
+        elif (key is not None and key not in self.cache and
+              key not in self._queued):
+            self._queue.append(key)
+            self._queued.add(key)
+
+    def load(self, key):
+        """Return value by key, loading all enqueued keys if needed.
+
+        :param object key:
+        :rtype object:
+        """
+        self.prime(key)
+        if key in self._queued:
+            self.dispatch()
+        return self.cache.get(key)
+
+    def load_many(self, keys):
+        """Return list of values by keys, loading them by single call.
+
+        :param iterable keys:
+        :rtype list:
+        """
+        keys = list(keys)
+        for key in keys:
+            self.prime(key)
+        self.dispatch()
+        return [self.cache.get(key) for key in keys]
+
+    def load_async(self, key):
+        """Return asyncio future of value by key.
+
+        Keys that are requested during the same iteration of event loop are
+        loaded by single call. Batch load function could return awaitable.
+
+        :param object key:
+        :rtype asyncio.Future:
+        """
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if key is None or key in self.cache:
+            future.set_result(self.cache.get(key))
+            return future
+
+        self.prime(key)
+        if not self._futures:
+            loop.call_soon(self._dispatch_futures)
+        self._futures.setdefault(key, list()).append(future)
+        return future
+
+    def dispatch(self):
+        """Load all enqueued keys by single call of batch load function."""
+        keys = self._take_queue()
+        if keys:
+            self._store(keys, self._call_batch_load(keys))
+
+    def clear(self):
+        """Clear memoized values."""
+        self.cache.clear()
+
+    def _take_queue(self):
+        """Return enqueued keys, making queue empty."""
+        keys = self._queue
+        self._queue = list()
+        self._queued = set()
+        if keys:
+            self.dispatches += 1
+        return keys
+
+    def _call_batch_load(self, keys):
+        """Call batch load function with keys."""
+        if self.batch_load is None:
+            raise errors.Error('Data loader does not have batch load '
+                               'function')
+        return self.batch_load(keys)
+
+    def _store(self, keys, values):
+        """Memoize loaded values of keys."""
+        if isinstance(values, dict):
+            values = [values.get(key) for key in keys]
+        else:
+            values = list(values)
+            if len(values) != len(keys):
+                raise errors.Error('Batch load function returned {0} values '
+                                   'for {1} keys'.format(len(values),
+                                                         len(keys)))
+        self.cache.update(zip(keys, values))
+
+    def _dispatch_futures(self):
+        """Load enqueued keys and resolve futures of their values."""
+        import asyncio
+
+        futures = self._futures
+        self._futures = dict()
+        keys = self._take_queue()
+        try:
+            values = self._call_batch_load(keys) if keys else None
+        except Exception as exception:
+            return self._fail_futures(futures, exception)
+
+        if not inspect.isawaitable(values):
+            return self._resolve_futures(futures, keys, values)
+
+        def resolve(done):
+            if done.exception() is not None:
+                self._fail_futures(futures, done.exception())
+            else:
+                self._resolve_futures(futures, keys, done.result())
+
+        asyncio.ensure_future(values).add_done_callback(resolve)
+
+    def _resolve_futures(self, futures, keys, values):
+        """Memoize loaded values and set them as results of futures."""
+        try:
+            if keys:
+                self._store(keys, values)
+        except errors.Error as exception:
+            return self._fail_futures(futures, exception)
+        for key, key_futures in futures.items():
+            for future in key_futures:
+                if not future.done():
+                    future.set_result(self.cache.get(key))
+
+    @staticmethod
+    def _fail_futures(futures, exception):
+        """Set exception to futures."""
+        for key_futures in futures.values():
+            for future in key_futures:
+                if not future.done():
+                    future.set_exception(exception)
+
+
+class LoaderScope(contexts.ThreadLocalContext):
+    """Request scope of data loaders.
+
+    While scope is active in current thread, models are loaded by its data
+    loaders, so loaded models are memoized within scope.
+
+    .. code-block:: python
+
+        register(User, load_users)
+
+        with LoaderScope():
+            for post in posts:
+                handle(post, post.author)
+    """
+
+    _contexts = contexts.ContextStack()
+
+    def __init__(self, batch_loads=None):
+        """Initializer.
+
+        :param dict batch_loads: Batch load functions by model classes that
+            override registered ones.
+        """
+        self.batch_loads = dict(batch_loads or dict())
+        self.loaders = dict()
+
+    def get_loader(self, model_cls):
+        """Return data loader of models of passed class.
+
+        :param class model_cls:
+        :rtype DataLoader:
+        """
+        loader = self.loaders.get(model_cls)
+        if loader is None:
+            loader = self.loaders[model_cls] = DataLoader(
+                self.get_batch_load(model_cls))
+        return loader
+
+    def get_batch_load(self, model_cls):
+        """Return batch load function of models of passed class.
+
+        None is returned, if function is not registered.
+
+        :param class model_cls:
+        :rtype callable:
+        """
+        return self.batch_loads.get(model_cls, _batch_loads.get(model_cls))
+
+
+def register(model_cls, batch_load):
+    """Register batch load function of models of passed class.
+
+    :param class model_cls:
+    :param callable batch_load:
+    """
+    _batch_loads[model_cls] = batch_load
+
+
+def get_current_scope():
+    """Return loader scope that is active in current thread.
+
+    :rtype LoaderScope:
+    """
+    return LoaderScope.get_current()
+
+
+def get_loader(model_cls):
+    """Return data loader of current scope or new one, if there is no scope.
+
+    :param class model_cls:
+    :rtype DataLoader:
+    """
+    scope = get_current_scope()
+    if scope is None:
+        scope = LoaderScope()
+    return scope.get_loader(model_cls)
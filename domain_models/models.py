@@ -3,11 +3,26 @@
 from __future__ import absolute_import
 
 import collections as std_collections
+import contextlib
+import operator
+import threading
+import weakref
+
 import six
 
 from . import fields
 from . import collections
 from . import errors
+from . import pools
+
+
+IDENTITY_POLICY_KEEP = 'keep'
+"""Identity map policy that keeps existing model unchanged."""
+
+IDENTITY_POLICY_UPDATE = 'update'
+"""Identity map policy that updates existing model with passed data."""
+
+IDENTITY_POLICIES = (IDENTITY_POLICY_KEEP, IDENTITY_POLICY_UPDATE)
 
 
 class DomainModelMetaClass(type):
@@ -16,24 +31,82 @@ class DomainModelMetaClass(type):
     def __new__(mcs, class_name, bases, attributes):
         """Domain model class factory."""
         model_fields = mcs.parse_fields(attributes)
+        deferred_fields = mcs.prepare_deferred_fields(model_fields, bases)
 
         if attributes.get('__slots_optimization__', True):
             attributes['__slots__'] = mcs.prepare_model_slots(model_fields)
+            if (attributes.get('__identity_map__') and
+                    not any(base.__weakrefoffset__ for base in bases)):
+                attributes['__slots__'] += ('__weakref__',)
+            if (deferred_fields and
+                    not any(getattr(base, '__deferred_fields__', None)
+                            for base in bases)):
+                attributes['__slots__'] += ('__deferred_batch__',)
 
         cls = type.__new__(mcs, class_name, bases, attributes)
 
         cls.__fields__ = mcs.bind_fields_to_model_cls(cls, model_fields)
+        cls.__deferred_fields__ = deferred_fields
         cls.__unique_key__ = mcs.prepare_fields_attribute(
             attribute_name='__unique_key__', attributes=attributes,
             class_name=class_name)
         cls.__view_key__ = mcs.prepare_fields_attribute(
             attribute_name='__view_key__', attributes=attributes,
             class_name=class_name)
+        cls.__ordering__ = mcs.prepare_fields_attribute(
+            attribute_name='__ordering__', attributes=attributes,
+            class_name=class_name)
+        cls.__ordering_key__ = mcs.prepare_ordering_key(cls.__ordering__)
+
+        cls.__identity_map__ = mcs.prepare_identity_map(cls, attributes)
+        cls.__pool__ = mcs.prepare_pool(cls, attributes)
 
         mcs.bind_collection_to_model_cls(cls)
 
         return cls
 
+    def __call__(cls, *args, **kwargs):
+        """Create domain model.
+
+        If identity map is enabled for model's class and model with the same
+        unique key is alive, it is returned instead of new one, being
+        updated with passed data according to ``__identity_policy__``.
+        """
+        identity_map = cls.__identity_map__
+        if identity_map is None:
+            return super(DomainModelMetaClass, cls).__call__(*args, **kwargs)
+
+        key = cls.get_identity_key(kwargs)
+        if key is None:
+            return super(DomainModelMetaClass, cls).__call__(*args, **kwargs)
+
+        model = identity_map.get(key)
+        if model is None:
+            model = super(DomainModelMetaClass, cls).__call__(*args,
+                                                              **kwargs)
+            existing_model = identity_map.setdefault(key, model)
+            if existing_model is model:
+                return model
+            model = existing_model
+
+        if cls.__identity_policy__ == IDENTITY_POLICY_UPDATE:
+            model.set_data(kwargs, partial=True)
+        return model
+
+    def get_identity_key(cls, data):
+        """Return unique key of model data for identity map.
+
+        None is returned if some of unique key's values is not provided.
+
+        :type data: dict
+        :rtype: tuple
+        """
+        key = tuple(data.get(field.name) for field in cls.__unique_key__)
+        if None in key:
+            return None
+        return tuple(field._converter(value)
+                     for field, value in zip(cls.__unique_key__, key))
+
     @staticmethod
     def parse_fields(attributes):
         """Parse model fields."""
@@ -46,6 +119,15 @@ class DomainModelMetaClass(type):
         """Return tuple of model field slots."""
         return tuple(field.storage_name for field in model_fields)
 
+    @staticmethod
+    def prepare_deferred_fields(model_fields, bases):
+        """Return tuple of model's and its parents' deferred fields."""
+        deferred_fields = tuple(field for field in model_fields
+                                if field.deferred)
+        for base in bases:
+            deferred_fields += getattr(base, '__deferred_fields__', tuple())
+        return deferred_fields
+
     @staticmethod
     def prepare_fields_attribute(attribute_name, attributes, class_name):
         """Prepare model fields attribute."""
@@ -60,6 +142,56 @@ class DomainModelMetaClass(type):
                                fields.Field, attribute)
         return attribute
 
+    @staticmethod
+    def prepare_ordering_key(ordering):
+        """Return function that extracts ordering key of model.
+
+        Values of fields without read-time logic are extracted directly from
+        their storage slots by single :py:func:`operator.attrgetter`. None
+        values are ordered after any other values.
+        """
+        if not ordering:
+            return None
+        getters = tuple(field.fget for field in ordering)
+        if len(getters) > 1 and all(isinstance(getter, operator.attrgetter)
+                                    for getter in getters):
+            get_values = operator.attrgetter(*(field.storage_name
+                                               for field in ordering))
+        else:
+            def get_values(model):
+                """Return values of ordering fields."""
+                return tuple(getter(model) for getter in getters)
+        get_sort_value = collections.get_sort_value
+        return lambda model: tuple(six.moves.map(get_sort_value,
+                                                 get_values(model)))
+
+    @staticmethod
+    def prepare_identity_map(cls, attributes):
+        """Return identity map of model's class, if it is enabled."""
+        if not attributes.get('__identity_map__'):
+            return None
+        if not cls.__unique_key__:
+            raise errors.Error('{0}.__identity_map__ requires '
+                               '__unique_key__ to be defined'.format(
+                                   cls.__name__))
+        if cls.__identity_policy__ not in IDENTITY_POLICIES:
+            raise errors.Error('{0}.__identity_policy__ is supposed to be one '
+                               'of {1}, instead {2} given'.format(
+                                   cls.__name__, IDENTITY_POLICIES,
+                                   cls.__identity_policy__))
+        return weakref.WeakValueDictionary()
+
+    @staticmethod
+    def prepare_pool(cls, attributes):
+        """Return pool of model's class, if it is enabled."""
+        pool_size = attributes.get('__pool_size__')
+        if not pool_size:
+            return None
+        if cls.__identity_map__ is not None:
+            raise errors.Error('{0}.__pool_size__ could not be used together '
+                               'with __identity_map__'.format(cls.__name__))
+        return pools.ModelPool(cls, pool_size)
+
     @staticmethod
     def bind_fields_to_model_cls(cls, model_fields):
         """Bind fields to model class."""
@@ -70,13 +202,54 @@ class DomainModelMetaClass(type):
     def bind_collection_to_model_cls(cls):
         """Bind collection to model's class.
 
+        Subclass of collection, specialized for model's class, is created on
+        first access to ``Model.Collection``.
+        """
+        cls.Collection = CollectionDescriptor(cls)
+
+
+class CollectionDescriptor(object):
+    """Descriptor that lazily creates model's collection class.
+
+    Collection class is created on first access and replaces descriptor in
+    model's class, so every next access is a plain class attribute lookup.
+    """
+
+    _lock = threading.RLock()
+
+    def __init__(self, model_cls):
+        """Initializer."""
+        self.model_cls = model_cls
+        self.base = model_cls.__dict__.get('Collection')
+
+    def __get__(self, instance, owner):
+        """Return collection class of model, creating it if needed."""
+        with self._lock:
+            collection_cls = self.model_cls.__dict__['Collection']
+            if collection_cls is self:
+                collection_cls = self.create_collection_cls()
+                setattr(self.model_cls, 'Collection', collection_cls)
+        return collection_cls
+
+    def create_collection_cls(self):
+        """Create subclass of collection, specialized for model's class.
+
         If collection was not specialized in process of model's declaration,
-        subclass of collection will be created.
+        subclass of parent model's collection will be created. Collections of
+        models with deferred fields are made batch loading.
         """
-        cls.Collection = type('{0}.Collection'.format(cls.__name__),
-                              (cls.Collection,),
-                              {'value_type': cls})
-        cls.Collection.__module__ = cls.__module__
+        base = self.base
+        if base is None:
+            base = super(self.model_cls, self.model_cls).Collection
+        bases = (base,)
+        if (self.model_cls.__deferred_fields__ and
+                not issubclass(base, collections.BatchLoadingCollection)):
+            bases = (collections.BatchLoadingCollection, base)
+        collection_cls = type('{0}.Collection'.format(self.model_cls.__name__),
+                              bases,
+                              {'value_type': self.model_cls})
+        collection_cls.__module__ = self.model_cls.__module__
+        return collection_cls
 
 
 @six.python_2_unicode_compatible
@@ -107,14 +280,66 @@ class DomainModel(object):
         Tuple of model fields that represents view key.
 
         :type: tuple[fields.Field]
+
+    .. py:attribute:: __ordering__
+
+        Tuple of model fields that define ordering of models. If it is
+        declared, models support ``<``, ``<=``, ``>`` and ``>=`` comparisons.
+        None values of fields are ordered after any other values.
+
+        :type: tuple[fields.Field]
+
+    .. py:attribute:: __ordering_key__
+
+        Function that returns ordering key of model, if ``__ordering__`` is
+        declared, or None otherwise. It could be used as ``key`` argument of
+        :py:func:`sorted`.
+
+        :type: callable
+
+    .. py:attribute:: __deferred_fields__
+
+        Tuple of model fields that are declared with ``deferred=True``,
+        including fields of parent models.
+
+        :type: tuple[fields.Field]
+
+    .. py:attribute:: __identity_map__
+
+        Identity map of alive models by their unique keys. It is enabled by
+        declaring ``__identity_map__ = True`` in model's class and is None
+        otherwise.
+
+        :type: weakref.WeakValueDictionary
+
+    .. py:attribute:: __identity_policy__
+
+        What to do with alive model, when model with the same unique key is
+        created: ``'update'`` it with passed data or ``'keep'`` it unchanged.
+
+        :type: str
+
+    .. py:attribute:: __pool__
+
+        Pool of released models. It is enabled by declaring max number of
+        released models in ``__pool_size__`` attribute of model's class and
+        is None otherwise.
+
+        :type: pools.ModelPool
     """
 
     Collection = collections.Collection
 
     __fields__ = dict()
+    __deferred_fields__ = tuple()
     __view_key__ = tuple()
     __unique_key__ = tuple()
+    __ordering__ = tuple()
+    __ordering_key__ = None
     __slots_optimization__ = True
+    __identity_map__ = None
+    __identity_policy__ = IDENTITY_POLICY_UPDATE
+    __pool__ = None
 
     def __init__(self, **kwargs):
         """Initializer."""
@@ -122,6 +347,40 @@ class DomainModel(object):
             field.init_model(self, kwargs.get(name))
         super(DomainModel, self).__init__()
 
+    @classmethod
+    def acquire(cls, **kwargs):
+        """Return model, reusing released one if pool is enabled.
+
+        :rtype: DomainModel
+        """
+        if cls.__pool__ is None:
+            return cls(**kwargs)
+        return cls.__pool__.acquire(**kwargs)
+
+    def release(self):
+        """Return model to pool, if it is enabled.
+
+        Model is not supposed to be used after release.
+        """
+        if self.__class__.__pool__ is not None:
+            self.__class__.__pool__.release(self)
+
+    @classmethod
+    @contextlib.contextmanager
+    def pooled(cls, **kwargs):
+        """Return context manager that acquires model and releases it on exit.
+
+        .. code-block:: python
+
+            with Model.pooled(id=1) as model:
+                handle(model)
+        """
+        model = cls.acquire(**kwargs)
+        try:
+            yield model
+        finally:
+            model.release()
+
     def __eq__(self, other):
         """Make equality comparation based on unique key.
 
@@ -160,6 +419,26 @@ class DomainModel(object):
                               for field in self.__class__.__unique_key__))
         return super(DomainModel, self).__hash__()
 
+    def __lt__(self, other):
+        """Make less than comparation based on ordering key."""
+        keys = self._get_ordering_keys(other)
+        return keys[0] < keys[1] if keys else NotImplemented
+
+    def __le__(self, other):
+        """Make less than or equal comparation based on ordering key."""
+        keys = self._get_ordering_keys(other)
+        return keys[0] <= keys[1] if keys else NotImplemented
+
+    def __gt__(self, other):
+        """Make greater than comparation based on ordering key."""
+        keys = self._get_ordering_keys(other)
+        return keys[0] > keys[1] if keys else NotImplemented
+
+    def __ge__(self, other):
+        """Make greater than or equal comparation based on ordering key."""
+        keys = self._get_ordering_keys(other)
+        return keys[0] >= keys[1] if keys else NotImplemented
+
     def __repr__(self):
         """Return Pythonic representation of domain model."""
         return '{module}.{cls}({fields_values})'.format(
@@ -180,6 +459,17 @@ class DomainModel(object):
                                               str(field.get_value(self))))
                                     for field in self.__class__.__view_key__))
 
+    def _get_ordering_keys(self, other):
+        """Return ordering keys of model and other model.
+
+        None is returned if ordering is not declared or other object is not
+        a model of the same class.
+        """
+        ordering_key = self.__class__.__ordering_key__
+        if ordering_key is None or not isinstance(other, self.__class__):
+            return None
+        return ordering_key(self), ordering_key(other)
+
     def get(self, field_name, default=None):
         """Return the value of the field.
 
@@ -212,10 +502,83 @@ class DomainModel(object):
                     for name, field in
                     six.iteritems(self.__class__.__fields__))
 
-    def set_data(self, data):
+    def set_data(self, data, partial=False):
         """Set dictionary data to model.
 
+        If ``partial=True`` is passed, only fields, which names are keys of
+        data, are set and the rest of fields are left unchanged. Values that
+        are identical to stored ones are not converted again.
+
         :type data: dict
+        :type partial: bool
         """
-        for name, field in six.iteritems(self.__class__.__fields__):
-            field.init_model(self, data.get(name))
+        model_fields = self.__class__.__fields__
+        if not partial:
+            for name, field in six.iteritems(model_fields):
+                field.init_model(self, data.get(name))
+            return
+
+        for name, value in six.iteritems(data):
+            field = model_fields.get(name)
+            if field is not None:
+                field.update_model(self, value)
+
+    def update(self, **changes):
+        """Set passed fields' values, leaving the rest of fields unchanged.
+
+        It is equivalent to ``model.set_data(changes, partial=True)``.
+        """
+        self.set_data(changes, partial=True)
+
+
+def compile_model_factory(model_cls, names, plain_fields=()):
+    """Return function that creates model from values of named fields.
+
+    Returned function is called with values in order of names. Values of
+    plain fields, which converters would not change them, are set directly
+    to fields' storage, the rest are set by fields. Fields that are not
+    named are initialized with None.
+
+    If model's class has identity map enabled or overrides initializer,
+    models are created by constructor.
+
+    :param class model_cls:
+    :param tuple names: Names of fields.
+    :param plain_fields: Fields, which values are passed already converted.
+        They are set directly to storage, unless fields have default, are
+        required, deferred or interned.
+    :rtype callable:
+    """
+    names = tuple(names)
+    if (model_cls.__identity_map__ is not None or
+            six.get_unbound_function(model_cls.__init__) is not
+            six.get_unbound_function(DomainModel.__init__)):
+        return lambda *values: model_cls(**dict(zip(names, values)))
+
+    plain_fields = frozenset(plain_fields)
+    setters = tuple(
+        (field.storage_name, None)
+        if field in plain_fields and _is_plain(field) else (None, field)
+        for field in (getattr(model_cls, name) for name in names))
+    missing_fields = tuple(field for field in model_cls.__fields__.values()
+                           if field.name not in names)
+
+    def create(*values):
+        """Create model from values of fields."""
+        model = model_cls.__new__(model_cls)
+        for (storage_name, field), value in zip(setters, values):
+            if field is None:
+                setattr(model, storage_name, value)
+            else:
+                field.init_model(model, value)
+        for field in missing_fields:
+            field.init_model(model, None)
+        return model
+
+    return create
+
+
+def _is_plain(field):
+    """Check if field's value could be set directly to its storage."""
+    return (field.default is None and not field.required and
+            not field.deferred and not getattr(field, 'intern', False))
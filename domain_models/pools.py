@@ -0,0 +1,93 @@
+"""Pools module."""
+
+import threading
+
+
+class ModelPool(object):
+    """Pool of released models of some class.
+
+    Released models are reset by clearing their fields' storage and their
+    references to collections that batch loading of deferred fields, and
+    are reused by next acquisitions instead of allocation of new models.
+    Pool could be shared by threads.
+    """
+
+    def __init__(self, model_cls, max_size):
+        """Initializer.
+
+        :param class model_cls: Class of pooled models.
+        :param int max_size: Max number of released models kept in pool.
+        """
+        self.model_cls = model_cls
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.discards = 0
+        self._models = list()
+        self._released = set()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        """Return number of released models kept in pool.
+
+        :rtype int:
+        """
+        return len(self._models)
+
+    @property
+    def hit_rate(self):
+        """Return share of acquisitions that reused released models.
+
+        :rtype float:
+        """
+        acquisitions = self.hits + self.misses
+        return float(self.hits) / acquisitions if acquisitions else 0.0
+
+    def acquire(self, **kwargs):
+        """Return initialized model, reusing released one if possible.
+
+        :rtype DomainModel:
+        """
+        with self._lock:
+            try:
+                model = self._models.pop()
+            except IndexError:
+                self.misses += 1
+                model = None
+            else:
+                self._released.discard(id(model))
+                self.hits += 1
+
+        if model is None:
+            return self.model_cls(**kwargs)
+        model.__init__(**kwargs)
+        return model
+
+    def release(self, model):
+        """Return model to pool.
+
+        Model is not supposed to be used after release. Repeated release of
+        model that is kept in pool is ignored.
+
+        :param DomainModel model:
+        """
+        with self._lock:
+            if id(model) in self._released:
+                return
+            if len(self._models) >= self.max_size:
+                self.discards += 1
+                return
+
+            for field in self.model_cls.__fields__.values():
+                setattr(model, field.storage_name, None)
+            if self.model_cls.__deferred_fields__:
+                model.__deferred_batch__ = None
+            self._models.append(model)
+            self._released.add(id(model))
+
+    def clear(self):
+        """Drop all released models kept in pool."""
+        with self._lock:
+            del self._models[:]
+            self._released.clear()
@@ -0,0 +1,224 @@
+"""Redis mapper module."""
+
+from __future__ import absolute_import
+
+import json
+
+import six
+
+from . import errors
+from . import fields
+
+
+class RedisMapper(object):
+    """Mapper of domain models to Redis hashes.
+
+    Every model is stored in separate hash, which key consists of key prefix
+    and values of model's unique key. Model's fields are mapped to hash
+    fields, None values are not stored. Models are saved and loaded in
+    batches, every batch is sent to Redis in single round trip through
+    pipeline.
+
+    .. code-block:: python
+
+        mapper = RedisMapper.from_url(Profile, 'redis://localhost:6379/0')
+        mapper.save_many(profiles)
+        profiles = mapper.load_many([1, 2, 3])
+    """
+
+    def __init__(self, model_cls, client, key_prefix=None, batch_size=500):
+        """Initializer.
+
+        :param class model_cls: Class of mapped models.
+        :param client: Redis client, for example ``redis.Redis``.
+        :param str key_prefix: Prefix of hash keys, name of model's class in
+            lower case by default.
+        :param int batch_size: Max number of models in pipeline.
+        """
+        if not model_cls.__unique_key__:
+            raise errors.Error('{0} could not be mapped to Redis without '
+                               '__unique_key__'.format(model_cls.__name__))
+        self.model_cls = model_cls
+        self.client = client
+        self.key_prefix = key_prefix or model_cls.__name__.lower()
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_url(cls, model_cls, url, max_connections=None, **kwargs):
+        """Create mapper with client that uses pool of connections to url.
+
+        Requires ``redis`` package to be installed.
+
+        :param class model_cls: Class of mapped models.
+        :param str url: Redis URL, like ``redis://localhost:6379/0``.
+        :param int max_connections: Max number of pooled connections.
+        :rtype RedisMapper:
+        """
+        try:
+            import redis
+        except ImportError:
+            raise errors.Error('Package "redis" is required by '
+                               '{0}.from_url()'.format(cls.__name__))
+        pool = redis.ConnectionPool.from_url(url,
+                                             max_connections=max_connections)
+        return cls(model_cls, redis.Redis(connection_pool=pool), **kwargs)
+
+    def get_key(self, unique_key):
+        """Return key of hash for unique key value.
+
+        :param object unique_key: Tuple of unique key's values or single
+            value for unique key of one field.
+        :rtype str:
+        """
+        if not isinstance(unique_key, tuple):
+            unique_key = (unique_key,)
+        return ':'.join([self.key_prefix] +
+                        [six.text_type(value) for value in unique_key])
+
+    def get_model_key(self, model):
+        """Return key of model's hash.
+
+        :param DomainModel model:
+        :rtype str:
+        """
+        return self.get_key(tuple(field.get_value(model)
+                                  for field in self.model_cls.__unique_key__))
+
+    def save(self, model):
+        """Save model.
+
+        :param DomainModel model:
+        """
+        self.save_many((model,))
+
+    def save_many(self, models):
+        """Save models in batches.
+
+        :param models: Iterable of models.
+        """
+        for batch in _iterate_batches(models, self.batch_size):
+            pipeline = self.client.pipeline(transaction=False)
+            for model in batch:
+                key = self.get_model_key(model)
+                pipeline.delete(key)
+                pipeline.hset(key, mapping=self.dump(model))
+            pipeline.execute()
+
+    def load(self, unique_key):
+        """Load model by unique key.
+
+        :param object unique_key:
+        :rtype DomainModel: Loaded model or None if it does not exist.
+        """
+        models = self.load_many((unique_key,))
+        return models[0] if models else None
+
+    def load_many(self, unique_keys):
+        """Load models by unique keys in batches.
+
+        Models, that do not exist, are skipped.
+
+        :param unique_keys: Iterable of unique keys.
+        :rtype collections.Collection:
+        """
+        models = self.model_cls.Collection()
+        for batch in _iterate_batches(unique_keys, self.batch_size):
+            pipeline = self.client.pipeline(transaction=False)
+            for unique_key in batch:
+                pipeline.hgetall(self.get_key(unique_key))
+            models.extend(self.load_model(data)
+                          for data in pipeline.execute() if data)
+        return models
+
+    def delete_many(self, unique_keys):
+        """Delete models by unique keys in batches.
+
+        :param unique_keys: Iterable of unique keys.
+        """
+        for batch in _iterate_batches(unique_keys, self.batch_size):
+            pipeline = self.client.pipeline(transaction=False)
+            for unique_key in batch:
+                pipeline.delete(self.get_key(unique_key))
+            pipeline.execute()
+
+    def dump(self, model):
+        """Return hash fields of model.
+
+        :param DomainModel model:
+        :rtype dict:
+        """
+        data = dict()
+        for name, field in six.iteritems(self.model_cls.__fields__):
+            if _get_value(field, model) is not None:
+                data[name] = _encode(field, model)
+        return data
+
+    def load_model(self, data):
+        """Return model loaded from hash fields.
+
+        :param dict data:
+        :rtype DomainModel:
+        """
+        model_fields = self.model_cls.__fields__
+        kwargs = dict()
+        for name, value in six.iteritems(data):
+            if isinstance(name, six.binary_type):
+                name = name.decode('utf-8')
+            if name in model_fields:
+                kwargs[name] = _decode(model_fields[name], value)
+        return self.model_cls(**kwargs)
+
+
+def _iterate_batches(iterable, batch_size):
+    """Iterate lists of consecutive items of iterable."""
+    batch = list()
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = list()
+    if batch:
+        yield batch
+
+
+def _encode(field, model):
+    """Encode model's field value into hash field value."""
+    value = _get_value(field, model)
+    if isinstance(field, fields.Bool):
+        return '1' if value else '0'
+    if isinstance(field, fields.Float):
+        return repr(value)
+    if isinstance(field, (fields.Date, fields.DateTime)):
+        return value.isoformat()
+    if isinstance(field, fields.Binary):
+        return field.get_builtin_type(model)
+    if isinstance(field, (fields.Model, fields.Collection)):
+        return json.dumps(field.get_builtin_type(model), default=_json_default)
+    return six.text_type(value)
+
+
+def _get_value(field, model):
+    """Return model's field value, references are represented by keys."""
+    if isinstance(field, fields.Reference):
+        return field.get_key(model)
+    return field.get_value(model)
+
+
+def _decode(field, value):
+    """Decode hash field value into model's field raw value."""
+    if isinstance(field, fields.Binary):
+        return value
+    if isinstance(value, six.binary_type):
+        value = value.decode('utf-8')
+    if isinstance(field, fields.Bool):
+        return value == '1'
+    if isinstance(field, (fields.Model, fields.Collection)):
+        return json.loads(value)
+    return value
+
+
+def _json_default(value):
+    """Return JSON serializable representation of dates."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError('{0} is not JSON serializable'.format(value))
@@ -56,6 +56,10 @@ setup(name='domain-models',
       platforms=['any'],
       zip_safe=True,
       install_requires=requirements,
+      extras_require={
+          'redis': ['redis>=3.5'],
+          'numpy': ['numpy'],
+      },
       cmdclass={
           'publish': PublishCommand,
       },
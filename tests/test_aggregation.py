@@ -0,0 +1,162 @@
+"""Aggregation tests."""
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import aggregation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Player(models.DomainModel):
+    """Player model."""
+
+    id = fields.Int()
+    team = fields.Categorical()
+    score = fields.Int()
+    rating = fields.Float()
+
+
+class TeamStats(models.DomainModel):
+    """Team statistics model."""
+
+    team = fields.String()
+    players = fields.Int()
+    score = fields.Int()
+    rating = fields.Float()
+
+
+class ReduceColumnTests(unittest.TestCase):
+    """Reduction of columns tests."""
+
+    def test_functions(self):
+        """Test aggregate functions."""
+        column = [3, 1, 2]
+
+        self.assertEqual(aggregation.reduce_column('count', column), 3)
+        self.assertEqual(aggregation.reduce_column('sum', column), 6)
+        self.assertEqual(aggregation.reduce_column('min', column), 1)
+        self.assertEqual(aggregation.reduce_column('max', column), 3)
+        self.assertEqual(aggregation.reduce_column('mean', column), 2.0)
+
+    def test_empty_column(self):
+        """Test aggregates of empty column."""
+        self.assertEqual(aggregation.reduce_column('count', []), 0)
+        self.assertEqual(aggregation.reduce_column('sum', []), 0)
+        self.assertIsNone(aggregation.reduce_column('min', []))
+        self.assertIsNone(aggregation.reduce_column('mean', []))
+
+    def test_not_numeric_column(self):
+        """Test aggregates of strings."""
+        column = ['b', 'a'] * 1024
+
+        self.assertEqual(aggregation.reduce_column('min', column), 'a')
+
+    def test_unknown_function(self):
+        """Test unknown aggregate function."""
+        with self.assertRaises(errors.Error):
+            aggregation.reduce_column('median', [1])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_array_reduction(self):
+        """Test reduction of NumPy arrays."""
+        column = numpy.arange(1024, dtype='f8')
+
+        total = aggregation.reduce_column('sum', column)
+
+        self.assertEqual(total, 1023 * 512)
+        self.assertIsInstance(total, float)
+        self.assertEqual(aggregation.reduce_column('mean', column), 511.5)
+        self.assertEqual(aggregation.reduce_column('count', column), 1024)
+        self.assertEqual(aggregation.reduce_column('sum', column[:0]), 0)
+
+    def test_large_columns(self):
+        """Test that large columns are reduced sequentially by Python."""
+        floats = [0.1] * 1024
+        integers = [2 ** 53] * 1024
+
+        self.assertEqual(aggregation.reduce_column('sum', floats),
+                         sum(floats))
+        self.assertEqual(aggregation.reduce_column('sum', integers),
+                         1024 * 2 ** 53)
+        self.assertEqual(aggregation.reduce_column('max', integers), 2 ** 53)
+
+
+class CollectionAggregationTests(unittest.TestCase):
+    """Collection grouping and aggregation tests."""
+
+    def setUp(self):
+        """Create collection of players."""
+        self.players = Player.Collection([
+            Player(id=1, team='red', score=10, rating=1.5),
+            Player(id=2, team='blue', score=20),
+            Player(id=3, team='red', score=30, rating=2.5),
+            Player(id=4, team='blue', score=5, rating=4.0),
+            Player(id=5, team='green'),
+        ])
+
+    def test_group_by(self):
+        """Test grouping of collection."""
+        groups = self.players.group_by('team')
+
+        self.assertEqual(list(groups), ['red', 'blue', 'green'])
+        self.assertIsInstance(groups['red'], Player.Collection)
+        self.assertEqual([player.id for player in groups['blue']], [2, 4])
+
+    def test_group_by_field(self):
+        """Test grouping of collection by field."""
+        groups = self.players.group_by(Player.score)
+
+        self.assertEqual(list(groups), [10, 20, 30, 5, None])
+
+    def test_aggregate(self):
+        """Test aggregation of whole collection."""
+        result = self.players.aggregate(players='count',
+                                        rated=('count', 'rating'),
+                                        score=('sum', Player.score),
+                                        best=('max', 'rating'),
+                                        rating=('mean', 'rating'))
+
+        self.assertEqual(result, dict(players=5, rated=3, score=65,
+                                      best=4.0, rating=8.0 / 3))
+
+    def test_aggregate_by_groups(self):
+        """Test aggregation of groups."""
+        result = self.players.aggregate(group_by='team',
+                                        players=('count',),
+                                        score=('sum', 'score'),
+                                        rating=('min', 'rating'))
+
+        self.assertEqual(list(result), ['red', 'blue', 'green'])
+        self.assertEqual(result['red'], dict(players=2, score=40,
+                                             rating=1.5))
+        self.assertEqual(result['green'], dict(players=1, score=0,
+                                               rating=None))
+
+    def test_aggregate_into_models(self):
+        """Test aggregation of groups into collection of models."""
+        stats = self.players.aggregate(group_by=Player.team, into=TeamStats,
+                                       players=('count',),
+                                       score=('sum', 'score'),
+                                       rating=('mean', 'rating'))
+
+        self.assertIsInstance(stats, TeamStats.Collection)
+        self.assertEqual(stats[1].get_data(), dict(team='blue', players=2,
+                                                   score=25, rating=4.0))
+
+    def test_aggregate_into_model(self):
+        """Test aggregation of whole collection into model."""
+        stats = self.players.aggregate(into=TeamStats, score=('max', 'score'))
+
+        self.assertIsInstance(stats, TeamStats)
+        self.assertEqual(stats.score, 30)
+
+    def test_unknown_function(self):
+        """Test aggregation by unknown function."""
+        with self.assertRaises(errors.Error):
+            self.players.aggregate(score=('median', 'score'))
@@ -0,0 +1,166 @@
+"""Arrays tests."""
+
+import datetime
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import arrays
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+
+
+class Measurement(models.DomainModel):
+    """Measurement model."""
+
+    id = fields.Int()
+    active = fields.Bool()
+    value = fields.Float()
+    day = fields.Date()
+    taken_at = fields.DateTime()
+    label = fields.String()
+    unit = fields.Categorical()
+    photo = fields.Model(Photo)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class ArraysTests(unittest.TestCase):
+    """Arrays tests."""
+
+    def setUp(self):
+        """Create collection of measurements."""
+        self.measurements = Measurement.Collection([
+            Measurement(id=1, active=True, value=1.5,
+                        day=datetime.date(2020, 1, 2),
+                        taken_at=datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+                        label='first', unit='kg'),
+            Measurement(id=2, active=False, label='second measurement',
+                        unit='g'),
+        ])
+
+    def test_dtype(self):
+        """Test type of array derived from fields."""
+        dtype = arrays.get_dtype(Measurement, models=self.measurements)
+
+        self.assertEqual(sorted(dtype), sorted([
+            ('id', 'i8'), ('active', '?'), ('value', 'f8'),
+            ('day', 'datetime64[D]'), ('taken_at', 'datetime64[us]'),
+            ('label', 'U18'), ('unit', 'U2')]))
+
+    def test_to_numpy(self):
+        """Test export of collection into structured array."""
+        array = self.measurements.to_numpy()
+
+        self.assertEqual(array['id'].tolist(), [1, 2])
+        self.assertEqual(array['active'].tolist(), [True, False])
+        self.assertEqual(array['value'][0], 1.5)
+        self.assertTrue(numpy.isnan(array['value'][1]))
+        self.assertEqual(array['day'].tolist(),
+                         [datetime.date(2020, 1, 2), None])
+        self.assertEqual(array['taken_at'][0].tolist(),
+                         datetime.datetime(2020, 1, 2, 3, 4, 5, 6))
+        self.assertEqual(array['label'].tolist(),
+                         ['first', 'second measurement'])
+        self.assertEqual(array['unit'].tolist(), ['kg', 'g'])
+
+    def test_to_numpy_with_field_names(self):
+        """Test export of selected fields."""
+        array = self.measurements.to_numpy(['id', 'value'])
+
+        self.assertEqual(array.dtype.names, ('id', 'value'))
+
+    def test_unsupported_field(self):
+        """Test export of field that could not be represented in array."""
+        with self.assertRaises(errors.Error):
+            self.measurements.to_numpy(['photo'])
+
+    def test_missing_integer(self):
+        """Test export of missing integer."""
+        with self.assertRaises(TypeError):
+            Measurement.Collection([Measurement()]).to_numpy(['id'])
+
+    def test_missing_bool(self):
+        """Test export of missing bool."""
+        with self.assertRaises(TypeError):
+            Measurement.Collection([Measurement(id=1)]).to_numpy(['active'])
+
+    def test_from_numpy(self):
+        """Test hydration of models from structured array."""
+        array = self.measurements.to_numpy()
+
+        measurements = Measurement.Collection.from_numpy(array)
+
+        self.assertIsInstance(measurements, Measurement.Collection)
+        self.assertEqual(len(measurements), 2)
+        for measurement, original in zip(measurements, self.measurements):
+            self.assertEqual(measurement.get_data(), original.get_data())
+        self.assertEqual(Measurement.unit.get_code(measurements[1]),
+                         Measurement.unit.get_code(self.measurements[1]))
+
+    def test_from_numpy_with_other_types(self):
+        """Test hydration of array which types differ from fields' types."""
+        array = numpy.array(
+            [(1.5, 7, numpy.datetime64('2020-01-01T10:00', 'ns'), 2)],
+            dtype=[('id', 'f8'), ('label', 'i4'),
+                   ('taken_at', 'datetime64[ns]'), ('active', 'i4')])
+
+        for measurements in (Measurement.Collection.from_numpy(array),
+                             Measurement.Collection.from_numpy(
+                                 array, columnar=True)):
+            self.assertEqual(measurements[0].id, 1)
+            self.assertEqual(measurements[0].label, '7')
+            self.assertEqual(measurements[0].taken_at,
+                             datetime.datetime(2020, 1, 1, 10, 0))
+            self.assertIs(measurements[0].active, True)
+
+    def test_from_numpy_with_deferred_field(self):
+        """Test that missing values of deferred fields are loaded."""
+        calls = list()
+
+        class Model(models.DomainModel):
+            """Test model with deferred field."""
+
+            id = fields.Int()
+            value = fields.Float(deferred=True)
+
+            @value.loader
+            def load_value(models):
+                calls.append([model.id for model in models])
+                return [1.5] * len(models)
+
+        array = numpy.array([(1, numpy.nan)],
+                            dtype=[('id', 'i8'), ('value', 'f8')])
+
+        model = Model.Collection.from_numpy(array)[0]
+
+        self.assertEqual(model.value, 1.5)
+        self.assertEqual(calls, [[1]])
+
+    def test_from_numpy_columnar(self):
+        """Test columnar collection backed by structured array."""
+        array = self.measurements.to_numpy()
+
+        measurements = Measurement.Collection.from_numpy(array,
+                                                         columnar=True)
+
+        self.assertIsInstance(measurements, arrays.ArrayCollection)
+        self.assertEqual(len(measurements), 2)
+        self.assertIs(measurements.column('id').base, array)
+        self.assertEqual(measurements[-1].get_data(),
+                         self.measurements[1].get_data())
+        self.assertEqual(measurements[1:][0].id, 2)
+        self.assertEqual([measurement.id for measurement in measurements],
+                         [1, 2])
+        self.assertIsInstance(measurements.to_collection(),
+                              Measurement.Collection)
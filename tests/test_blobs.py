@@ -0,0 +1,72 @@
+"""Blobs tests."""
+
+import os
+import tempfile
+
+import six
+import unittest2 as unittest
+
+from domain_models import blobs
+
+
+class LazyBlobTests(unittest.TestCase):
+    """Lazy blob tests."""
+
+    def test_load_on_access(self):
+        """Test that blob is loaded on first access only."""
+        calls = list()
+
+        def loader():
+            calls.append(1)
+            return six.b('Hello')
+
+        blob = blobs.LazyBlob(loader)
+
+        self.assertFalse(blob.loaded)
+        self.assertEqual(calls, [])
+        self.assertEqual(blob.tobytes(), six.b('Hello'))
+        self.assertEqual(len(blob), 5)
+        self.assertEqual(blob.view(), six.b('Hello'))
+        self.assertTrue(blob.loaded)
+        self.assertEqual(calls, [1])
+
+    def test_repr(self):
+        """Test blob representation."""
+        blob = blobs.LazyBlob(lambda: six.b('Hello'))
+
+        self.assertIn('LazyBlob(loaded=False)', repr(blob))
+
+
+class FileBlobTests(unittest.TestCase):
+    """File blob tests."""
+
+    def setUp(self):
+        """Create file with blob's data."""
+        descriptor, self.path = tempfile.mkstemp()
+        with os.fdopen(descriptor, 'wb') as blob_file:
+            blob_file.write(six.b('Hello, world!'))
+
+    def tearDown(self):
+        """Remove file with blob's data."""
+        os.remove(self.path)
+
+    def test_read_file(self):
+        """Test reading of blob from file."""
+        blob = blobs.FileBlob(self.path, offset=7, size=5)
+
+        self.assertFalse(blob.loaded)
+        self.assertEqual(blob.tobytes(), six.b('world'))
+
+    def test_read_file_till_end(self):
+        """Test reading of blob from file till end."""
+        blob = blobs.FileBlob(self.path, offset=7)
+
+        self.assertEqual(blob.tobytes(), six.b('world!'))
+
+    def test_memory_map_file(self):
+        """Test memory mapping of blob's file."""
+        blob = blobs.FileBlob(self.path, offset=7, size=5, memory_map=True)
+
+        self.assertEqual(blob.view(), six.b('world'))
+        self.assertEqual(blob.tobytes(), six.b('world'))
+        self.assertEqual(len(blob), 5)
@@ -0,0 +1,172 @@
+"""Caches tests."""
+
+import threading
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import caches
+
+
+class Address(models.DomainModel):
+    """Address model."""
+
+    city = fields.String()
+
+
+class User(models.DomainModel):
+    """User model."""
+
+    id = fields.Int()
+    name = fields.String()
+    address = fields.Model(Address)
+
+    __unique_key__ = (id,)
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Initializer."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return current time."""
+        return self.now
+
+
+class ModelCacheTests(unittest.TestCase):
+    """Model cache tests."""
+
+    def setUp(self):
+        """Create cache."""
+        self.calls = list()
+        self.clock = Clock()
+        self.cache = caches.ModelCache(User, loader=self.load_user,
+                                       max_size=2, ttl=10, clock=self.clock)
+
+    def load_user(self, id):
+        """Load user by id."""
+        self.calls.append(id)
+        return User(id=id, name='user{0}'.format(id)) if id < 100 else None
+
+    def test_read_through(self):
+        """Test loading of missing models."""
+        user = self.cache.load(1)
+
+        self.assertIs(self.cache.load(1), user)
+        self.assertIs(self.cache.load((1,)), user)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+        self.assertEqual(self.cache.hit_rate, 2.0 / 3)
+
+    def test_missing_model(self):
+        """Test that missing models are not cached."""
+        self.assertIsNone(self.cache.load(100))
+        self.assertIsNone(self.cache.load(100))
+        self.assertEqual(self.calls, [100, 100])
+        self.assertEqual(self.cache.size, 0)
+
+    def test_get_and_put(self):
+        """Test reading and writing of cache without loader."""
+        user = User(id=1)
+
+        self.assertIsNone(self.cache.get(1))
+        self.cache.put(user)
+
+        self.assertIs(self.cache.get(1), user)
+        self.assertEqual(self.cache.get_key(user), (1,))
+        self.assertEqual(self.calls, [])
+
+    def test_lru_eviction(self):
+        """Test eviction of least recently used models."""
+        self.cache.load(1)
+        self.cache.load(2)
+        self.cache.load(1)
+        self.cache.load(3)
+
+        self.assertIsNotNone(self.cache.get(1))
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.size, 2)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_ttl_expiration(self):
+        """Test expiration of models."""
+        self.cache.load(1)
+        self.clock.now = 9
+        self.cache.load(1)
+        self.clock.now = 10
+        self.cache.load(1)
+
+        self.assertEqual(self.calls, [1, 1])
+        self.assertEqual(self.cache.expirations, 1)
+
+    def test_invalidate_and_clear(self):
+        """Test removing of models."""
+        self.cache.load(1)
+        self.cache.load(2)
+
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(1))
+        self.assertIsNotNone(self.cache.get(2))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+
+    def test_serialized_values(self):
+        """Test storing of models as serialized data."""
+        cache = caches.ModelCache(User, serialize=True)
+        user = User(id=1, name='John', address=Address(city='Kyiv'))
+        cache.put(User(id=2))
+        cache.put(user)
+
+        cached_user = cache.get(1)
+
+        self.assertIsNot(cached_user, user)
+        self.assertEqual(cached_user.get_data(), user.get_data())
+        self.assertIsNone(cache.get(2).address)
+        self.assertIsInstance(cache._entries[(1,)][0], bytes)
+
+    def test_stampede_protection(self):
+        """Test that concurrent misses call loader once."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = list()
+
+        def load_user(id):
+            calls.append(id)
+            started.set()
+            release.wait()
+            return User(id=id)
+
+        cache = caches.ModelCache(User, loader=load_user)
+        results = list()
+        threads = [threading.Thread(target=lambda: results.append(
+            cache.load(1))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(user is results[0] for user in results))
+
+    def test_loader_failure(self):
+        """Test that loader's failure is raised and is not cached."""
+        cache = caches.ModelCache(User, loader=lambda id: 1 / 0)
+
+        with self.assertRaises(ZeroDivisionError):
+            cache.load(1)
+        self.assertEqual(cache._loads, dict())
+
+    def test_missing_loader(self):
+        """Test loading without loader."""
+        with self.assertRaises(errors.Error):
+            caches.ModelCache(User).load(1)
@@ -1,8 +1,13 @@
 """Collections tests."""
 
+import threading
+
 import unittest2
 
+from domain_models import models
+from domain_models import fields
 from domain_models import collections
+from domain_models import errors
 
 
 class TestCollection(collections.Collection):
@@ -62,6 +67,43 @@ class CollectionTests(unittest2.TestCase):
         with self.assertRaises(TypeError):
             collection.extend(['1'])
 
+    def test_init_with_generator(self):
+        """Test creation of collection from generator."""
+        collection = TestCollection(value for value in (1, 2, 3))
+
+        self.assertEqual(collection, [1, 2, 3])
+
+    def test_extend_with_generator(self):
+        """Test extending with generator."""
+        collection = TestCollection([1])
+
+        collection.extend(value for value in (2, 3))
+
+        self.assertEqual(collection, [1, 2, 3])
+
+    def test_extend_invalid_type_keeps_collection(self):
+        """Test that collection is not changed by invalid extending."""
+        collection = TestCollection([1])
+
+        with self.assertRaises(TypeError):
+            collection.extend(value for value in (2, '3', 4))
+
+        self.assertEqual(collection, [1])
+
+    def test_extend_with_itself(self):
+        """Test extending of collection with itself."""
+        collection = TestCollection([1, 2])
+
+        collection.extend(collection)
+
+        self.assertEqual(collection, [1, 2, 1, 2])
+
+    def test_values_of_subclass(self):
+        """Test that values of value type subclasses are valid."""
+        collection = TestCollection([1, True, 2, False])
+
+        self.assertEqual(collection, [1, True, 2, False])
+
     def test_insert_valid_type(self):
         """Test insert."""
         collection = TestCollection()
@@ -151,3 +193,475 @@ class CollectionTests(unittest2.TestCase):
 
         self.assertEqual(collection_slice, [1, 2])
         self.assertIsInstance(collection_slice, TestCollection)
+
+
+class CollectionViewTests(unittest2.TestCase):
+    """Collection view tests."""
+
+    def test_view(self):
+        """Test view of collection's slice."""
+        collection = TestCollection(range(10))
+
+        view = collection.view(2, 8, 2)
+
+        self.assertIsInstance(view, collections.CollectionView)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(list(view), [2, 4, 6])
+        self.assertEqual(view, [2, 4, 6])
+        self.assertEqual(view[0], 2)
+        self.assertEqual(view[-1], 6)
+        self.assertIn(4, view)
+
+        with self.assertRaises(IndexError):
+            view[3]
+
+    def test_view_reflects_values(self):
+        """Test that view references values of parent collection."""
+        collection = TestCollection(range(10))
+
+        view = collection.view(2, 5)
+        collection[3] = 33
+
+        self.assertEqual(view, [2, 33, 4])
+
+    def test_view_of_view(self):
+        """Test slicing of view."""
+        collection = TestCollection(range(10))
+
+        view = collection.view(step=-1)[1:8:3]
+
+        self.assertIsInstance(view, collections.CollectionView)
+        self.assertEqual(view, [8, 5, 2])
+        self.assertEqual(view[::-1], [2, 5, 8])
+
+    def test_view_of_shortened_collection(self):
+        """Test that values out of parent collection's range are excluded."""
+        collection = TestCollection(range(10))
+        view = collection.view(2, 8, 2)
+        reversed_view = collection.view(step=-2)
+
+        del collection[5:]
+
+        self.assertEqual(len(view), 2)
+        self.assertEqual(list(view), [2, 4])
+        self.assertEqual(view[-1], 4)
+        self.assertEqual(view[1:], [4])
+        self.assertEqual(reversed_view, [3, 1])
+        with self.assertRaises(IndexError):
+            view[2]
+
+        del collection[:]
+
+        self.assertEqual(list(view), [])
+        self.assertEqual(list(reversed_view), [])
+        self.assertEqual(list(view.chunks(2)), [])
+
+        collection.extend(range(10))
+
+        self.assertEqual(view, [2, 4, 6])
+
+    def test_chunks(self):
+        """Test iterating of chunks."""
+        collection = TestCollection(range(7))
+
+        chunks = list(collection.view().chunks(3))
+
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_copy(self):
+        """Test copying of view."""
+        collection = TestCollection(range(5))
+
+        copy = collection.view(1, 3).copy()
+
+        self.assertIsInstance(copy, TestCollection)
+        self.assertEqual(copy, [1, 2])
+
+    def test_mutation_materializes_view(self):
+        """Test that mutations do not affect parent collection."""
+        collection = TestCollection(range(5))
+
+        view = collection.view(1, 3)
+        view.append(7)
+        view.insert(0, 8)
+        view.extend([9])
+        view[1] = 6
+        del view[-1]
+
+        self.assertEqual(view, [8, 6, 2, 7])
+        self.assertEqual(len(view), 4)
+        self.assertEqual(collection, [0, 1, 2, 3, 4])
+
+    def test_mutation_with_invalid_value(self):
+        """Test mutation of view with invalid value."""
+        collection = TestCollection(range(5))
+
+        with self.assertRaises(TypeError):
+            collection.view().append('1')
+
+    def test_get_data(self):
+        """Test getting of view's data."""
+        class Value(object):
+            """Test value with data."""
+
+            def get_data(self):
+                """Return data."""
+                return {'value': 1}
+
+        collection = collections.Collection([Value(), 2])
+
+        self.assertEqual(collection.view().get_data(), [{'value': 1}, 2])
+
+
+class TestConcurrentCollection(collections.ConcurrentCollection):
+    """Test concurrent collection of ints."""
+
+    collection_cls = TestCollection
+
+
+class ConcurrentCollectionTests(unittest2.TestCase):
+    """Concurrent collection tests."""
+
+    def test_init(self):
+        """Test creation of collection."""
+        collection = TestConcurrentCollection([1, 2, 3])
+
+        self.assertEqual(collection.snapshot(), (1, 2, 3))
+        self.assertEqual(list(collection), [1, 2, 3])
+        self.assertEqual(len(collection), 3)
+        self.assertEqual(collection[1], 2)
+        self.assertEqual(collection[1:], (2, 3))
+        self.assertIn(3, collection)
+
+    def test_init_with_incorrect_values(self):
+        """Test creation of collection with invalid values."""
+        with self.assertRaises(TypeError):
+            TestConcurrentCollection(['1'])
+
+    def test_snapshot_isolation(self):
+        """Test that published changes do not affect taken snapshot."""
+        collection = TestConcurrentCollection([1, 2, 3])
+        snapshot = collection.snapshot()
+
+        collection.append(4)
+        collection.extend([5])
+        collection.insert(0, 0)
+        collection[1] = 7
+        del collection[-1]
+
+        self.assertEqual(snapshot, (1, 2, 3))
+        self.assertEqual(collection.snapshot(), (0, 7, 2, 3, 4))
+
+    def test_batch(self):
+        """Test that batch changes are published on exit."""
+        collection = TestConcurrentCollection([1, 2, 3])
+
+        with collection.batch() as draft:
+            draft.append(4)
+            del draft[0]
+            self.assertEqual(collection.snapshot(), (1, 2, 3))
+
+        self.assertEqual(collection.snapshot(), (2, 3, 4))
+
+    def test_failed_batch(self):
+        """Test that batch changes are discarded on error."""
+        collection = TestConcurrentCollection([1, 2, 3])
+
+        with self.assertRaises(TypeError):
+            with collection.batch() as draft:
+                draft.append(4)
+                draft.append('5')
+
+        self.assertEqual(collection.snapshot(), (1, 2, 3))
+
+    def test_replace(self):
+        """Test replacing of values."""
+        collection = TestConcurrentCollection([1, 2, 3])
+
+        collection.replace(value for value in (4, 5))
+
+        self.assertEqual(collection.snapshot(), (4, 5))
+        with self.assertRaises(TypeError):
+            collection.replace(['6'])
+
+    def test_concurrent_writers(self):
+        """Test that concurrent writers do not lose changes."""
+        collection = TestConcurrentCollection()
+
+        def write():
+            for value in range(100):
+                collection.append(value)
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(collection), 400)
+
+
+class TestPersistentCollection(collections.PersistentCollection):
+    """Test persistent collection of ints."""
+
+    collection_cls = TestCollection
+
+
+class PersistentCollectionTests(unittest2.TestCase):
+    """Persistent collection tests."""
+
+    def test_init(self):
+        """Test creation of collection."""
+        for length in (0, 1, 32, 33, 1024, 1025, 2000):
+            collection = TestPersistentCollection(range(length))
+
+            self.assertEqual(len(collection), length)
+            self.assertEqual(list(collection), list(range(length)))
+            self.assertEqual([collection[index] for index in range(length)],
+                             list(range(length)))
+
+    def test_init_with_incorrect_values(self):
+        """Test creation of collection with invalid values."""
+        with self.assertRaises(TypeError):
+            TestPersistentCollection(['1'])
+
+    def test_append(self):
+        """Test that appending returns new versions."""
+        versions = [TestPersistentCollection()]
+        for value in range(1100):
+            versions.append(versions[-1].append(value))
+
+        self.assertEqual(len(versions[0]), 0)
+        self.assertEqual(versions[33], list(range(33)))
+        self.assertEqual(versions[-1], list(range(1100)))
+        self.assertEqual(versions[-1][1030], 1030)
+        self.assertEqual(versions[-1][-1], 1099)
+
+    def test_append_invalid_type(self):
+        """Test appending of invalid value."""
+        with self.assertRaises(TypeError):
+            TestPersistentCollection().append('1')
+
+    def test_extend(self):
+        """Test extending."""
+        version1 = TestPersistentCollection([1])
+
+        version2 = version1.extend(value for value in (2, 3))
+
+        self.assertEqual(version1, [1])
+        self.assertEqual(version2, [1, 2, 3])
+
+    def test_set(self):
+        """Test that setting of item returns new version."""
+        version1 = TestPersistentCollection(range(2000))
+
+        version2 = version1.set(1500, -1).set(-1, -2)
+
+        self.assertEqual(version1[1500], 1500)
+        self.assertEqual(version1[1999], 1999)
+        self.assertEqual(version2[1500], -1)
+        self.assertEqual(version2[1999], -2)
+        self.assertEqual(list(version2)[:1500], list(range(1500)))
+
+        with self.assertRaises(TypeError):
+            version1.set(0, '1')
+        with self.assertRaises(IndexError):
+            version1.set(2000, 1)
+
+    def test_structural_sharing(self):
+        """Test that versions share untouched parts of structure."""
+        version1 = TestPersistentCollection(range(2000))
+
+        version2 = version1.set(1500, -1)
+
+        self.assertIs(version1._root[0], version2._root[0])
+        self.assertIsNot(version1._root[1], version2._root[1])
+
+    def test_set_slice(self):
+        """Test setting of slice."""
+        version1 = TestPersistentCollection([1, 2, 3])
+
+        version2 = version1.set(slice(0, 2), [7, 7, 7])
+
+        self.assertEqual(version1, [1, 2, 3])
+        self.assertEqual(version2, [7, 7, 7, 3])
+
+        with self.assertRaises(TypeError):
+            version1.set(slice(0, 2), [7, '7'])
+
+    def test_insert_and_delete(self):
+        """Test inserting and deleting."""
+        version1 = TestPersistentCollection([1, 2, 3])
+
+        version2 = version1.insert(1, 5)
+        version3 = version2.delete(slice(2, None))
+
+        self.assertEqual(version1, [1, 2, 3])
+        self.assertEqual(version2, [1, 5, 2, 3])
+        self.assertEqual(version3, [1, 5])
+
+        with self.assertRaises(TypeError):
+            version1.insert(0, '1')
+
+    def test_get_slice(self):
+        """Test getting of slice."""
+        collection = TestPersistentCollection(range(100))
+
+        collection_slice = collection[10:20:5]
+
+        self.assertIsInstance(collection_slice, TestPersistentCollection)
+        self.assertEqual(collection_slice, [10, 15])
+
+    def test_setitem_is_forbidden(self):
+        """Test that setting of item is forbidden."""
+        collection = TestPersistentCollection([1])
+
+        with self.assertRaises(TypeError):
+            collection[0] = 2
+
+    def test_to_collection(self):
+        """Test conversion to collection."""
+        collection = TestPersistentCollection([1, 2]).to_collection()
+
+        self.assertIsInstance(collection, TestCollection)
+        self.assertEqual(collection, [1, 2])
+
+
+class CollectionSortingTests(unittest2.TestCase):
+    """Collection sorting tests."""
+
+    def test_sort_by_values(self):
+        """Test sorting by values without keys."""
+        collection = TestCollection((3, 1, 2))
+
+        collection.sort_by()
+
+        self.assertEqual(collection, [1, 2, 3])
+
+    def test_sort_by_attributes(self):
+        """Test sorting by attributes of values."""
+        collection = collections.Collection((3 + 1j, 1 + 2j, 2 + 1j))
+
+        collection.sort_by('imag', '-real')
+
+        self.assertEqual(collection, [3 + 1j, 2 + 1j, 1 + 2j])
+
+    def test_top_k(self):
+        """Test selection of first values."""
+        collection = TestCollection((3, 1, 2, 5))
+
+        top = collection.top_k(2)
+
+        self.assertIsInstance(top, TestCollection)
+        self.assertEqual(top, [1, 2])
+
+
+class Photo(models.DomainModel):
+    """Photo model without unique key."""
+
+    id = fields.Int()
+
+
+class Item(models.DomainModel):
+    """Item model with unique key."""
+
+    id = fields.Int()
+    name = fields.String()
+
+    __unique_key__ = (id,)
+
+
+class CollectionSetOperationsTests(unittest2.TestCase):
+    """Tests for unique key set operations of collections."""
+
+    def setUp(self):
+        """Create collections of items."""
+        self.items = Item.Collection([Item(id=3, name='c'),
+                                      Item(id=1, name='a'),
+                                      Item(id=3, name='c2'),
+                                      Item(id=2, name='b')])
+        self.other_items = Item.Collection([Item(id=2, name='b2'),
+                                            Item(id=4, name='d'),
+                                            Item(id=3, name='c3')])
+
+    def get_names(self, items):
+        """Return names of items."""
+        return [item.name for item in items]
+
+    def test_dedupe(self):
+        """Test removing of duplicates."""
+        items = self.items.dedupe()
+
+        self.assertIsInstance(items, Item.Collection)
+        self.assertEqual(self.get_names(items), ['c', 'a', 'b'])
+        self.assertEqual(len(self.items), 4)
+
+    def test_union(self):
+        """Test union of collections."""
+        self.assertEqual(self.get_names(self.items.union(self.other_items)),
+                         ['c', 'a', 'b', 'd'])
+
+    def test_intersection(self):
+        """Test intersection of collections."""
+        self.assertEqual(
+            self.get_names(self.items.intersection(self.other_items)),
+            ['c', 'b'])
+
+    def test_difference(self):
+        """Test difference of collections."""
+        self.assertEqual(
+            self.get_names(self.items.difference(self.other_items)), ['a'])
+
+    def test_union_of_invalid_values(self):
+        """Test union with values of other type."""
+        with self.assertRaises(TypeError):
+            self.items.union([Photo()])
+
+    def test_operations_without_unique_key(self):
+        """Test that values without unique key are compared by identity."""
+        photo = Photo(id=1)
+        photos = Photo.Collection([photo, Photo(id=1), photo])
+
+        self.assertEqual(len(photos.dedupe()), 2)
+        self.assertEqual(photos.difference([photo]), [photos[1]])
+
+    def test_upsert_replace(self):
+        """Test upsert that replaces existing values."""
+        items = self.items.dedupe()
+
+        items.upsert(self.other_items)
+
+        self.assertEqual(self.get_names(items), ['c3', 'a', 'b2', 'd'])
+
+    def test_upsert_keep(self):
+        """Test upsert that keeps existing values."""
+        items = self.items.dedupe()
+
+        items.upsert(self.other_items,
+                     on_conflict=collections.ON_CONFLICT_KEEP)
+
+        self.assertEqual(self.get_names(items), ['c', 'a', 'b', 'd'])
+
+    def test_upsert_update(self):
+        """Test upsert that updates existing models."""
+        items = self.items.dedupe()
+        item = items[0]
+
+        items.upsert(self.other_items, on_conflict='update')
+
+        self.assertIs(items[0], item)
+        self.assertEqual(self.get_names(items), ['c3', 'a', 'b2', 'd'])
+
+    def test_upsert_with_function(self):
+        """Test upsert that resolves conflicts by function."""
+        items = self.items.dedupe()
+
+        items.upsert(self.other_items, on_conflict=lambda old, new: Item(
+            id=old.id, name=old.name + new.name))
+
+        self.assertEqual(self.get_names(items), ['cc3', 'a', 'bb2', 'd'])
+
+    def test_upsert_with_unknown_policy(self):
+        """Test upsert with unknown policy."""
+        with self.assertRaises(errors.Error):
+            self.items.upsert(self.other_items, on_conflict='merge')
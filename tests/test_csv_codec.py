@@ -0,0 +1,205 @@
+"""CSV codec tests."""
+
+import csv
+import datetime
+
+import six
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import csv_codec
+from domain_models import loaders
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+
+
+class Profile(models.DomainModel):
+    """Profile model."""
+
+    id = fields.Int()
+    name = fields.String()
+    rating = fields.Float()
+    active = fields.Bool(default=True)
+    birth_date = fields.Date()
+    updated_at = fields.DateTime()
+    photos = fields.Collection(Photo)
+
+
+class Document(models.DomainModel):
+    """Document model with binary content."""
+
+    id = fields.Int()
+    content = fields.Binary()
+
+
+class Author(models.DomainModel):
+    """Author model."""
+
+    id = fields.Int()
+
+    __unique_key__ = (id,)
+
+
+class Post(models.DomainModel):
+    """Post model with reference to author."""
+
+    id = fields.Int()
+    author = fields.Reference(Author)
+
+    __unique_key__ = (id,)
+
+
+def read_rows(csv_file):
+    """Return list of dictionaries of rows of written CSV file."""
+    return [dict(row)
+            for row in csv.DictReader(six.StringIO(csv_file.getvalue()))]
+
+
+class CSVCodecTests(unittest.TestCase):
+    """CSV codec tests."""
+
+    def setUp(self):
+        """Create codec."""
+        self.codec = csv_codec.CSVCodec(Profile, batch_size=2)
+
+    def test_write(self):
+        """Test writing of models."""
+        csv_file = six.StringIO()
+
+        self.codec.write(csv_file, (
+            Profile(id=1, name='John, Jr.', rating=4.5, active=False,
+                    birth_date=datetime.date(1986, 4, 26),
+                    updated_at=datetime.datetime(2016, 1, 1, 10, 30)),
+            Profile(id=2)))
+
+        self.assertEqual(read_rows(csv_file), [
+            dict(id='1', name='John, Jr.', rating='4.5', active='false',
+                 birth_date='1986-04-26', updated_at='2016-01-01T10:30:00'),
+            dict(id='2', name='', rating='', active='true', birth_date='',
+                 updated_at=''),
+        ])
+
+    def test_read(self):
+        """Test reading of models."""
+        csv_file = six.StringIO(
+            'name,id,active,birth_date,updated_at,unknown\r\n'
+            'John,1,yes,1986-04-26,2016-01-01T10:30:00Z,x\r\n'
+            ',2,,,,\r\n')
+
+        profiles = list(self.codec.read(csv_file))
+
+        self.assertEqual(profiles[0].id, 1)
+        self.assertEqual(profiles[0].name, 'John')
+        self.assertIs(profiles[0].active, True)
+        self.assertEqual(profiles[0].birth_date, datetime.date(1986, 4, 26))
+        self.assertEqual(profiles[0].updated_at.replace(tzinfo=None),
+                         datetime.datetime(2016, 1, 1, 10, 30))
+        self.assertIsNone(profiles[0].rating)
+        self.assertIsNone(profiles[0].photos)
+        self.assertEqual(profiles[1].id, 2)
+        self.assertIsNone(profiles[1].name)
+        self.assertIs(profiles[1].active, True)
+
+    def test_read_batches(self):
+        """Test reading of models in batches."""
+        csv_file = six.StringIO('id\r\n1\r\n2\r\n3\r\n')
+
+        batches = list(self.codec.read_batches(csv_file))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertIsInstance(batches[0], Profile.Collection)
+        self.assertEqual(batches[1][0].id, 3)
+
+    def test_read_empty_file(self):
+        """Test reading of empty file."""
+        self.assertEqual(list(self.codec.read(six.StringIO(''))), [])
+
+    def test_read_invalid_bool(self):
+        """Test reading of invalid bool."""
+        with self.assertRaises(errors.Error):
+            list(self.codec.read(six.StringIO('active\r\nmaybe\r\n')))
+
+    def test_read_deferred_field(self):
+        """Test that missing values of deferred fields are loaded."""
+        calls = list()
+
+        class Model(models.DomainModel):
+            """Test model with deferred field."""
+
+            id = fields.Int()
+            rating = fields.Float(deferred=True)
+
+            @rating.loader
+            def load_rating(models):
+                calls.append([model.id for model in models])
+                return [4.5] * len(models)
+
+        codec = csv_codec.CSVCodec(Model)
+
+        model = next(codec.read(six.StringIO('id,rating\r\n1,\r\n')))
+
+        self.assertEqual(model.rating, 4.5)
+        self.assertEqual(calls, [[1]])
+
+    def test_round_trip(self):
+        """Test writing and reading of models."""
+        profiles = [Profile(id=number, name=str(number), rating=number / 3.0,
+                            active=bool(number % 2))
+                    for number in range(5)]
+        csv_file = six.StringIO()
+
+        self.codec.write(csv_file, profiles)
+        csv_file.seek(0)
+
+        self.assertEqual([(profile.id, profile.name, profile.rating,
+                           profile.active)
+                          for profile in self.codec.read(csv_file)],
+                         [(profile.id, profile.name, profile.rating,
+                           profile.active)
+                          for profile in profiles])
+
+    def test_round_trip_of_binaries(self):
+        """Test writing and reading of binaries as Base64 strings."""
+        codec = csv_codec.CSVCodec(Document)
+        csv_file = six.StringIO()
+
+        codec.write(csv_file, [Document(id=1, content=six.b('abc\x00')),
+                               Document(id=2)])
+        csv_file.seek(0)
+
+        self.assertEqual(read_rows(csv_file),
+                         [dict(id='1', content='YWJjAA=='),
+                          dict(id='2', content='')])
+        self.assertEqual([document.get_data()
+                          for document in codec.read(csv_file)],
+                         [dict(id=1, content=six.b('abc\x00')),
+                          dict(id=2, content=None)])
+
+    def test_read_invalid_binary(self):
+        """Test reading of invalid Base64 string."""
+        with self.assertRaises(errors.Error):
+            list(csv_codec.CSVCodec(Document).read(
+                six.StringIO('content\r\nabc\r\n')))
+
+    def test_round_trip_of_references(self):
+        """Test that references are written as keys without loading."""
+        calls = list()
+        codec = csv_codec.CSVCodec(Post)
+        csv_file = six.StringIO()
+
+        with loaders.LoaderScope({Author: calls.append}):
+            codec.write(csv_file, [Post(id=1, author=7), Post(id=2)])
+            csv_file.seek(0)
+            posts = list(codec.read(csv_file))
+
+        self.assertEqual(read_rows(csv_file),
+                         [dict(id='1', author='7'), dict(id='2', author='')])
+        self.assertEqual([post.get_data() for post in posts],
+                         [dict(id=1, author=7), dict(id=2, author=None)])
+        self.assertEqual(calls, [])
@@ -0,0 +1,197 @@
+"""DB-API mapper tests."""
+
+import datetime
+import sqlite3
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import dbapi_mapper
+from domain_models import loaders
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+
+
+class Profile(models.DomainModel):
+    """Profile model."""
+
+    id = fields.Int()
+    name = fields.String()
+    active = fields.Bool(default=True)
+    birth_date = fields.Date()
+    photos = fields.Collection(Photo)
+
+    __unique_key__ = (id,)
+
+
+class Author(models.DomainModel):
+    """Author model."""
+
+    id = fields.Int()
+
+    __unique_key__ = (id,)
+
+
+class Post(models.DomainModel):
+    """Post model with reference to author."""
+
+    id = fields.Int()
+    author = fields.Reference(Author)
+
+    __unique_key__ = (id,)
+
+
+class DBAPIMapperTests(unittest.TestCase):
+    """DB-API mapper tests."""
+
+    def setUp(self):
+        """Create database and mapper."""
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE profiles (id INTEGER, '
+                                'name TEXT, active INTEGER, birth_date TEXT)')
+        self.mapper = dbapi_mapper.DBAPIMapper(Profile, 'profiles',
+                                               batch_size=2)
+
+    def tearDown(self):
+        """Close database."""
+        self.connection.close()
+
+    def insert_profiles(self, number):
+        """Insert profiles into database."""
+        self.mapper.insert_many(
+            self.connection.cursor(),
+            (Profile(id=index, name='Name {0}'.format(index),
+                     active=index % 2,
+                     birth_date=datetime.date(1986, 4, index + 1))
+             for index in range(number)))
+
+    def test_columns(self):
+        """Test that relations are not mapped by default."""
+        self.assertEqual(sorted(self.mapper.columns),
+                         ['active', 'birth_date', 'id', 'name'])
+
+    def test_insert_and_select(self):
+        """Test inserting and selecting of models."""
+        self.insert_profiles(5)
+
+        batches = list(self.mapper.select(self.connection.cursor()))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertIsInstance(batches[0], Profile.Collection)
+        profile = batches[1][1]
+        self.assertEqual(profile.id, 3)
+        self.assertEqual(profile.name, 'Name 3')
+        self.assertIs(profile.active, True)
+        self.assertEqual(profile.birth_date, datetime.date(1986, 4, 4))
+        self.assertIsNone(profile.photos)
+
+    def test_select_with_condition(self):
+        """Test selecting of models with condition."""
+        self.insert_profiles(5)
+
+        batches = self.mapper.select(self.connection.cursor(),
+                                     'active = ? AND id > ?', (1, 1))
+
+        self.assertEqual([profile.id for batch in batches
+                          for profile in batch], [3])
+
+    def test_load_partial_columns(self):
+        """Test loading of models from rows with part of columns."""
+        self.insert_profiles(3)
+        cursor = self.connection.cursor()
+        cursor.execute('SELECT name, id, 1 AS unknown FROM profiles')
+
+        profiles = self.mapper.load(cursor)
+
+        self.assertEqual(len(profiles), 3)
+        self.assertEqual(profiles[2].id, 2)
+        self.assertEqual(profiles[2].name, 'Name 2')
+        self.assertIs(profiles[2].active, True)
+        self.assertIsNone(profiles[2].birth_date)
+
+    def test_load_into_identity_map(self):
+        """Test loading of models with identity map."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String()
+
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        model = Model(id=1, name='Old')
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT 1 AS id, 'New' AS name")
+
+        models_collection = dbapi_mapper.DBAPIMapper(Model, 'models').load(
+            cursor)
+
+        self.assertIs(models_collection[0], model)
+        self.assertEqual(model.name, 'New')
+
+    def test_update_selected_columns(self):
+        """Test updating of selected columns."""
+        self.insert_profiles(3)
+        cursor = self.connection.cursor()
+
+        self.mapper.update_many(cursor, [Profile(id=1, name='John'),
+                                         Profile(id=2, name='Jane')],
+                                columns=['name'])
+        cursor.execute('SELECT id, name, active FROM profiles ORDER BY id')
+
+        self.assertEqual(cursor.fetchall(), [(0, 'Name 0', 0),
+                                             (1, 'John', 1),
+                                             (2, 'Jane', 0)])
+
+    def test_update_all_columns(self):
+        """Test updating of all columns."""
+        self.insert_profiles(1)
+        cursor = self.connection.cursor()
+
+        self.mapper.update_many(cursor, [Profile(id=0, active=False)])
+        cursor.execute('SELECT * FROM profiles')
+
+        self.assertEqual(cursor.fetchall(), [(0, None, 0, None)])
+
+    def test_update_without_unique_key(self):
+        """Test that models without unique key could not be updated."""
+        mapper = dbapi_mapper.DBAPIMapper(Photo, 'photos')
+
+        with self.assertRaises(errors.Error):
+            mapper.update_many(self.connection.cursor(), [Photo(id=1)])
+
+    def test_paramstyles(self):
+        """Test placeholders of parameter styles."""
+        mapper = dbapi_mapper.DBAPIMapper(Profile, 'profiles',
+                                          paramstyle='numeric')
+
+        self.assertEqual(mapper._get_placeholders(2), [':1', ':2'])
+
+        with self.assertRaises(errors.Error):
+            dbapi_mapper.DBAPIMapper(Profile, 'profiles', paramstyle='named')
+
+    def test_round_trip_of_references(self):
+        """Test that references are stored as keys without loading."""
+        calls = list()
+        self.connection.execute('CREATE TABLE posts (id INTEGER, '
+                                'author INTEGER)')
+        mapper = dbapi_mapper.DBAPIMapper(Post, 'posts')
+
+        with loaders.LoaderScope({Author: calls.append}):
+            mapper.insert_many(self.connection.cursor(),
+                               [Post(id=1, author=7), Post(id=2)])
+            posts = [post for batch in mapper.select(
+                self.connection.cursor()) for post in batch]
+
+        self.assertEqual(self.connection.execute(
+            'SELECT id, author FROM posts').fetchall(), [(1, 7), (2, None)])
+        self.assertEqual([post.get_data() for post in posts],
+                         [dict(id=1, author=7), dict(id=2, author=None)])
+        self.assertEqual(calls, [])
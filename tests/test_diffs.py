@@ -0,0 +1,164 @@
+"""Diffs tests."""
+
+import datetime
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import diffs
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+    title = fields.String()
+
+    __unique_key__ = (id,)
+
+
+class Tag(models.DomainModel):
+    """Tag model without unique key."""
+
+    name = fields.String()
+
+
+class Address(models.DomainModel):
+    """Address model."""
+
+    city = fields.String()
+    street = fields.String()
+
+
+class Profile(models.DomainModel):
+    """Profile model."""
+
+    id = fields.Int()
+    name = fields.String()
+    birth_date = fields.Date()
+    address = fields.Model(Address)
+    photos = fields.Collection(Photo)
+    tags = fields.Collection(Tag)
+
+
+def create_profile():
+    """Return profile with nested models."""
+    return Profile(id=1, name='John', birth_date=datetime.date(1990, 1, 2),
+                   address=dict(city='Kyiv', street='Main'),
+                   photos=[dict(id=1, title='one'), dict(id=2, title='two'),
+                           dict(id=3, title='three')],
+                   tags=[dict(name='a')])
+
+
+class DiffTests(unittest.TestCase):
+    """Diff tests."""
+
+    def test_identical_models(self):
+        """Test diff of the same model."""
+        profile = create_profile()
+
+        self.assertEqual(diffs.diff(profile, profile), dict())
+        self.assertEqual(diffs.diff(profile, create_profile()), dict())
+
+    def test_changed_scalar_fields(self):
+        """Test diff of scalar fields."""
+        old, new = create_profile(), create_profile()
+        new.name = 'Johnny'
+        new.birth_date = None
+
+        self.assertEqual(diffs.diff(old, new), dict(name=('=', 'Johnny'),
+                                                    birth_date=('=', None)))
+
+    def test_changed_nested_model(self):
+        """Test diff of nested model."""
+        old, new = create_profile(), create_profile()
+        new.address.street = 'Second'
+
+        self.assertEqual(diffs.diff(old, new),
+                         dict(address=('~', dict(street=('=', 'Second')))))
+
+    def test_replaced_nested_model(self):
+        """Test diff of nested model that was set from or to None."""
+        old, new = create_profile(), create_profile()
+        old.address = None
+
+        self.assertEqual(diffs.diff(old, new), dict(
+            address=('=', dict(city='Kyiv', street='Main'))))
+
+    def test_changed_collection(self):
+        """Test diff of collection matched by unique keys."""
+        old, new = create_profile(), create_profile()
+        new.photos = [new.photos[2], dict(id=4, title='four'), new.photos[0]]
+        new.photos[2].title = 'first'
+
+        self.assertEqual(diffs.diff(old, new), dict(photos=('*', [
+            ('.', (3,)),
+            ('+', dict(id=4, title='four')),
+            ('~', (1,), dict(title=('=', 'first')))])))
+
+    def test_collection_without_unique_key(self):
+        """Test diff of collection of models without unique key."""
+        old, new = create_profile(), create_profile()
+        new.tags = [dict(name='b')]
+
+        self.assertEqual(diffs.diff(old, new),
+                         dict(tags=('=', [dict(name='b')])))
+
+    def test_different_classes(self):
+        """Test diff of models of different classes."""
+        with self.assertRaises(errors.Error):
+            diffs.diff(Photo(), Tag())
+
+
+class ApplyPatchTests(unittest.TestCase):
+    """Patch applying tests."""
+
+    def assert_patched(self, old, new):
+        """Assert that patch turns old model into new one in place."""
+        photos, address = old.photos, old.address
+
+        diffs.apply_patch(old, diffs.diff(old, new))
+
+        self.assertEqual(old.get_data(), new.get_data())
+        self.assertIs(old.photos, photos)
+        self.assertIs(old.address, address)
+
+    def test_apply_patch(self):
+        """Test applying of patch of all kinds of operations."""
+        old, new = create_profile(), create_profile()
+        new.name = 'Johnny'
+        new.address.city = 'Lviv'
+        new.photos = [new.photos[2], dict(id=4, title='four'), new.photos[0]]
+        new.photos[2].title = 'first'
+        new.tags = [dict(name='b')]
+
+        self.assert_patched(old, new)
+
+    def test_unchanged_models_are_kept(self):
+        """Test that unchanged models of collection are not recreated."""
+        old, new = create_profile(), create_profile()
+        new.photos[1].title = 'second'
+        first_photo = old.photos[0]
+
+        diffs.apply_patch(old, diffs.diff(old, new))
+
+        self.assertIs(old.photos[0], first_photo)
+        self.assertEqual(old.photos[1].title, 'second')
+
+    def test_serialized_keys(self):
+        """Test patch, which tuples of keys were serialized as lists."""
+        profile = create_profile()
+
+        entries = [['.', [2]], ['~', [1], dict(title=['=', 'a'])]]
+
+        diffs.apply_patch(profile, dict(photos=['*', entries]))
+
+        self.assertEqual([(photo.id, photo.title) for photo in
+                          profile.photos], [(2, 'two'), (1, 'a')])
+
+    def test_unknown_operation(self):
+        """Test patch with unknown operation."""
+        with self.assertRaises(errors.Error):
+            diffs.apply_patch(create_profile(), dict(name=('?', 'value')))
@@ -7,9 +7,11 @@ import six
 import unittest2 as unittest
 
 from domain_models import models
+from domain_models import blobs
 from domain_models import collections
 from domain_models import fields
 from domain_models import errors
+from domain_models import loaders
 
 
 class RelatedModel(models.DomainModel):
@@ -118,6 +120,47 @@ class FieldTest(unittest.TestCase):
         with self.assertRaises(AttributeError):
             RequiredFieldModel(field_required=None)
 
+    def test_read_resolves_to_slot(self):
+        """Test that field reads resolve directly to model's slot."""
+        model = ExampleModel(int_field='1')
+
+        self.assertIsNot(ExampleModel.int_field.fget,
+                         ExampleModel.int_field.get_value)
+        self.assertEqual(ExampleModel.int_field.fget(model), 1)
+        self.assertEqual(model.int_field, 1)
+
+    def test_read_without_slots(self):
+        """Test field reads of model without slots optimization."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            field = fields.Int()
+            __slots_optimization__ = False
+
+        model = Model(field='1')
+
+        self.assertEqual(model.field, 1)
+
+    def test_read_with_custom_getter(self):
+        """Test that field with read-time logic is read through getter."""
+        class UpperString(fields.String):
+            """Test field with read-time logic."""
+
+            def get_value(self, model, default=None):
+                """Return field's value."""
+                return super(UpperString, self).get_value(
+                    model, default).upper()
+
+        class Model(models.DomainModel):
+            """Test model."""
+
+            field = UpperString()
+
+        model = Model(field='value')
+
+        self.assertEqual(Model.field.fget, Model.field.get_value)
+        self.assertEqual(model.field, 'VALUE')
+
 
 class BoolTest(unittest.TestCase):
     """Bool field tests."""
@@ -281,6 +324,77 @@ class StringTest(unittest.TestCase):
 
         self.assertIsNone(model.string_field)
 
+    def test_intern(self):
+        """Test interning of values."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            country = fields.String(intern=True)
+
+        model1 = Model(country=''.join(('U', 'A')))
+        model2 = Model(country=''.join(('U', 'A')))
+
+        self.assertEqual(model1.country, 'UA')
+        self.assertIs(model1.country, model2.country)
+
+
+class CategoricalTest(unittest.TestCase):
+    """Categorical field tests."""
+
+    def test_set_value(self):
+        """Test setting of value."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            status = fields.Categorical(categories=('active', 'blocked'))
+
+        model1 = Model(status='blocked')
+        model2 = Model(status=''.join(('new', 'bie')))
+        model3 = Model(status=''.join(('new', 'bie')))
+
+        self.assertEqual(model1.status, 'blocked')
+        self.assertEqual(model2.status, 'newbie')
+        self.assertIs(model2.status, model3.status)
+        self.assertEqual(Model.status.get_code(model1), 1)
+        self.assertEqual(Model.status.get_code(model2), 2)
+        self.assertEqual(Model.status.categories,
+                         ['active', 'blocked', 'newbie'])
+        self.assertEqual(model1.get_data(), {'status': 'blocked'})
+
+    def test_reset_value(self):
+        """Test resetting of value."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            status = fields.Categorical()
+
+        model = Model(status='active')
+        model.status = None
+
+        self.assertIsNone(model.status)
+        self.assertEqual(model.get('status', 'unknown'), 'unknown')
+
+    def test_filter(self):
+        """Test filtering of collection by value."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            status = fields.Categorical()
+
+        collection = Model.Collection([Model(id=1, status='active'),
+                                       Model(id=2, status='blocked'),
+                                       Model(id=3),
+                                       Model(id=4, status='active')])
+
+        active = Model.status.filter(collection, 'active')
+        unknown = Model.status.filter(collection, 'unknown')
+
+        self.assertIsInstance(active, Model.Collection)
+        self.assertEqual([model.id for model in active], [1, 4])
+        self.assertIsInstance(unknown, Model.Collection)
+        self.assertEqual(unknown, [])
+
 
 class BinaryTest(unittest.TestCase):
     """Binary field tests."""
@@ -305,6 +419,71 @@ class BinaryTest(unittest.TestCase):
         self.assertIsNone(model.binary_field)
 
 
+class ZeroCopyBinaryTest(unittest.TestCase):
+    """Zero-copy binary field tests."""
+
+    class Model(models.DomainModel):
+        """Test model."""
+
+        data = fields.Binary(zero_copy=True)
+
+    def test_set_memoryview(self):
+        """Test setting of memory view."""
+        buffer = bytearray(six.b('Hello, world!'))
+
+        model = self.Model(data=memoryview(buffer)[7:12])
+
+        self.assertIsInstance(model.data, memoryview)
+        self.assertEqual(model.data, six.b('world'))
+        buffer[7:12] = six.b('there')
+        self.assertEqual(model.data, six.b('there'))
+        self.assertEqual(model.get_data(), {'data': six.b('there')})
+
+    @unittest.skipIf(six.PY2, 'Memory views of Python 2 are not read-only')
+    def test_memoryview_is_readonly(self):
+        """Test that memory views are stored read-only."""
+        model = self.Model(data=memoryview(bytearray(six.b('Hello'))))
+
+        self.assertTrue(model.data.readonly)
+
+    def test_set_bytearray(self):
+        """Test setting of byte array."""
+        model = self.Model(data=bytearray(six.b('Hello')))
+
+        self.assertIsInstance(model.data, memoryview)
+        self.assertTrue(model.data.readonly)
+        self.assertEqual(model.get_data(), {'data': six.b('Hello')})
+
+    def test_set_bytes(self):
+        """Test setting of bytes."""
+        data = six.b('Hello')
+
+        model = self.Model(data=data)
+
+        self.assertIs(model.data, data)
+        self.assertIs(model.get_data()['data'], data)
+
+    def test_set_lazy_blob(self):
+        """Test setting of lazy blob."""
+        blob = blobs.LazyBlob(lambda: six.b('Hello'))
+
+        model = self.Model(data=blob)
+
+        self.assertIs(model.data, blob)
+        self.assertFalse(blob.loaded)
+        self.assertEqual(model.get_data(), {'data': six.b('Hello')})
+        self.assertTrue(blob.loaded)
+
+    def test_reset_value(self):
+        """Test resetting of value."""
+        model = self.Model(data=bytearray(six.b('Hello')))
+
+        model.data = None
+
+        self.assertIsNone(model.data)
+        self.assertEqual(model.get_data(), {'data': None})
+
+
 class DateTest(unittest.TestCase):
     """Date field tests."""
 
@@ -335,6 +514,63 @@ class DateTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             model.date_field = some_object
 
+    def test_set_out_of_range_timestamp(self):
+        """Test setting of timestamps out of range of dates."""
+        model = ExampleModel()
+
+        for value in (1e20, float('nan')):
+            with self.assertRaises(TypeError):
+                model.date_field = value
+
+    def test_set_iso_string(self):
+        """Test setting of ISO-8601 string."""
+        model = ExampleModel()
+
+        model.date_field = '1986-04-26'
+
+        self.assertEqual(model.date_field, datetime.date(1986, 4, 26))
+
+    def test_set_iso_datetime_string(self):
+        """Test setting of ISO-8601 date and time string."""
+        model = ExampleModel()
+
+        model.date_field = '1986-04-26T01:23:40Z'
+
+        self.assertEqual(model.date_field, datetime.date(1986, 4, 26))
+
+    def test_set_incorrect_string(self):
+        """Test setting of incorrect strings."""
+        model = ExampleModel()
+
+        for value in ('', '26.04.1986', '1986-13-26', '1986-04-26\n',
+                      u'\uff11\uff19\uff18\uff16-04-26'):
+            with self.assertRaises(TypeError):
+                model.date_field = value
+
+    def test_set_timestamp(self):
+        """Test setting of UNIX timestamp."""
+        model = ExampleModel()
+
+        model.date_field = 514862620
+
+        self.assertEqual(model.date_field, datetime.date(1986, 4, 26))
+
+    def test_iso_format(self):
+        """Test ISO-8601 representation of date."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            date = fields.Date(iso_format=True)
+
+        self.assertEqual(Model(date='1986-04-26').get_data(),
+                         {'date': '1986-04-26'})
+        self.assertEqual(Model().get_data(), {'date': None})
+
+    def test_parsing_is_cached(self):
+        """Test that results of parsing are cached."""
+        self.assertIs(fields.parse_date('1986-04-26'),
+                      fields.parse_date('1986-04-26'))
+
 
 class DateTimeTest(unittest.TestCase):
     """Date and time field tests."""
@@ -366,6 +602,77 @@ class DateTimeTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             model.datetime_field = some_object
 
+    def test_set_out_of_range_timestamp(self):
+        """Test setting of timestamps out of range of dates."""
+        model = ExampleModel()
+
+        for value in (1e20, float('nan')):
+            with self.assertRaises(TypeError):
+                model.datetime_field = value
+
+    def test_set_iso_string(self):
+        """Test setting of ISO-8601 strings."""
+        model = ExampleModel()
+        utc = fields.parse_datetime('2000-01-01T00:00:00Z').tzinfo
+        cases = (
+            ('1986-04-26', datetime.datetime(1986, 4, 26)),
+            ('1986-04-26T01:23', datetime.datetime(1986, 4, 26, 1, 23)),
+            ('1986-04-26 01:23:40',
+             datetime.datetime(1986, 4, 26, 1, 23, 40)),
+            ('1986-04-26T01:23:40.5',
+             datetime.datetime(1986, 4, 26, 1, 23, 40, 500000)),
+            ('1986-04-26T01:23:40Z',
+             datetime.datetime(1986, 4, 26, 1, 23, 40, tzinfo=utc)),
+            ('1986-04-26T04:23:40+03:00',
+             datetime.datetime(1986, 4, 26, 1, 23, 40, tzinfo=utc)),
+            ('1986-04-25T21:23:40-0400',
+             datetime.datetime(1986, 4, 26, 1, 23, 40, tzinfo=utc)),
+        )
+
+        for value, expected in cases:
+            model.datetime_field = value
+            self.assertEqual(model.datetime_field, expected)
+
+    def test_set_incorrect_string(self):
+        """Test setting of incorrect strings."""
+        model = ExampleModel()
+
+        for value in ('', '1986-04-26T25:00', '1986-04-26T01:23:40+3',
+                      '1986-04-26T01:23:40+99:00',
+                      '1986-04-26T01:23:40+01:60',
+                      '1986-04-26T01:23:40Z\n',
+                      u'1986-04-26T01:23:\uff14\uff10'):
+            with self.assertRaises(TypeError):
+                model.datetime_field = value
+
+    def test_set_timestamp(self):
+        """Test setting of UNIX timestamp."""
+        model = ExampleModel()
+
+        model.datetime_field = 514862620.5
+
+        self.assertEqual(model.datetime_field,
+                         datetime.datetime(1986, 4, 26, 1, 23, 40, 500000))
+
+    def test_set_bool(self):
+        """Test that bool is not treated as timestamp."""
+        model = ExampleModel()
+
+        with self.assertRaises(TypeError):
+            model.datetime_field = True
+
+    def test_iso_format(self):
+        """Test ISO-8601 representation of date and time."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            created = fields.DateTime(iso_format=True)
+
+        model = Model(created=datetime.datetime(1986, 4, 26, 1, 23, 40))
+
+        self.assertEqual(model.get_data(),
+                         {'created': '1986-04-26T01:23:40'})
+
 
 class ModelTest(unittest.TestCase):
     """Model field tests."""
@@ -454,3 +761,284 @@ class CollectionTest(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             model.collection_field = [some_object]
+
+
+class DeferredFieldTests(unittest.TestCase):
+    """Deferred field tests."""
+
+    def setUp(self):
+        """Declare model with deferred fields."""
+        calls = self.calls = list()
+
+        class Document(models.DomainModel):
+            """Document model with deferred content."""
+
+            id = fields.Int()
+            content = fields.Binary(deferred=True)
+            category = fields.Categorical(deferred=True)
+
+            @content.loader
+            def load_content(documents):
+                calls.append([document.id for document in documents])
+                return [six.b('content{0}'.format(document.id))
+                        for document in documents]
+
+        self.Document = Document
+
+    def test_loading_on_access(self):
+        """Test that deferred value is loaded on first access."""
+        document = self.Document(id=1)
+
+        self.assertFalse(self.Document.content.is_loaded(document))
+        self.assertEqual(document.content, six.b('content1'))
+        self.assertEqual(document.content, six.b('content1'))
+        self.assertEqual(self.calls, [[1]])
+
+    def test_passed_value(self):
+        """Test that passed value is not loaded."""
+        document = self.Document(id=1, content=six.b('passed'))
+
+        self.assertEqual(document.content, six.b('passed'))
+        self.assertEqual(self.calls, [])
+
+    def test_batch_loading(self):
+        """Test loading of field for whole collection at once."""
+        documents = self.Document.Collection(
+            [self.Document(id=1), self.Document(id=2,
+                                                content=six.b('passed'))])
+        documents.append(self.Document(id=3))
+        documents.insert(0, self.Document(id=4))
+
+        self.assertEqual([document.content for document in documents],
+                         [six.b('content4'), six.b('content1'),
+                          six.b('passed'), six.b('content3')])
+        self.assertEqual(self.calls, [[4, 1, 3]])
+        self.assertIsInstance(documents, collections.BatchLoadingCollection)
+
+    def test_batch_loading_after_slice_assignment(self):
+        """Test batch loading of models assigned to slice."""
+        documents = self.Document.Collection()
+        documents[:] = [self.Document(id=1), self.Document(id=2)]
+
+        self.assertEqual(documents[1].content, six.b('content2'))
+        self.assertEqual(self.calls, [[2, 1]])
+
+    def test_removed_models_are_not_batch_loaded(self):
+        """Test that models removed from collection are loaded alone."""
+        documents = self.Document.Collection(
+            [self.Document(id=number) for number in range(8)])
+        popped = documents.pop(0)
+        documents.remove(documents[0])
+        deleted = documents[0]
+        del documents[0]
+        sliced = documents[:2]
+        del documents[:2]
+        replaced = documents[0]
+        documents[0] = self.Document(id=8)
+
+        for document in [popped, deleted] + list(sliced) + [replaced]:
+            self.assertIsNone(document.__deferred_batch__)
+        self.assertEqual(popped.content, six.b('content0'))
+        self.assertEqual(self.calls, [[0]])
+        self.assertEqual(documents[0].content, six.b('content8'))
+        self.assertEqual(self.calls, [[0], [8, 6, 7]])
+
+    def test_rolled_back_models_are_not_batch_loaded(self):
+        """Test that models of failed extending are not in batch."""
+        documents = self.Document.Collection([self.Document(id=1)])
+        document = self.Document(id=2)
+
+        with self.assertRaises(TypeError):
+            documents.extend([document, object()])
+
+        self.assertIsNone(document.__deferred_batch__)
+        self.assertEqual(documents[0].content, six.b('content1'))
+        self.assertEqual(self.calls, [[1]])
+
+    def test_model_remaining_in_collection_is_batch_loaded(self):
+        """Test that model kept in collection twice stays in batch."""
+        document = self.Document(id=1)
+        documents = self.Document.Collection([document, document,
+                                              self.Document(id=2)])
+
+        documents.pop(0)
+
+        self.assertEqual(document.content, six.b('content1'))
+        self.assertEqual(self.calls, [[1, 2]])
+
+    def test_unload(self):
+        """Test unloading of value."""
+        document = self.Document(id=1, content=six.b('passed'))
+
+        self.Document.content.unload(document)
+
+        self.assertEqual(document.content, six.b('content1'))
+
+    def test_set_data_unloads_value(self):
+        """Test that resetting of model's data makes value deferred again."""
+        document = self.Document(id=1, content=six.b('passed'))
+
+        document.set_data(dict(id=2))
+
+        self.assertEqual(document.content, six.b('content2'))
+
+    def test_missing_loader(self):
+        """Test access to deferred field without loader."""
+        document = self.Document(id=1)
+
+        with self.assertRaises(errors.Error):
+            document.category
+
+    def test_wrong_number_of_values(self):
+        """Test loader that returns wrong number of values."""
+        self.Document.category.loader(lambda documents: [])
+        document = self.Document(id=1)
+
+        with self.assertRaises(errors.Error):
+            document.category
+
+    def test_categorical_loading(self):
+        """Test loading of deferred categorical field."""
+        self.Document.category.loader(
+            lambda documents: ['news' for _ in documents])
+        documents = self.Document.Collection([self.Document(id=1),
+                                              self.Document(id=2)])
+
+        news = self.Document.category.filter(documents, 'news')
+
+        self.assertEqual(news, documents)
+
+    def test_loader_of_not_deferred_field(self):
+        """Test registration of loader for not deferred field."""
+        with self.assertRaises(errors.Error):
+            self.Document.id.loader(lambda documents: [])
+
+    def test_inherited_deferred_fields(self):
+        """Test that deferred fields are inherited."""
+        class Report(self.Document):
+            """Report model."""
+
+            title = fields.String(deferred=True)
+
+        self.assertEqual(set(Report.__deferred_fields__),
+                         set((Report.title, self.Document.content,
+                              self.Document.category)))
+        self.assertTrue(issubclass(Report.Collection,
+                                   collections.BatchLoadingCollection))
+
+
+class ReferenceTests(unittest.TestCase):
+    """Reference field tests."""
+
+    def setUp(self):
+        """Declare models with reference."""
+        class Author(models.DomainModel):
+            """Author model."""
+
+            id = fields.Int()
+            name = fields.String()
+
+            __unique_key__ = (id,)
+
+        class Post(models.DomainModel):
+            """Post model."""
+
+            id = fields.Int()
+            author = fields.Reference(Author)
+
+        self.Author = Author
+        self.Post = Post
+        self.calls = list()
+        self.scope = loaders.LoaderScope({Author: self.load_authors})
+
+    def load_authors(self, keys):
+        """Load authors by keys."""
+        self.calls.append(keys)
+        return [self.Author(id=key, name='author{0}'.format(key))
+                for key in keys]
+
+    def test_resolving(self):
+        """Test resolving of reference."""
+        with self.scope:
+            post = self.Post(id=1, author='5')
+
+            self.assertEqual(self.Post.author.get_key(post), 5)
+            self.assertEqual(post.author.name, 'author5')
+            self.assertIs(post.author, post.author)
+        self.assertEqual(self.calls, [[5]])
+
+    def test_coalescing_of_keys(self):
+        """Test that keys set before first access are loaded together."""
+        with self.scope:
+            posts = [self.Post(id=1, author=1), self.Post(id=2, author=2),
+                     self.Post(id=3, author=1)]
+
+            self.assertEqual([post.author.id for post in posts], [1, 2, 1])
+            self.assertIs(posts[0].author, posts[2].author)
+        self.assertEqual(self.calls, [[1, 2]])
+
+    def test_resolve_many(self):
+        """Test resolving of collection's column of references."""
+        posts = self.Post.Collection([self.Post(id=1, author=1),
+                                      self.Post(id=2),
+                                      self.Post(id=3, author=3)])
+
+        with self.scope:
+            authors = self.Post.author.resolve_many(posts)
+
+        self.assertEqual([author.id if author else None
+                          for author in authors], [1, None, 3])
+        self.assertEqual(self.calls, [[1, 3]])
+
+    def test_set_model(self):
+        """Test setting of related model."""
+        author = self.Author(id=7)
+
+        with self.scope:
+            post = self.Post(id=1, author=author)
+
+            self.assertIs(post.author, author)
+        self.assertEqual(post.get_data(), dict(id=1, author=7))
+        self.assertEqual(self.calls, [])
+
+    def test_default(self):
+        """Test resolving of default value."""
+        with self.scope:
+            post = self.Post(id=1)
+
+            self.assertIsNone(post.author)
+            self.assertEqual(post.get('author', 2).id, 2)
+
+    def test_not_referenceable_model(self):
+        """Test reference to model without single field unique key."""
+        class Tag(models.DomainModel):
+            """Tag model."""
+
+            name = fields.String()
+
+        class Article(models.DomainModel):
+            """Article model."""
+
+            tag = fields.Reference(Tag)
+
+        with self.assertRaises(errors.Error):
+            Article(tag='python')
+
+    @unittest.skipIf(six.PY2, 'asyncio is not available')
+    def test_load_async(self):
+        """Test asynchronous resolving of references."""
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            with self.scope:
+                posts = [self.Post(id=1, author=1), self.Post(id=2, author=2)]
+                authors = loop.run_until_complete(asyncio.gather(
+                    *[self.Post.author.load_async(post) for post in posts]))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+        self.assertEqual([author.id for author in authors], [1, 2])
+        self.assertEqual(self.calls, [[1, 2]])
@@ -0,0 +1,218 @@
+"""HTTP client tests."""
+
+import json
+import threading
+
+import six
+import unittest2 as unittest
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import http_client
+
+
+class User(models.DomainModel):
+    """User model."""
+
+    id = fields.Int()
+    name = fields.String()
+
+
+USERS = [dict(id=number, name='user{0}'.format(number))
+         for number in six.moves.range(1, 24)]
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Local stand-in of HTTP API server."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        """Initializer."""
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.connections = 0
+        self.requests = list()
+        self.lock = threading.Lock()
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handler of users API with pages of 5 users."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        """Count connections."""
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        """Handle GET request."""
+        url = parse.urlsplit(self.path)
+        parameters = dict(parse.parse_qsl(url.query))
+        with self.server.lock:
+            self.server.requests.append((url.path, parameters))
+
+        if url.path == '/api/users':
+            page = int(parameters['page'])
+            body = json.dumps(
+                dict(results=USERS[(page - 1) * 5:page * 5]))
+        elif url.path == '/api/users/stream':
+            body = ''.join(json.dumps(user) + '\n' for user in USERS)
+        elif url.path == '/api/users/1':
+            body = json.dumps(USERS[0])
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Do not log requests."""
+
+
+class ResourceTests(unittest.TestCase):
+    """Resource tests."""
+
+    def setUp(self):
+        """Start local server."""
+        self.server = Server()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:{0}/api/users'.format(
+            self.server.server_address[1])
+        self.resource = http_client.Resource(User, self.url,
+                                             items_key='results',
+                                             pool_size=2)
+
+    def tearDown(self):
+        """Stop local server."""
+        self.resource.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get(self):
+        """Test fetching of model."""
+        user = self.resource.get(1)
+
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.get_data(), USERS[0])
+
+    def test_fetch_page(self):
+        """Test fetching of page."""
+        users = self.resource.fetch_page(2, active='1')
+
+        self.assertIsInstance(users, User.Collection)
+        self.assertEqual([user.id for user in users], [6, 7, 8, 9, 10])
+        self.assertEqual(self.server.requests,
+                         [('/api/users', dict(page='2', active='1'))])
+
+    def test_iterate_pages(self):
+        """Test iteration of pages till first empty one."""
+        pages = list(self.resource.iterate_pages(parallelism=3))
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual([user.get_data() for page in pages for user in page],
+                         USERS)
+        self.assertEqual(len(self.server.requests), 6)
+
+    def test_iterate_pages_with_last_page(self):
+        """Test iteration of range of pages."""
+        pages = list(self.resource.iterate_pages(first_page=2, last_page=3))
+
+        self.assertEqual([user.id for page in pages for user in page],
+                         list(six.moves.range(6, 16)))
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_connections_reuse(self):
+        """Test that persistent connections are reused."""
+        for page in six.moves.range(1, 6):
+            self.resource.fetch_page(page)
+
+        self.assertEqual(self.server.connections, 1)
+
+    def test_bounded_connections(self):
+        """Test that idle connections are bounded by pool size."""
+        list(self.resource.iterate_pages(parallelism=4))
+
+        self.assertLessEqual(self.resource.pool._connections.qsize(), 2)
+
+    def test_stream(self):
+        """Test streaming of JSON lines into batches."""
+        resource = http_client.Resource(User, self.url + '/stream')
+
+        batches = list(resource.stream(batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 3])
+        self.assertIsInstance(batches[0], User.Collection)
+        self.assertEqual([user.get_data() for batch in batches
+                          for user in batch], USERS)
+
+    def test_break_out_of_stream(self):
+        """Test that connection is closed when stream is not consumed."""
+        resource = http_client.Resource(User, self.url + '/stream')
+        connection_cls = resource.pool.connection_cls
+        connections = list()
+
+        class Connection(connection_cls):
+            """Connection that is tracked by test."""
+
+            def connect(self):
+                """Connect to server."""
+                connections.append(self)
+                connection_cls.connect(self)
+
+        resource.pool.connection_cls = Connection
+        batches = resource.stream(batch_size=10)
+        for batch in batches:
+            break
+        batches.close()
+
+        self.assertEqual(len(connections), 1)
+        self.assertIsNone(connections[0].sock)
+        self.assertEqual(resource.pool._connections.qsize(), 0)
+
+    def test_query_of_url(self):
+        """Test that query of resource's URL is sent with every request."""
+        resource = http_client.Resource(User, self.url + '?key=x&page=0',
+                                        items_key='results')
+
+        resource.fetch_page(2, active='1')
+        resource.get(1)
+
+        self.assertEqual(self.server.requests, [
+            ('/api/users', dict(page='2', active='1', key='x')),
+            ('/api/users/1', dict(page='0', key='x')),
+        ])
+
+    def test_quoting_of_identifier(self):
+        """Test that identifiers are quoted in path."""
+        with self.assertRaises(errors.Error):
+            self.resource.get('1/stream?x')
+
+        self.assertEqual(self.server.requests,
+                         [('/api/users/1%2Fstream%3Fx', dict())])
+
+    def test_error_status(self):
+        """Test that error statuses are raised."""
+        with self.assertRaises(errors.Error):
+            self.resource.get(100)
+
+        self.assertEqual(self.resource.fetch_page(1)[0].id, 1)
+
+    def test_unsupported_scheme(self):
+        """Test that unsupported schemes are rejected."""
+        with self.assertRaises(errors.Error):
+            http_client.Resource(User, 'ftp://127.0.0.1/users')
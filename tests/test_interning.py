@@ -0,0 +1,116 @@
+"""Interning tests."""
+
+import threading
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import interning
+
+
+class Address(models.DomainModel):
+    """Address model."""
+
+    city = fields.String()
+    street = fields.String()
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+    tags = fields.Field()
+
+
+class Profile(models.DomainModel):
+    """Profile model."""
+
+    id = fields.Int()
+    address = fields.Model(Address)
+    photos = fields.Collection(Photo)
+
+
+class InterningContextTests(unittest.TestCase):
+    """Interning context tests."""
+
+    def test_nested_models_are_interned(self):
+        """Test that equal nested models are created once."""
+        with interning.InterningContext(Address, Photo) as context:
+            profile1 = Profile(id=1,
+                               address={'city': 'Kyiv', 'street': 'Main'},
+                               photos=[{'id': 1}, {'id': 2}])
+            profile2 = Profile(id=2,
+                               address={'street': 'Main', 'city': 'Kyiv'},
+                               photos=[{'id': 2}])
+
+        self.assertIs(profile1.address, profile2.address)
+        self.assertIs(profile1.photos[1], profile2.photos[0])
+        self.assertIsNot(profile1.photos[0], profile1.photos[1])
+        self.assertEqual(context.hits, 2)
+        self.assertEqual(context.misses, 3)
+
+    def test_only_given_classes_are_interned(self):
+        """Test that models of other classes are not interned."""
+        with interning.InterningContext(Address):
+            profile1 = Profile(address={'city': 'Kyiv'}, photos=[{'id': 1}])
+            profile2 = Profile(address={'city': 'Kyiv'}, photos=[{'id': 1}])
+
+        self.assertIs(profile1.address, profile2.address)
+        self.assertIsNot(profile1.photos[0], profile2.photos[0])
+
+    def test_no_interning_outside_context(self):
+        """Test that models are not interned outside of context."""
+        with interning.InterningContext(Address):
+            profile1 = Profile(address={'city': 'Kyiv'})
+
+        profile2 = Profile(address={'city': 'Kyiv'})
+
+        self.assertIsNone(interning.get_current_context())
+        self.assertIsNot(profile1.address, profile2.address)
+
+    def test_no_interning_in_other_threads(self):
+        """Test that context is active only in its thread."""
+        contexts = list()
+
+        with interning.InterningContext(Address):
+            thread = threading.Thread(
+                target=lambda: contexts.append(
+                    interning.get_current_context()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(contexts, [None])
+
+    def test_nested_contexts(self):
+        """Test that innermost context is active."""
+        with interning.InterningContext(Address) as outer_context:
+            with interning.InterningContext(Photo) as inner_context:
+                self.assertIs(interning.get_current_context(),
+                              inner_context)
+            self.assertIs(interning.get_current_context(), outer_context)
+
+    def test_values_of_different_types(self):
+        """Test that values of different types are not considered equal."""
+        with interning.InterningContext(Address):
+            profile1 = Profile(address={'city': 1})
+            profile2 = Profile(address={'city': True})
+
+        self.assertEqual(profile1.address.city, '1')
+        self.assertEqual(profile2.address.city, 'True')
+
+    def test_unhashable_data(self):
+        """Test that models with unhashable data are not interned."""
+        with interning.InterningContext(Photo):
+            profile1 = Profile(photos=[{'id': 1, 'tags': set(['a'])}])
+            profile2 = Profile(photos=[{'id': 1, 'tags': set(['a'])}])
+
+        self.assertIsNot(profile1.photos[0], profile2.photos[0])
+
+    def test_nested_lists_data(self):
+        """Test that data with lists is interned."""
+        with interning.InterningContext(Photo):
+            profile1 = Profile(photos=[{'id': 1, 'tags': ['a', 'b']}])
+            profile2 = Profile(photos=[{'id': 1, 'tags': ['a', 'b']}])
+
+        self.assertIs(profile1.photos[0], profile2.photos[0])
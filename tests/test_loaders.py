@@ -0,0 +1,184 @@
+"""Loaders tests."""
+
+import six
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import loaders
+
+
+class Author(models.DomainModel):
+    """Author model."""
+
+    id = fields.Int()
+
+    __unique_key__ = (id,)
+
+
+class DataLoaderTests(unittest.TestCase):
+    """Data loader tests."""
+
+    def setUp(self):
+        """Create data loader."""
+        self.calls = list()
+        self.loader = loaders.DataLoader(self.batch_load)
+
+    def batch_load(self, keys):
+        """Load values by keys."""
+        self.calls.append(keys)
+        return ['value{0}'.format(key) if key < 100 else None for key in keys]
+
+    def test_load(self):
+        """Test loading of value."""
+        self.assertEqual(self.loader.load(1), 'value1')
+        self.assertEqual(self.loader.load(1), 'value1')
+        self.assertEqual(self.calls, [[1]])
+
+    def test_coalescing_of_primed_keys(self):
+        """Test that enqueued keys are loaded together."""
+        for key in (1, 2, 1, 3):
+            self.loader.prime(key)
+
+        self.assertEqual(self.loader.load(2), 'value2')
+        self.assertEqual(self.loader.load(3), 'value3')
+        self.assertEqual(self.calls, [[1, 2, 3]])
+        self.assertEqual(self.loader.dispatches, 1)
+
+    def test_load_many(self):
+        """Test loading of many values."""
+        self.loader.load(1)
+
+        self.assertEqual(self.loader.load_many([1, 2, None, 100]),
+                         ['value1', 'value2', None, None])
+        self.assertEqual(self.calls, [[1], [2, 100]])
+
+    def test_prime_value(self):
+        """Test memoizing of passed value."""
+        self.loader.prime(1, 'primed')
+
+        self.assertEqual(self.loader.load(1), 'primed')
+        self.assertEqual(self.calls, [])
+
+    def test_clear(self):
+        """Test clearing of memoized values."""
+        self.loader.load(1)
+        self.loader.clear()
+        self.loader.load(1)
+
+        self.assertEqual(self.calls, [[1], [1]])
+
+    def test_dictionary_of_values(self):
+        """Test batch load function that returns dictionary."""
+        loader = loaders.DataLoader(lambda keys: {1: 'one'})
+
+        self.assertEqual(loader.load_many([1, 2]), ['one', None])
+
+    def test_wrong_number_of_values(self):
+        """Test batch load function that returns wrong number of values."""
+        loader = loaders.DataLoader(lambda keys: [])
+
+        with self.assertRaises(errors.Error):
+            loader.load(1)
+
+    def test_missing_batch_load(self):
+        """Test loading without batch load function."""
+        with self.assertRaises(errors.Error):
+            loaders.DataLoader(None).load(1)
+
+    @unittest.skipIf(six.PY2, 'asyncio is not available')
+    def test_load_async(self):
+        """Test that keys requested in one loop iteration are coalesced."""
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.loader.load(1)
+            values = loop.run_until_complete(asyncio.gather(
+                self.loader.load_async(1), self.loader.load_async(2),
+                self.loader.load_async(3), self.loader.load_async(None)))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+        self.assertEqual(values, ['value1', 'value2', 'value3', None])
+        self.assertEqual(self.calls, [[1], [2, 3]])
+
+    @unittest.skipIf(six.PY2, 'asyncio is not available')
+    def test_load_async_with_awaitable_batch_load(self):
+        """Test batch load function that returns awaitable."""
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        def batch_load(keys):
+            future = loop.create_future()
+            loop.call_soon(future.set_result, [key * 10 for key in keys])
+            return future
+
+        loader = loaders.DataLoader(batch_load)
+        try:
+            values = loop.run_until_complete(asyncio.gather(
+                loader.load_async(1), loader.load_async(2)))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+        self.assertEqual(values, [10, 20])
+        self.assertEqual(loader.cache, {1: 10, 2: 20})
+
+    @unittest.skipIf(six.PY2, 'asyncio is not available')
+    def test_load_async_failure(self):
+        """Test that failure of batch load function is set to futures."""
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loader = loaders.DataLoader(lambda keys: [])
+        try:
+            with self.assertRaises(errors.Error):
+                loop.run_until_complete(loader.load_async(1))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+
+class LoaderScopeTests(unittest.TestCase):
+    """Loader scope tests."""
+
+    def tearDown(self):
+        """Unregister batch load functions."""
+        loaders._batch_loads.clear()
+
+    def test_registered_batch_load(self):
+        """Test that scope uses registered batch load function."""
+        loaders.register(Author, lambda keys: [Author(id=key)
+                                               for key in keys])
+
+        with loaders.LoaderScope() as scope:
+            self.assertIs(loaders.get_current_scope(), scope)
+            loader = loaders.get_loader(Author)
+            self.assertIs(loaders.get_loader(Author), loader)
+            self.assertEqual(loader.load(1).id, 1)
+
+        self.assertIsNone(loaders.get_current_scope())
+        self.assertIsNot(loaders.get_loader(Author), loader)
+
+    def test_overridden_batch_load(self):
+        """Test that scope's batch load functions override registered ones."""
+        loaders.register(Author, lambda keys: [None for _ in keys])
+
+        batch_loads = {Author: lambda keys: [Author(id=key) for key in keys]}
+
+        with loaders.LoaderScope(batch_loads):
+            self.assertEqual(loaders.get_loader(Author).load(1).id, 1)
+
+    def test_nested_scopes(self):
+        """Test that nested scope does not share memoized values."""
+        with loaders.LoaderScope() as outer_scope:
+            with loaders.LoaderScope() as inner_scope:
+                self.assertIs(loaders.get_current_scope(), inner_scope)
+            self.assertIs(loaders.get_current_scope(), outer_scope)
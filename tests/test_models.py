@@ -1,6 +1,7 @@
 """Models tests."""
 
 import datetime
+import gc
 
 import unittest2 as unittest
 
@@ -270,7 +271,7 @@ class ModelSetterGetterTests(unittest.TestCase):
         self.assertEqual(model.get('field'), None)
         self.assertEqual(model.get('field', once), once)
 
-        for value in ['', 'baz', u'baz', 0, 3, 0.7, '.5', False, True]:
+        for value in ['', 'baz', u'baz', '.5', False, True, object()]:
             with self.assertRaises(TypeError):
                 model.get('field', value)
                 self.fail("Failed with {0}".format(value))
@@ -292,7 +293,7 @@ class ModelSetterGetterTests(unittest.TestCase):
         self.assertEqual(model.get('field'), None)
         self.assertEqual(model.get('field', once), once)
 
-        for value in ['', 'baz', u'baz', 0, 3, 0.7, '.5', False, True]:
+        for value in ['', 'baz', u'baz', '.5', False, True, object()]:
             with self.assertRaises(TypeError):
                 model.get('field', value)
                 self.fail("Failed with {0}".format(value))
@@ -416,6 +417,64 @@ class ModelSetterGetterTests(unittest.TestCase):
         with self.assertRaises(AttributeError):
             profile.set_data({'main_photo': {'id': 1}})
 
+    def test_set_data_partially(self):
+        """Test set_data method that sets only passed fields."""
+        profile = Profile(**self.data)
+        photos = profile.photos
+
+        profile.set_data({'name': 'Johnny', 'unknown': 1}, partial=True)
+
+        self.assertEqual(profile.id, 1)
+        self.assertEqual(profile.name, 'Johnny')
+        self.assertIs(profile.photos, photos)
+        self.assertEqual(profile.birth_date,
+                         datetime.date(year=1986, month=4, day=26))
+
+    def test_set_data_partially_skips_identical_values(self):
+        """Test that identical values are not converted again."""
+        class CountingCollection(fields.Collection):
+            """Collection field that counts conversions."""
+
+            conversions = 0
+
+            def _converter(self, value):
+                CountingCollection.conversions += 1
+                return super(CountingCollection, self)._converter(value)
+
+        class Album(models.DomainModel):
+            """Album model."""
+
+            title = fields.String()
+            photos = CountingCollection(Photo)
+
+        album = Album(photos=[{'id': 1}])
+        photos = album.photos
+
+        album.set_data({'title': 'Trip', 'photos': photos}, partial=True)
+
+        self.assertIs(album.photos, photos)
+        self.assertEqual(CountingCollection.conversions, 1)
+
+    def test_set_data_partially_with_none(self):
+        """Test that passed None values are set."""
+        profile = Profile(**self.data)
+
+        profile.set_data({'main_photo': None}, partial=True)
+
+        self.assertIsNone(profile.main_photo)
+        self.assertEqual(profile.name, 'John')
+
+    def test_update(self):
+        """Test update method."""
+        profile = Profile(**self.data)
+
+        profile.update(name='Johnny', birth_date='2000-01-02')
+
+        self.assertEqual(profile.name, 'Johnny')
+        self.assertEqual(profile.birth_date,
+                         datetime.date(year=2000, month=1, day=2))
+        self.assertEqual(profile.main_photo.id, 1)
+
 
 class ModelReprTests(unittest.TestCase):
     """Tests for model Pythonic representation."""
@@ -893,3 +952,349 @@ class ModelsEqualityComparationsTests(unittest.TestCase):
         credits = Credit.Collection([Credit(amount=1), Credit(amount=2)])
 
         self.assertEqual(credits.total_amount, 3)
+
+
+class ModelCollectionTests(unittest.TestCase):
+    """Tests for model's collection class."""
+
+    def test_collection_is_created_lazily(self):
+        """Test that collection class is created on first access."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+
+        self.assertIsInstance(Model.__dict__['Collection'],
+                              models.CollectionDescriptor)
+
+        collection_cls = Model.Collection
+
+        self.assertIs(Model.__dict__['Collection'], collection_cls)
+        self.assertTrue(issubclass(collection_cls, collections.Collection))
+        self.assertIs(collection_cls.value_type, Model)
+        self.assertEqual(collection_cls.__module__, Model.__module__)
+
+    def test_collection_identity(self):
+        """Test that collection class is the same on every access."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+
+        self.assertIs(Model.Collection, Model.Collection)
+        self.assertIs(Model().Collection, Model.Collection)
+
+    def test_collection_of_model_subclass(self):
+        """Test collection of model subclass."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+
+            class Collection(collections.Collection):
+                """Test collection."""
+
+        class SubModel(Model):
+            """Test model subclass."""
+
+        self.assertTrue(issubclass(SubModel.Collection, Model.Collection))
+        self.assertIs(SubModel.Collection.value_type, SubModel)
+        self.assertIs(Model.Collection.value_type, Model)
+
+
+class IdentityMapTests(unittest.TestCase):
+    """Tests for models identity map."""
+
+    def test_same_instance_for_same_key(self):
+        """Test that alive model with the same key is returned."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        model1 = Model(id=1, name='John')
+        model2 = Model(id='1', name='Johnny')
+        model3 = Model(id=2, name='Jane')
+
+        self.assertIs(model1, model2)
+        self.assertIsNot(model1, model3)
+        self.assertEqual(model1.name, 'Johnny')
+
+    def test_update_only_passed_fields(self):
+        """Test that update policy updates only passed fields."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String()
+            email = fields.String()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        model = Model(id=1, name='John', email='john@example.com')
+        Model(id=1, name='Johnny')
+
+        self.assertEqual(model.name, 'Johnny')
+        self.assertEqual(model.email, 'john@example.com')
+
+    def test_keep_policy(self):
+        """Test that keep policy keeps alive model unchanged."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+            __identity_policy__ = models.IDENTITY_POLICY_KEEP
+
+        model1 = Model(id=1, name='John')
+        model2 = Model(id=1, name='Johnny')
+
+        self.assertIs(model1, model2)
+        self.assertEqual(model1.name, 'John')
+
+    def test_models_are_not_kept_alive(self):
+        """Test that identity map does not keep models alive."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        Model(id=1)
+        gc.collect()
+
+        self.assertEqual(len(Model.__identity_map__), 0)
+
+    def test_incomplete_key(self):
+        """Test that models without unique key values are not mapped."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        self.assertIsNot(Model(), Model())
+
+    def test_nested_models(self):
+        """Test that identity map is used for nested models."""
+        class Photo(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+
+        class Profile(models.DomainModel):
+            """Test model."""
+
+            main_photo = fields.Model(Photo)
+            photos = fields.Collection(Photo)
+
+        profile = Profile(main_photo={'id': 1}, photos=[{'id': 1}])
+
+        self.assertIs(profile.main_photo, profile.photos[0])
+
+    def test_without_slots_optimization(self):
+        """Test identity map of model without slots optimization."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            __unique_key__ = (id,)
+            __identity_map__ = True
+            __slots_optimization__ = False
+
+        self.assertIs(Model(id=1), Model(id=1))
+
+    def test_unique_key_is_required(self):
+        """Test that identity map requires unique key."""
+        with self.assertRaises(errors.Error):
+            class Model(models.DomainModel):
+                """Test model."""
+
+                id = fields.Int()
+                __identity_map__ = True
+
+    def test_unknown_policy(self):
+        """Test that identity policy is validated."""
+        with self.assertRaises(errors.Error):
+            class Model(models.DomainModel):
+                """Test model."""
+
+                id = fields.Int()
+                __unique_key__ = (id,)
+                __identity_map__ = True
+                __identity_policy__ = 'replace'
+
+
+class ModelFactoryTests(unittest.TestCase):
+    """Tests of compiled factories of models."""
+
+    def test_create(self):
+        """Test creation of models from values of named fields."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String(intern=True)
+            active = fields.Bool(default=True)
+            rating = fields.Float()
+
+        create = models.compile_model_factory(
+            Model, ('name', 'id', 'active'), (fields.Int, fields.Bool))
+
+        model = create('John', 1, None)
+
+        self.assertEqual(model.get_data(), dict(id=1, name='John',
+                                                active=True, rating=None))
+
+    def test_create_with_overridden_initializer(self):
+        """Test that overridden initializer is called."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            name = fields.String()
+
+            def __init__(self, name=None, **kwargs):
+                """Initializer."""
+                super(Model, self).__init__(name=(name or '').upper(),
+                                            **kwargs)
+
+        create = models.compile_model_factory(Model, ('id', 'name'),
+                                              (fields.Int, fields.String))
+
+        self.assertEqual(create(1, 'john').get_data(),
+                         dict(id=1, name='JOHN'))
+
+
+class Player(models.DomainModel):
+    """Player model with declared ordering."""
+
+    id = fields.Int()
+    name = fields.String()
+    team = fields.Categorical()
+    rating = fields.Float()
+
+    __ordering__ = (rating, name)
+
+
+class ModelOrderingTests(unittest.TestCase):
+    """Tests for ordering of models."""
+
+    def setUp(self):
+        """Create collection of players."""
+        self.players = Player.Collection([
+            Player(id=1, name='Carl', team='red', rating=7.5),
+            Player(id=2, name='Anna', team='blue', rating=9.0),
+            Player(id=3, name='Bob', team='red', rating=7.5),
+            Player(id=4, name='Dan', team='blue', rating=5.0),
+        ])
+
+    def get_ids(self, players):
+        """Return ids of players."""
+        return [player.id for player in players]
+
+    def test_ordering_key(self):
+        """Test ordering key extractor."""
+        self.assertEqual(Player.__ordering__, (Player.rating, Player.name))
+        self.assertEqual(Player.__ordering_key__(self.players[0]),
+                         ((False, 7.5), (False, 'Carl')))
+        self.assertIsNone(Photo.__ordering_key__)
+
+    def test_ordering_key_of_fields_with_read_time_logic(self):
+        """Test ordering key of categorical field."""
+        class Ranking(models.DomainModel):
+            """Ranking model."""
+
+            team = fields.Categorical(categories=('red', 'blue'))
+
+            __ordering__ = (team,)
+
+        self.assertEqual(Ranking.__ordering_key__(Ranking(team='red')),
+                         ((False, 'red'),))
+        self.assertLess(Ranking(team='blue'), Ranking(team='red'))
+
+    def test_rich_comparisons(self):
+        """Test rich comparisons of models."""
+        carl, anna, bob, dan = self.players
+
+        self.assertLess(bob, carl)
+        self.assertLessEqual(bob, carl)
+        self.assertGreater(anna, carl)
+        self.assertGreaterEqual(anna, anna)
+        self.assertEqual(self.get_ids(sorted(self.players)), [4, 3, 1, 2])
+
+    @unittest.skipIf(six.PY2, 'Python 2 orders any objects')
+    def test_comparison_without_ordering(self):
+        """Test that models without ordering are not comparable."""
+        with self.assertRaises(TypeError):
+            Photo() < Photo()
+        with self.assertRaises(TypeError):
+            self.players[0] < Photo()
+
+    def test_sort_by(self):
+        """Test sorting by ascending and descending keys."""
+        self.players.sort_by('-rating', Player.name)
+
+        self.assertEqual(self.get_ids(self.players), [2, 3, 1, 4])
+
+    def test_sort_by_categorical_field(self):
+        """Test sorting by field with read-time logic."""
+        self.players.sort_by('team', '-id')
+
+        self.assertEqual(self.get_ids(self.players), [4, 2, 3, 1])
+
+    def test_sort_by_ordering(self):
+        """Test sorting by declared ordering."""
+        self.players.sort_by()
+
+        self.assertEqual(self.get_ids(self.players), [4, 3, 1, 2])
+
+    def test_sort_by_is_stable(self):
+        """Test stability of sorting."""
+        self.players.sort_by('rating')
+
+        self.assertEqual(self.get_ids(self.players), [4, 1, 3, 2])
+
+    def test_top_k(self):
+        """Test selection of first values in order of keys."""
+        top = self.players.top_k(2, '-rating')
+
+        self.assertIsInstance(top, Player.Collection)
+        self.assertEqual(self.get_ids(top), [2, 1])
+        self.assertEqual(self.get_ids(self.players.top_k(3, 'rating')),
+                         [4, 1, 3])
+        self.assertEqual(self.get_ids(self.players), [1, 2, 3, 4])
+
+    def test_top_k_with_mixed_directions(self):
+        """Test selection of first values by keys of mixed directions."""
+        top = self.players.top_k(3, '-rating', 'name')
+
+        self.assertEqual(self.get_ids(top), [2, 3, 1])
+        self.assertEqual(self.get_ids(self.players), [1, 2, 3, 4])
+
+    def test_none_values_are_ordered_last(self):
+        """Test ordering of None values after any other values."""
+        self.players.extend([Player(id=5, name='Eve'),
+                             Player(id=6, rating=7.5)])
+
+        self.assertEqual(self.get_ids(sorted(self.players)),
+                         [4, 3, 1, 6, 2, 5])
+        self.assertLess(self.players[0], self.players[4])
+        self.assertGreater(self.players[5], self.players[0])
+
+        self.players.sort_by('-rating', 'name')
+        self.assertEqual(self.get_ids(self.players), [5, 2, 3, 1, 6, 4])
+
+        self.assertEqual(self.get_ids(self.players.top_k(2, 'rating')),
+                         [4, 3])
+        self.assertEqual(self.get_ids(self.players.top_k(2, '-rating')),
+                         [5, 2])
@@ -0,0 +1,160 @@
+"""Pools tests."""
+
+import threading
+
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+
+
+class Event(models.DomainModel):
+    """Pooled model."""
+
+    id = fields.Int()
+    name = fields.String(default='event')
+
+    __pool_size__ = 2
+
+
+class ModelPoolTests(unittest.TestCase):
+    """Model pool tests."""
+
+    def setUp(self):
+        """Reset pool of model."""
+        self.pool = Event.__pool__
+        self.pool.clear()
+        self.pool.hits = self.pool.misses = self.pool.discards = 0
+
+    def test_released_model_is_reused(self):
+        """Test that released model is reused by next acquisition."""
+        event1 = Event.acquire(id=1, name='created')
+        event1.release()
+        event2 = Event.acquire(id=2)
+
+        self.assertIs(event1, event2)
+        self.assertEqual(event2.id, 2)
+        self.assertEqual(event2.name, 'event')
+        self.assertEqual(self.pool.hits, 1)
+        self.assertEqual(self.pool.misses, 1)
+        self.assertEqual(self.pool.hit_rate, 0.5)
+
+    def test_repeated_release_is_ignored(self):
+        """Test that model released twice is acquired only once."""
+        event = Event.acquire(id=1)
+        event.release()
+        event.release()
+
+        event2 = Event.acquire(id=2)
+        event3 = Event.acquire(id=3)
+
+        self.assertIsNot(event2, event3)
+        self.assertEqual((event2.id, event3.id), (2, 3))
+        self.assertEqual(self.pool.size, 0)
+
+    def test_concurrent_releases(self):
+        """Test that model released by threads is kept in pool once."""
+        def release_and_acquire(event):
+            for _ in range(1000):
+                self.pool.release(event)
+                self.pool.release(event)
+                self.pool.acquire()
+
+        events = [Event(), Event()]
+        threads = [threading.Thread(target=release_and_acquire,
+                                    args=(events[number % 2],))
+                   for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.pool.hits + self.pool.misses, 8000)
+        self.assertLessEqual(self.pool.size, 2)
+        self.assertEqual(len(set(map(id, self.pool._models))),
+                         self.pool.size)
+
+    def test_released_model_is_cleared(self):
+        """Test that fields of released model are cleared."""
+        event = Event.acquire(id=1, name='created')
+
+        event.release()
+
+        self.assertIsNone(event.id)
+        self.assertIsNone(event.name)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_max_size(self):
+        """Test that pool keeps limited number of released models."""
+        for event in [Event.acquire(id=number) for number in range(3)]:
+            event.release()
+
+        self.assertEqual(self.pool.size, 2)
+        self.assertEqual(self.pool.discards, 1)
+
+    def test_pooled(self):
+        """Test pooled context manager."""
+        with Event.pooled(id=1) as event:
+            self.assertEqual(event.id, 1)
+
+        self.assertEqual(self.pool.size, 1)
+        self.assertIsNone(event.id)
+
+    def test_empty_hit_rate(self):
+        """Test hit rate of unused pool."""
+        self.assertEqual(self.pool.hit_rate, 0.0)
+
+
+class ModelWithoutPoolTests(unittest.TestCase):
+    """Tests of pool methods of models without pool."""
+
+    def test_acquire_and_release(self):
+        """Test acquisition and release of model without pool."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+
+        model = Model.acquire(id=1)
+        model.release()
+
+        self.assertIsNone(Model.__pool__)
+        self.assertEqual(model.id, 1)
+        self.assertIsNot(Model.acquire(id=1), model)
+
+    def test_pool_with_identity_map(self):
+        """Test that pool could not be used together with identity map."""
+        with self.assertRaises(errors.Error):
+            class Model(models.DomainModel):
+                """Test model."""
+
+                id = fields.Int()
+                __unique_key__ = (id,)
+                __identity_map__ = True
+                __pool_size__ = 10
+
+    def test_pool_with_deferred_fields(self):
+        """Test that recycled model is detached from its old collection."""
+        calls = list()
+
+        class Document(models.DomainModel):
+            """Pooled model with deferred field."""
+
+            id = fields.Int()
+            content = fields.String(deferred=True)
+
+            @content.loader
+            def load_content(documents):
+                calls.append([document.id for document in documents])
+                return ['content' for _ in documents]
+
+            __pool_size__ = 2
+
+        documents = Document.Collection([Document.acquire(id=1),
+                                         Document.acquire(id=2)])
+        documents[0].release()
+        document = Document.acquire(id=9)
+
+        self.assertEqual(document.content, 'content')
+        self.assertEqual(calls, [[9]])
@@ -0,0 +1,202 @@
+"""Redis mapper tests."""
+
+import datetime
+
+import six
+import unittest2 as unittest
+
+from domain_models import models
+from domain_models import fields
+from domain_models import errors
+from domain_models import redis_mapper
+from domain_models import loaders
+
+
+class Photo(models.DomainModel):
+    """Photo model."""
+
+    id = fields.Int()
+    taken_at = fields.DateTime()
+
+
+class Profile(models.DomainModel):
+    """Profile model."""
+
+    id = fields.Int()
+    name = fields.String()
+    rating = fields.Float()
+    active = fields.Bool()
+    avatar = fields.Binary()
+    birth_date = fields.Date()
+    main_photo = fields.Model(Photo)
+    photos = fields.Collection(Photo)
+
+    __unique_key__ = (id,)
+
+
+class Author(models.DomainModel):
+    """Author model."""
+
+    id = fields.Int()
+
+    __unique_key__ = (id,)
+
+
+class Post(models.DomainModel):
+    """Post model with reference to author."""
+
+    id = fields.Int()
+    author = fields.Reference(Author)
+
+    __unique_key__ = (id,)
+
+
+class FakeRedis(object):
+    """In-process stand-in of Redis server and client."""
+
+    def __init__(self):
+        """Initializer."""
+        self.hashes = dict()
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        """Return pipeline."""
+        return FakePipeline(self)
+
+
+class FakePipeline(object):
+    """In-process stand-in of Redis pipeline."""
+
+    def __init__(self, server):
+        """Initializer."""
+        self.server = server
+        self.commands = list()
+
+    def delete(self, key):
+        """Queue deletion of key."""
+        self.commands.append(lambda: self.server.hashes.pop(key, None))
+
+    def hset(self, key, mapping):
+        """Queue setting of hash fields."""
+        def command():
+            self.server.hashes.setdefault(key, dict()).update(
+                (name.encode('utf-8'), self._to_bytes(value))
+                for name, value in mapping.items())
+        self.commands.append(command)
+
+    def hgetall(self, key):
+        """Queue getting of hash."""
+        self.commands.append(
+            lambda: dict(self.server.hashes.get(key, dict())))
+
+    def execute(self):
+        """Execute queued commands in single round trip."""
+        self.server.round_trips += 1
+        return [command() for command in self.commands]
+
+    @staticmethod
+    def _to_bytes(value):
+        """Convert value to bytes as Redis does."""
+        if isinstance(value, six.binary_type):
+            return value
+        return six.text_type(value).encode('utf-8')
+
+
+class RedisMapperTests(unittest.TestCase):
+    """Redis mapper tests."""
+
+    def setUp(self):
+        """Create mapper."""
+        self.server = FakeRedis()
+        self.mapper = redis_mapper.RedisMapper(Profile, self.server,
+                                               batch_size=2)
+
+    def test_save_and_load(self):
+        """Test saving and loading of model."""
+        profile = Profile(
+            id=1, name='John', rating=4.75, active=False,
+            avatar=six.b('\x00\x01'),
+            birth_date=datetime.date(1986, 4, 26),
+            main_photo={'id': 1,
+                        'taken_at': datetime.datetime(2016, 1, 1, 10, 0)},
+            photos=[{'id': 1}, {'id': 2}])
+
+        self.mapper.save(profile)
+        loaded_profile = self.mapper.load(1)
+
+        self.assertIn(six.b('name'), self.server.hashes['profile:1'])
+        self.assertIsNot(loaded_profile, profile)
+        self.assertEqual(loaded_profile.get_data(), profile.get_data())
+
+    def test_none_values_are_not_stored(self):
+        """Test that None values are not stored."""
+        self.mapper.save(Profile(id=1, name='John'))
+        self.mapper.save(Profile(id=1))
+
+        self.assertEqual(self.server.hashes['profile:1'],
+                         {six.b('id'): six.b('1')})
+        self.assertIsNone(self.mapper.load(1).name)
+
+    def test_load_missing(self):
+        """Test loading of missing model."""
+        self.assertIsNone(self.mapper.load(1))
+
+    def test_batches(self):
+        """Test that models are saved and loaded in batches."""
+        profiles = [Profile(id=number, name=str(number))
+                    for number in range(5)]
+
+        self.mapper.save_many(profile for profile in profiles)
+        self.assertEqual(self.server.round_trips, 3)
+
+        loaded_profiles = self.mapper.load_many([4, 0, 7, 2])
+        self.assertEqual(self.server.round_trips, 5)
+
+        self.assertIsInstance(loaded_profiles, Profile.Collection)
+        self.assertEqual([profile.name for profile in loaded_profiles],
+                         ['4', '0', '2'])
+
+    def test_delete_many(self):
+        """Test deleting of models."""
+        self.mapper.save_many([Profile(id=1), Profile(id=2)])
+
+        self.mapper.delete_many([1, 2])
+
+        self.assertEqual(self.server.hashes, dict())
+
+    def test_composite_key(self):
+        """Test key of model with composite unique key."""
+        class Model(models.DomainModel):
+            """Test model."""
+
+            id = fields.Int()
+            lang = fields.String()
+
+            __unique_key__ = (id, lang)
+
+        mapper = redis_mapper.RedisMapper(Model, self.server,
+                                          key_prefix='models')
+
+        self.assertEqual(mapper.get_model_key(Model(id=1, lang='en')),
+                         'models:1:en')
+
+    def test_unique_key_is_required(self):
+        """Test that model without unique key could not be mapped."""
+        with self.assertRaises(errors.Error):
+            redis_mapper.RedisMapper(Photo, self.server)
+
+    def test_round_trip_of_references(self):
+        """Test that references are stored as keys without loading."""
+        calls = list()
+        mapper = redis_mapper.RedisMapper(Post, self.server)
+
+        with loaders.LoaderScope({Author: calls.append}):
+            mapper.save_many([Post(id=1, author=7), Post(id=2)])
+            posts = mapper.load_many([1, 2])
+
+        self.assertEqual(self.server.hashes['post:1'],
+                         {six.b('id'): six.b('1'),
+                          six.b('author'): six.b('7')})
+        self.assertEqual([post.get_data() for post in posts],
+                         [dict(id=1, author=7), dict(id=2, author=None)])
+        self.assertEqual(calls, [])